@@ -10,7 +10,14 @@ import rich
 from returns.pipeline import is_successful
 
 app = typer.Typer()
-EVENTS_PATH = Path("events.json")
+EVENTS_PATH = Path("events.jsonl")
+# Event file of earlier versions, converted into EVENTS_PATH on first use
+LEGACY_EVENTS_PATH = Path("events.json")
+
+
+@app.callback()
+def migrate():
+    storage.migrate_legacy_log(EVENTS_PATH, [LEGACY_EVENTS_PATH])
 
 
 @app.command()
@@ -0,0 +1,111 @@
+"""Persisted cursor checkpoints, for "as of" queries.
+
+A checkpoint directory holds the training position cursor (see
+``src.domain.cursor``) of the event log at regular event offsets. The
+position at any offset is restored from the nearest checkpoint before it
+by folding only the events in between. Checkpoints assume an append-only
+log; ones beyond the end of the log are ignored.
+
+Only the cursor is kept, a few counters per week, so every checkpoint has
+the same small size however long the log grows. The exercise states of a
+past moment are rebuilt from the events up to it instead.
+"""
+
+import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TypedDict
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.domain.cursor import advance_cursor, empty_cursor
+from src.domain.types import Cursor
+from src.events import Event
+
+# Checkpoints up to version 2 held whole projections, like snapshots
+CHECKPOINT_VERSION = 3
+DEFAULT_CHECKPOINT_INTERVAL = 1000
+
+_CHECKPOINT_NAME = re.compile(r"checkpoint-(\d+)\.json")
+
+
+class Checkpoint(TypedDict):
+    version: int
+    cursor: Cursor
+
+
+CheckpointAdapter = TypeAdapter(Checkpoint)
+
+
+def checkpoint_path(directory: Path, offset: int) -> Path:
+    return directory / f"checkpoint-{offset:09d}.json"
+
+
+def checkpoint_offsets(directory: Path) -> list[int]:
+    """Offsets of all checkpoints, ascending."""
+    if not directory.exists():
+        return []
+    matches = (_CHECKPOINT_NAME.fullmatch(p.name) for p in directory.iterdir())
+    return sorted(int(match.group(1)) for match in matches if match)
+
+
+def _load(path: Path) -> Cursor | None:
+    """Cursor of a checkpoint, or None if unreadable or outdated."""
+    try:
+        checkpoint = CheckpointAdapter.validate_json(path.read_bytes())
+    except (OSError, ValidationError):
+        return None
+    if checkpoint["version"] != CHECKPOINT_VERSION:
+        return None
+    return checkpoint["cursor"]
+
+
+def _save(path: Path, cursor: Cursor) -> None:
+    """Atomically write a checkpoint file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(
+        CheckpointAdapter.dump_json(
+            {"version": CHECKPOINT_VERSION, "cursor": cursor}
+        )
+    )
+    tmp_path.replace(path)
+
+
+def _nearest(directory: Path, offset: int) -> Cursor:
+    """Cursor of the last readable checkpoint at or before ``offset``."""
+    offsets = checkpoint_offsets(directory)
+    for candidate in reversed(offsets[: bisect_right(offsets, offset)]):
+        cursor = _load(checkpoint_path(directory, candidate))
+        if cursor is not None and cursor["offset"] == candidate:
+            return cursor
+    return empty_cursor()
+
+
+def cursor_at_offset(
+    events: Sequence[Event], offset: int, directory: Path
+) -> Cursor:
+    """Cursor of the first ``offset`` events, folding only the events
+    after the nearest checkpoint."""
+    offset = min(offset, len(events))
+    base = _nearest(directory, offset)
+    return advance_cursor(base, events[base["offset"] : offset])
+
+
+def update_checkpoints(
+    directory: Path,
+    events: Sequence[Event],
+    interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+) -> None:
+    """Write the checkpoints missing after the newest one, one every
+    ``interval`` events."""
+    cursor = _nearest(directory, len(events))
+    target = cursor["offset"] + interval
+    if target > len(events):
+        return
+
+    directory.mkdir(parents=True, exist_ok=True)
+    while target <= len(events):
+        cursor = advance_cursor(cursor, events[cursor["offset"] : target])
+        _save(checkpoint_path(directory, target), cursor)
+        target += interval
@@ -0,0 +1,173 @@
+"""Vectorized queries over a columnar event table.
+
+Events are laid out as NumPy columns (type code, exercise id, week,
+workout, reps, weight), so filters become boolean masks and aggregations
+grouped array reductions instead of per-event Python predicates. Meant
+for bulk analytics and backfills; tables of several logs (e.g. many
+users) can be concatenated and queried at once.
+
+Requires NumPy (the ``analytics`` extra).
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.domain.catalog import exercise_id, exercise_name, lookup_id
+from src.domain.types import ContextTotals
+from src.events import EVENT_TYPES, Event, SetLogged
+
+# Small integer code of every event class
+TYPE_CODES: dict[type, int] = {
+    cls: code for code, cls in enumerate(EVENT_TYPES.values())
+}
+
+# Exercise id of events without an exercise
+NO_EXERCISE = -1
+
+
+@dataclass(frozen=True)
+class EventTable:
+    type: np.ndarray
+    exercise: np.ndarray
+    week: np.ndarray
+    workout: np.ndarray
+    reps: np.ndarray
+    weight: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.type)
+
+
+def event_table(events: Iterable[Event]) -> EventTable:
+    """Columnar table of events, one row per event in log order.
+
+    Events other than ``SetLogged`` have 0 reps and weight.
+    """
+    columns = {
+        "type": array("b"),
+        "exercise": array("i"),
+        "week": array("i"),
+        "workout": array("i"),
+        "reps": array("i"),
+        "weight": array("d"),
+    }
+    for event in events:
+        columns["type"].append(TYPE_CODES[type(event)])
+        exercise = getattr(event, "exercise", None)
+        columns["exercise"].append(
+            NO_EXERCISE if exercise is None else exercise_id(exercise)
+        )
+        columns["week"].append(event.week_index)
+        columns["workout"].append(event.workout_index)
+        is_set = isinstance(event, SetLogged)
+        columns["reps"].append(event.reps if is_set else 0)
+        columns["weight"].append(event.weight if is_set else 0.0)
+
+    return EventTable(
+        type=np.frombuffer(columns["type"], dtype=np.int8),
+        exercise=np.frombuffer(columns["exercise"], dtype=np.int32),
+        week=np.frombuffer(columns["week"], dtype=np.int32),
+        workout=np.frombuffer(columns["workout"], dtype=np.int32),
+        reps=np.frombuffer(columns["reps"], dtype=np.int32),
+        weight=np.frombuffer(columns["weight"], dtype=np.float64),
+    )
+
+
+def concat_tables(tables: Sequence[EventTable]) -> EventTable:
+    """One table holding the rows of several tables, in order."""
+    if not tables:
+        return event_table([])
+    return EventTable(
+        **{
+            name: np.concatenate([getattr(t, name) for t in tables])
+            for name in EventTable.__dataclass_fields__
+        }
+    )
+
+
+def mask(
+    table: EventTable,
+    exercise: str | None = None,
+    week: int | None = None,
+    workout: int | None = None,
+    event_type: type | None = None,
+) -> np.ndarray:
+    """Boolean mask of the rows matching all given criteria."""
+    selected = np.ones(len(table), dtype=bool)
+    if exercise is not None:
+        found = lookup_id(exercise)
+        if found is None:
+            # Never seen, so in no row
+            return np.zeros(len(table), dtype=bool)
+        selected &= table.exercise == found
+    if week is not None:
+        selected &= table.week == week
+    if workout is not None:
+        selected &= table.workout == workout
+    if event_type is not None:
+        selected &= table.type == TYPE_CODES[event_type]
+    return selected
+
+
+def filter_by_context(
+    events: Sequence[Event],
+    table: EventTable,
+    exercise: str | None = None,
+    week: int | None = None,
+    workout: int | None = None,
+) -> list[Event]:
+    """Vectorized ``domain.helpers.filter_by_context``.
+
+    ``table`` must be the table of ``events``.
+    """
+    selected = mask(table, exercise=exercise, week=week, workout=workout)
+    return [events[i] for i in np.flatnonzero(selected)]
+
+
+def filter_events_by_type(
+    events: Sequence[Event], table: EventTable, event_type: type
+) -> list[Event]:
+    """Vectorized ``domain.helpers.filter_events_by_type``."""
+    selected = mask(table, event_type=event_type)
+    return [events[i] for i in np.flatnonzero(selected)]
+
+
+def context_totals(
+    table: EventTable, selected: np.ndarray | None = None
+) -> dict[tuple[int, int, str], ContextTotals]:
+    """Set count, tonnage (reps x weight) and top weight of every
+    (week, workout, exercise) with logged sets, optionally only over the
+    rows of a mask."""
+    sets = table.type == TYPE_CODES[SetLogged]
+    if selected is not None:
+        sets &= selected
+
+    keys = np.stack(
+        [table.week[sets], table.workout[sets], table.exercise[sets]], axis=1
+    )
+    if not len(keys):
+        return {}
+    contexts, group = np.unique(keys, axis=0, return_inverse=True)
+    group = group.reshape(-1)
+
+    weight = table.weight[sets]
+    counts = np.bincount(group, minlength=len(contexts))
+    tonnage = np.bincount(
+        group, weights=table.reps[sets] * weight, minlength=len(contexts)
+    )
+    top = np.full(len(contexts), -np.inf)
+    np.maximum.at(top, group, weight)
+
+    return {
+        (int(week), int(workout), exercise_name(int(exercise))): {
+            "sets": int(count),
+            "tonnage": float(total),
+            "max_weight": float(heaviest),
+        }
+        for (week, workout, exercise), count, total, heaviest in zip(
+            contexts, counts, tonnage, top
+        )
+    }
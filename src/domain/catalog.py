@@ -0,0 +1,46 @@
+"""Process-wide catalog of exercise names.
+
+Every exercise name gets a small integer id the first time it is seen,
+when a template is loaded or events are indexed. The catalog never
+shrinks, so names read from requests are only looked up (``lookup_id``),
+never added. Indexes, projections
+and columnar stores key exercises by id, so lookups hash and compare
+integers instead of strings. Ids are only stable within one process;
+anything persisted keeps using names.
+"""
+
+import sys
+import threading
+from collections.abc import Iterable
+
+_ids: dict[str, int] = {}
+_names: list[str] = []
+_lock = threading.Lock()
+
+
+def exercise_id(name: str) -> int:
+    """Id of an exercise name, assigning the next free one if it is new."""
+    try:
+        return _ids[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _ids:
+            _names.append(sys.intern(name))
+            _ids[name] = len(_names) - 1
+        return _ids[name]
+
+
+def lookup_id(name: str) -> int | None:
+    """Id of an exercise name, or None if it was never seen."""
+    return _ids.get(name)
+
+
+def exercise_name(exercise: int) -> str:
+    """Name of an exercise id."""
+    return _names[exercise]
+
+
+def intern_names(names: Iterable[str]) -> list[int]:
+    """Ids of several names, e.g. all exercises of a template."""
+    return [exercise_id(name) for name in names]
@@ -0,0 +1,149 @@
+"""Columnar storage of logged sets.
+
+Sets are kept as parallel typed arrays (exercise id from
+``src.domain.catalog``, week, workout, reps, weight, timestamp) instead
+of one event object each, which takes a fraction of the memory and lets
+analytics scan plain numbers. A
+``SetColumns`` behaves as a read-only sequence of ``SetLogged`` events, so
+code written against lists of events accepts it as well.
+
+NumPy is optional: ``to_numpy`` needs it, everything else works without.
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from src.domain.catalog import exercise_id, exercise_name, lookup_id
+from src.domain.completions import ExerciseSets
+from src.events import Event, SetLogged
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+# Timestamps are stored as microseconds since this (naive) epoch
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True, eq=False)
+class SetColumns(Sequence):
+    exercise: array = field(default_factory=lambda: array("i"))
+    week: array = field(default_factory=lambda: array("i"))
+    workout: array = field(default_factory=lambda: array("i"))
+    reps: array = field(default_factory=lambda: array("i"))
+    weight: array = field(default_factory=lambda: array("d"))
+    timestamp: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.reps)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return SetLogged(
+            exercise=exercise_name(self.exercise[position]),
+            timestamp=_EPOCH + self.timestamp[position] * _MICROSECOND,
+            week_index=self.week[position],
+            workout_index=self.workout[position],
+            reps=self.reps[position],
+            weight=self.weight[position],
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+
+def epoch_micros(timestamp: datetime) -> int:
+    """Microseconds between the epoch and a naive timestamp."""
+    if timestamp.tzinfo is not None:
+        raise ValueError(
+            f"Only naive timestamps can be stored in columns: {timestamp}"
+        )
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def append_sets(columns: SetColumns, events: Iterable[Event]) -> None:
+    """Append the ``SetLogged`` events among ``events`` in place.
+
+    Columns only ever grow, like the event log they mirror.
+    """
+    for event in events:
+        if not isinstance(event, SetLogged):
+            continue
+        columns.exercise.append(exercise_id(event.exercise))
+        columns.week.append(event.week_index)
+        columns.workout.append(event.workout_index)
+        columns.reps.append(event.reps)
+        columns.weight.append(event.weight)
+        columns.timestamp.append(epoch_micros(event.timestamp))
+
+
+def set_columns(events: Iterable[Event]) -> SetColumns:
+    """Columnar copy of the ``SetLogged`` events among ``events``."""
+    columns = SetColumns()
+    append_sets(columns, events)
+    return columns
+
+
+def to_events(columns: SetColumns) -> list[SetLogged]:
+    """Turn columns back into event objects, equal to the originals."""
+    return list(columns)
+
+
+def to_numpy(columns: SetColumns) -> dict[str, "np.ndarray"]:
+    """Zero-copy NumPy views of the columns.
+
+    The views share memory with the columns and must not outlive the next
+    ``append_sets``, which may reallocate them.
+    """
+    if np is None:
+        raise ImportError("to_numpy requires numpy")
+    return {
+        name: np.frombuffer(getattr(columns, name), dtype=dtype)
+        for name, dtype in (
+            ("exercise", np.int32),
+            ("week", np.int32),
+            ("workout", np.int32),
+            ("reps", np.int32),
+            ("weight", np.float64),
+            ("timestamp", np.int64),
+        )
+    }
+
+
+def select_sets(
+    sets: Sequence[SetLogged], exercise: str, week: int, workout: int
+) -> list[SetLogged]:
+    """Sets of one exercise in one workout, in log order.
+
+    Columns are searched by comparing integers instead of event fields,
+    and ``src.domain.completions.ExerciseSets`` are not searched at all.
+    """
+    if isinstance(sets, ExerciseSets):
+        if sets.exercise != exercise:
+            return []
+        return sets.in_context(week, workout)
+
+    if not isinstance(sets, SetColumns):
+        return [
+            s
+            for s in sets
+            if s.exercise == exercise
+            and s.week_index == week
+            and s.workout_index == workout
+        ]
+
+    wanted = (lookup_id(exercise), week, workout)
+    return [
+        sets[i]
+        for i, row in enumerate(zip(sets.exercise, sets.week, sets.workout))
+        if row == wanted
+    ]
@@ -0,0 +1,213 @@
+"""History of exercise completions, for prescriptions.
+
+Prescriptions start from the last completed performance of an exercise:
+its latest ``ExerciseCompleted`` outside the current workout and the
+sets logged in that workout. ``CompletionHistory`` keeps completions and
+sets per exercise, and sets per workout of each exercise, so that
+lookup costs O(1) instead of two scans of the whole history.
+
+Like the timeline, histories of the same log share append-only buffers
+and only see the entries at log positions below their ``size``, so
+appending costs O(new events) whatever the length of the history. The
+buffers are copied only when an older history is extended a second way.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from src.domain.catalog import exercise_id, lookup_id
+from src.domain.types import (
+    CompletionBuffers,
+    CompletionEntries,
+    CompletionHistory,
+)
+from src.events import Event, ExerciseCompleted, SetLogged
+
+
+def empty_completion_history() -> CompletionHistory:
+    """Completion history of an empty event log."""
+    return {"size": 0, "buffers": _empty_buffers()}
+
+
+def _empty_buffers() -> CompletionBuffers:
+    return {"size": 0, "completions": {}, "sets": {}, "context_sets": {}}
+
+
+def completion_history(
+    events: Sequence[Event], history: CompletionHistory | None = None
+) -> CompletionHistory:
+    """Completion history of ``events``, only reading the events
+    ``history`` does not cover yet (pure). A history of more events than
+    given is discarded."""
+    if history is None or history["size"] > len(events):
+        history = empty_completion_history()
+    if history["size"] == len(events):
+        return history
+    return completions_appended(history, events[history["size"] :])
+
+
+def completions_before(
+    history: CompletionHistory, size: int
+) -> CompletionHistory:
+    """History of the first ``size`` events ``history`` covers, as a view
+    sharing its buffers."""
+    return {"size": min(size, history["size"]), "buffers": history["buffers"]}
+
+
+def _visible(entries: CompletionEntries, size: int) -> int:
+    """Number of entries at log positions below ``size``."""
+    positions = entries["positions"]
+    if not positions or positions[-1] < size:
+        return len(positions)
+    return bisect_left(positions, size)
+
+
+def _trimmed(buffers: CompletionBuffers, size: int) -> CompletionBuffers:
+    """Private copy of the buffers, as of the first ``size`` events."""
+
+    def trim(entries: CompletionEntries) -> CompletionEntries:
+        count = _visible(entries, size)
+        return {
+            "events": entries["events"][:count],
+            "positions": entries["positions"][:count],
+        }
+
+    return {
+        "size": size,
+        "completions": {
+            key: trim(entries)
+            for key, entries in buffers["completions"].items()
+        },
+        "sets": {
+            key: trim(entries) for key, entries in buffers["sets"].items()
+        },
+        "context_sets": {
+            key: trim(entries)
+            for key, entries in buffers["context_sets"].items()
+        },
+    }
+
+
+def _push(entries: dict, key, event: Event, position: int) -> None:
+    """Append an event to the buffer of one key.
+
+    The event goes in before its position, so readers that count
+    positions never see an entry whose event is missing.
+    """
+    found = entries.get(key)
+    if found is None:
+        found = entries[key] = {"events": [], "positions": array("q")}
+    found["events"].append(event)
+    found["positions"].append(position)
+
+
+def completions_appended(
+    history: CompletionHistory, events: Sequence[Event]
+) -> CompletionHistory:
+    """History with events appended right after the ones it covers
+    (pure: earlier histories keep seeing what they saw).
+
+    Appends in place to the shared buffers. Callers that extend the
+    histories of one log from several threads must serialize.
+    """
+    buffers = history["buffers"]
+    if buffers["size"] != history["size"]:
+        buffers = _trimmed(buffers, history["size"])
+
+    for position, event in enumerate(events, history["size"]):
+        match event:
+            case ExerciseCompleted():
+                key = exercise_id(event.exercise)
+                _push(buffers["completions"], key, event, position)
+            case SetLogged():
+                key = exercise_id(event.exercise)
+                _push(buffers["sets"], key, event, position)
+                context = (key, event.week_index, event.workout_index)
+                _push(buffers["context_sets"], context, event, position)
+
+    buffers["size"] = history["size"] + len(events)
+    return {"size": buffers["size"], "buffers": buffers}
+
+
+@dataclass(frozen=True, eq=False)
+class _Prefix(Sequence):
+    """Read-only view of the first ``length`` items of a list."""
+
+    items: list
+    length: int
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return self.items[: self.length][position]
+        if position < 0:
+            position += self.length
+        if not 0 <= position < self.length:
+            raise IndexError(position)
+        return self.items[position]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+
+def _entries(history: CompletionHistory, kind: str, key) -> Sequence[Event]:
+    entries = history["buffers"][kind].get(key)
+    if entries is None:
+        return _Prefix([], 0)
+    return _Prefix(entries["events"], _visible(entries, history["size"]))
+
+
+@dataclass(frozen=True, eq=False)
+class ExerciseSets(Sequence):
+    """Read-only sequence of the sets of one exercise, in log order, that
+    also hands out the sets of one workout without searching."""
+
+    exercise: str
+    history: CompletionHistory
+
+    @property
+    def sets(self) -> Sequence[SetLogged]:
+        return _entries(self.history, "sets", lookup_id(self.exercise))
+
+    def __len__(self) -> int:
+        return len(self.sets)
+
+    def __getitem__(self, position):
+        return self.sets[position]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self.sets) == list(other)
+
+    def in_context(self, week: int, workout: int) -> list[SetLogged]:
+        """Sets logged in one workout, in log order."""
+        return list(context_sets(self.history, self.exercise, week, workout))
+
+
+def exercise_sets(history: CompletionHistory, exercise: str) -> ExerciseSets:
+    """All sets of an exercise, as a view of the history."""
+    return ExerciseSets(exercise=exercise, history=history)
+
+
+def exercise_completions(
+    history: CompletionHistory, exercise: str
+) -> Sequence[ExerciseCompleted]:
+    """Completions of an exercise, in log order, as a view."""
+    return _entries(history, "completions", lookup_id(exercise))
+
+
+def context_sets(
+    history: CompletionHistory, exercise: str, week: int, workout: int
+) -> Sequence[SetLogged]:
+    """Sets of an exercise logged in one workout, as a view."""
+    key = (lookup_id(exercise), week, workout)
+    return _entries(history, "context_sets", key)
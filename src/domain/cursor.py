@@ -0,0 +1,89 @@
+"""Training position cursor.
+
+Summarizes the ``WorkoutCompleted`` events of a log in a few counters, so
+the current (week_index, workout_index) is computed in constant time
+instead of by scanning the history. The rules are those of
+``MesocyclePlan.current_week_index``/``current_workout_index``.
+"""
+
+from collections.abc import Iterable, Sequence
+
+from src.domain.types import Cursor
+from src.events import Event, WorkoutCompleted
+from src.models import MesocyclePlan
+
+
+def empty_cursor() -> Cursor:
+    """Cursor of an empty event log."""
+    return {
+        "offset": 0,
+        "last_week": None,
+        "completed": {},
+        "last_workout": {},
+    }
+
+
+def transient_cursor(cursor: Cursor) -> Cursor:
+    """Private copy of a cursor for ``apply_cursor_event`` to mutate."""
+    return {
+        **cursor,
+        "completed": dict(cursor["completed"]),
+        "last_workout": dict(cursor["last_workout"]),
+    }
+
+
+def apply_cursor_event(cursor: Cursor, event: Event) -> None:
+    """Fold an event into a transient cursor in place."""
+    cursor["offset"] += 1
+    if not isinstance(event, WorkoutCompleted):
+        return
+
+    week, workout = event.week_index, event.workout_index
+    cursor["completed"][week] = cursor["completed"].get(week, 0) + 1
+    cursor["last_workout"][week] = max(
+        cursor["last_workout"].get(week, workout), workout
+    )
+    if cursor["last_week"] is None or week > cursor["last_week"]:
+        cursor["last_week"] = week
+
+
+def advance_cursor(cursor: Cursor, events: Iterable[Event]) -> Cursor:
+    """Return the cursor with ``events`` folded in (pure)."""
+    result = transient_cursor(cursor)
+    for event in events:
+        apply_cursor_event(result, event)
+    return result
+
+
+def cursor_at(events: Sequence[Event], cursor: Cursor | None = None) -> Cursor:
+    """Cursor of ``events``, only folding the events ``cursor`` does not
+    cover yet. A cursor of more events than given is discarded."""
+    if cursor is None or cursor["offset"] > len(events):
+        cursor = empty_cursor()
+    if cursor["offset"] == len(events):
+        return cursor
+    return advance_cursor(cursor, events[cursor["offset"] :])
+
+
+def position(cursor: Cursor, plan: MesocyclePlan) -> tuple[int, int]:
+    """Current (week_index, workout_index) in constant time."""
+    max_week = cursor["last_week"]
+    if max_week is None:
+        return 0, 0
+
+    workouts_in_week = (
+        len(plan.weeks[max_week].workouts) if max_week < len(plan.weeks) else 0
+    )
+    if cursor["completed"][max_week] >= workouts_in_week:
+        week_idx = min(max_week + 1, len(plan.weeks) - 1)
+    else:
+        week_idx = max_week
+
+    last_workout = cursor["last_workout"].get(week_idx)
+    if last_workout is None:
+        return week_idx, 0
+
+    week = plan.get_week(week_idx)
+    if week:
+        return week_idx, min(last_workout + 1, len(week.workouts) - 1)
+    return week_idx, 0
@@ -1,13 +1,15 @@
+from collections.abc import Iterable, Iterator
+
 from src.events import Event
 
 
-def filter_by_context(
-    events: list[Event],
+def iter_by_context(
+    events: Iterable[Event],
     exercise: str | None = None,
     week: int | None = None,
     workout: int | None = None,
-) -> list[Event]:
-    """Reusable context filter."""
+) -> Iterator[Event]:
+    """Lazy context filter; nothing is read until it is iterated."""
 
     def matches(e: Event) -> bool:
         return (
@@ -16,11 +18,28 @@ def filter_by_context(
             and (workout is None or e.workout_index == workout)
         )
 
-    return list(filter(matches, events))
+    return filter(matches, events)
+
+
+def iter_events_by_type(
+    events: Iterable[Event], event_type: type
+) -> Iterator[Event]:
+    """Lazy filter of events by their type."""
+    return (e for e in events if isinstance(e, event_type))
+
+
+def filter_by_context(
+    events: Iterable[Event],
+    exercise: str | None = None,
+    week: int | None = None,
+    workout: int | None = None,
+) -> list[Event]:
+    """Reusable context filter."""
+    return list(iter_by_context(events, exercise, week, workout))
 
 
 def filter_events_by_type(
-    events: list[Event], event_type: type
+    events: Iterable[Event], event_type: type
 ) -> list[Event]:
     """Filter events by their type."""
-    return [e for e in events if isinstance(e, event_type)]
+    return list(iter_events_by_type(events, event_type))
@@ -0,0 +1,76 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from src.domain.catalog import exercise_id, lookup_id
+from src.domain.types import ContextIndex
+from src.events import Event
+
+
+def empty_index() -> ContextIndex:
+    """Index of an empty event log."""
+    return {"size": 0, "workouts": {}, "exercises": {}}
+
+
+def index_events(
+    events: Sequence[Event], index: ContextIndex | None = None
+) -> ContextIndex:
+    """Index the events that ``index`` does not cover yet (pure).
+
+    The log is append-only, so an index of a prefix of ``events`` is
+    extended with the remaining events instead of being rebuilt. An
+    index of more events than given is discarded.
+    """
+    if index is None or index["size"] > len(events):
+        index = empty_index()
+    if index["size"] == len(events):
+        return index
+    return index_appended(index, events[index["size"] :])
+
+
+def index_appended(index: ContextIndex, events: list[Event]) -> ContextIndex:
+    """Index events appended right after the ones ``index`` covers (pure)."""
+    workouts: dict[tuple[int, int], list[int]] = {}
+    exercises: dict[tuple[int, int, int], list[int]] = {}
+    for position, event in enumerate(events, index["size"]):
+        context = (event.week_index, event.workout_index)
+        workouts.setdefault(context, []).append(position)
+        exercise = getattr(event, "exercise", None)
+        if exercise is not None:
+            key = (*context, exercise_id(exercise))
+            exercises.setdefault(key, []).append(position)
+
+    return {
+        "size": index["size"] + len(events),
+        "workouts": _merge(index["workouts"], workouts),
+        "exercises": _merge(index["exercises"], exercises),
+    }
+
+
+def _merge(old: dict, new: dict) -> dict:
+    """Extend position lists, copying only the ones that changed."""
+    merged = dict(old)
+    for key, positions in new.items():
+        merged[key] = [*old.get(key, ()), *positions]
+    return merged
+
+
+def context_events(
+    events: Sequence[Event],
+    index: ContextIndex,
+    week: int,
+    workout: int,
+    exercise: str | None = None,
+    size: int | None = None,
+) -> list[Event]:
+    """Events of one context, in log order, read through the index.
+
+    With a ``size``, only the events among the first ``size`` of the log.
+    """
+    if exercise is None:
+        positions = index["workouts"].get((week, workout), [])
+    else:
+        key = (week, workout, lookup_id(exercise))
+        positions = index["exercises"].get(key, [])
+    if size is not None:
+        positions = positions[: bisect_left(positions, size)]
+    return [events[p] for p in positions]
@@ -0,0 +1,79 @@
+"""Progress through a whole mesocycle plan.
+
+``plan_progress`` builds the week × workout × exercise completion matrix
+in a single pass over the events, instead of checking each workout of
+each week against the whole history.
+"""
+
+from collections.abc import Iterable
+
+from src.domain.types import ExerciseProgress, WorkoutProgress
+from src.events import Event, ExerciseCompleted, SetLogged, WorkoutCompleted
+from src.models import MesocyclePlan
+
+
+def empty_progress(plan: MesocyclePlan) -> list[list[WorkoutProgress]]:
+    """Progress matrix of a plan before any event, indexed by
+    ``[week_index][workout_index]``."""
+    return [
+        [
+            {
+                "week_index": week_index,
+                "workout_index": workout_index,
+                "completed": False,
+                "exercises": [
+                    {
+                        "exercise": name,
+                        "sets_done": 0,
+                        "sets_required": plan.required_sets(
+                            week_index, workout_index, name
+                        ),
+                        "completed": False,
+                    }
+                    for name in plan.exercise_names(week_index, workout_index)
+                ],
+            }
+            for workout_index in range(len(week.workouts))
+        ]
+        for week_index, week in enumerate(plan.weeks)
+    ]
+
+
+def plan_progress(
+    events: Iterable[Event], plan: MesocyclePlan
+) -> list[list[WorkoutProgress]]:
+    """Progress of every workout and exercise of the plan (pure).
+
+    Events outside the plan are ignored. ``events`` may be a stream.
+    """
+    matrix = empty_progress(plan)
+    workouts = {
+        (progress["week_index"], progress["workout_index"]): progress
+        for week in matrix
+        for progress in week
+    }
+    # First occurrence wins, as in ``MesocyclePlan.get_exercise``
+    exercises: dict[tuple[int, int, str], ExerciseProgress] = {}
+    for key, progress in workouts.items():
+        for exercise in progress["exercises"]:
+            exercises.setdefault((*key, exercise["exercise"]), exercise)
+
+    for event in events:
+        match event:
+            case SetLogged():
+                exercise = exercises.get(
+                    (event.week_index, event.workout_index, event.exercise)
+                )
+                if exercise is not None:
+                    exercise["sets_done"] += 1
+            case ExerciseCompleted():
+                exercise = exercises.get(
+                    (event.week_index, event.workout_index, event.exercise)
+                )
+                if exercise is not None:
+                    exercise["completed"] = True
+            case WorkoutCompleted():
+                workout = workouts.get((event.week_index, event.workout_index))
+                if workout is not None:
+                    workout["completed"] = True
+    return matrix
@@ -0,0 +1,145 @@
+from collections.abc import Iterable, Sequence
+
+from src.domain.catalog import exercise_id, lookup_id
+from src.domain.cursor import (
+    apply_cursor_event,
+    empty_cursor,
+    position,
+    transient_cursor,
+)
+from src.domain.reducers import (
+    apply_exercise_event,
+    process_workout_event,
+    transient_exercise_state,
+)
+from src.domain.state import initial_exercise_state, initial_workout_state
+from src.domain.types import ExerciseState, Projection, WorkoutState
+from src.events import Event, ExerciseCompleted
+from src.models import MesocyclePlan
+
+
+def empty_projection() -> Projection:
+    """Projection of an empty event log."""
+    return {
+        "offset": 0,
+        "exercises": {},
+        "workouts": {},
+        "last_completions": {},
+        "cursor": empty_cursor(),
+    }
+
+
+def _apply(
+    projection: Projection,
+    event: Event,
+    owned: set[tuple[int, int, int]],
+) -> None:
+    """Fold one event into the projection's top-level mappings.
+
+    Shared nested values are replaced, never mutated, so projections that
+    share them stay independent. Exercise states in ``owned`` were copied
+    during the current ``advance`` and are updated in place, so each
+    state's sets are copied at most once per call.
+    """
+    week, workout = event.week_index, event.workout_index
+    exercise = getattr(event, "exercise", None)
+
+    apply_cursor_event(projection["cursor"], event)
+    if isinstance(event, ExerciseCompleted):
+        projection["last_completions"][exercise_id(exercise)] = event
+
+    if exercise is not None:
+        key = (week, workout, exercise_id(exercise))
+        if key not in owned:
+            current = projection["exercises"].get(
+                key
+            ) or initial_exercise_state(exercise, week, workout)
+            projection["exercises"][key] = transient_exercise_state(current)
+            owned.add(key)
+        apply_exercise_event(projection["exercises"][key], event)
+
+    current_workout = projection["workouts"].get(
+        (week, workout)
+    ) or initial_workout_state([], week, workout)
+    projection["workouts"][(week, workout)] = process_workout_event(
+        current_workout, event
+    )
+    projection["offset"] += 1
+
+
+def advance(projection: Projection, events: Iterable[Event]) -> Projection:
+    """Return the projection with ``events`` folded in (pure)."""
+    result: Projection = {
+        "offset": projection["offset"],
+        "exercises": dict(projection["exercises"]),
+        "workouts": dict(projection["workouts"]),
+        "last_completions": dict(projection["last_completions"]),
+        "cursor": transient_cursor(projection["cursor"]),
+    }
+    owned: set[tuple[int, int, int]] = set()
+    for event in events:
+        _apply(result, event, owned)
+    return result
+
+
+def build_projection(events: Iterable[Event]) -> Projection:
+    """Build the projection of a whole event log from scratch."""
+    return advance(empty_projection(), events)
+
+
+def prune_projection(projection: Projection) -> Projection:
+    """Projection without the exercise states of completed workouts.
+
+    Those states hold every logged set, so they grow with the history,
+    while everything else grows with the plan. Snapshots only keep the
+    pruned projection; the exercise states of completed workouts are read
+    through the context index instead (see ``src.domain.state``).
+    """
+    workouts = projection["workouts"]
+    return {
+        **projection,
+        "exercises": {
+            key: state
+            for key, state in projection["exercises"].items()
+            if not (key[:2] in workouts and workouts[key[:2]]["completed"])
+        },
+    }
+
+
+def verify_projection(projection: Projection, events: Sequence[Event]) -> bool:
+    """Check an incrementally maintained projection against a full
+    rebuild from the events it covers."""
+    if projection["offset"] > len(events):
+        return False
+    return projection == build_projection(events[: projection["offset"]])
+
+
+def exercise_state_at(
+    projection: Projection, exercise: str, week: int, workout: int
+) -> ExerciseState:
+    """Look up the exercise state of one context."""
+    return projection["exercises"].get(
+        (week, workout, lookup_id(exercise))
+    ) or initial_exercise_state(exercise, week, workout)
+
+
+def workout_state_at(
+    projection: Projection, exercise_names: list[str], week: int, workout: int
+) -> WorkoutState:
+    """Look up the workout state of one context."""
+    state = projection["workouts"].get((week, workout))
+    if state is None:
+        return initial_workout_state(exercise_names, week, workout)
+    return {
+        **state,
+        "missing_exercises": set(exercise_names)
+        - state["completed_exercises"],
+    }
+
+
+def current_position(
+    projection: Projection, plan: MesocyclePlan
+) -> tuple[int, int]:
+    """Current (week_index, workout_index), following the same rules as
+    ``MesocyclePlan.current_week_index``/``current_workout_index``."""
+    return position(projection["cursor"], plan)
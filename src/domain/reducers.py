@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from src.domain.types import ExerciseState, WorkoutState
 from src.events import (
     Event,
@@ -23,6 +25,40 @@ def process_exercise_event(
             return state
 
 
+def transient_exercise_state(state: ExerciseState) -> ExerciseState:
+    """Private copy of a state for ``apply_exercise_event`` to mutate."""
+    return {**state, "sets": list(state["sets"])}
+
+
+def apply_exercise_event(state: ExerciseState, event: Event) -> None:
+    """Fold an event into a transient exercise state in place.
+
+    In-place counterpart of ``process_exercise_event``: appending a set
+    costs O(1) instead of copying all earlier sets. Only use it on a
+    state from ``transient_exercise_state`` that nothing else can see.
+    """
+    match event:
+        case ExerciseStarted():
+            state["started"] = True
+        case ExerciseCompleted():
+            state["completed"] = True
+        case SetLogged():
+            state["sets"].append(event)
+
+
+def reduce_exercise_events(
+    state: ExerciseState, events: Iterable[Event]
+) -> ExerciseState:
+    """Reduce events into exercise state in linear time (pure).
+
+    Same result as ``functools.reduce(process_exercise_event, ...)``.
+    """
+    result = transient_exercise_state(state)
+    for event in events:
+        apply_exercise_event(result, event)
+    return result
+
+
 def process_workout_event(state: WorkoutState, event: Event) -> WorkoutState:
     """Reduce single event into workout state."""
     match event:
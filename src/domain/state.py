@@ -1,19 +1,27 @@
+from collections.abc import Iterable
 from functools import reduce
-from src.domain.types import ExerciseState, WorkoutState
-from src.domain.helpers import filter_by_context
-from src.domain.reducers import process_exercise_event, process_workout_event
-from src.events import Event
+from src.domain.types import (
+    ContextIndex,
+    ExerciseState,
+    WorkoutHistory,
+    WorkoutState,
+)
+from src.domain.helpers import iter_by_context
+from src.domain.index import context_events, index_events
+from src.domain.reducers import (
+    apply_exercise_event,
+    process_workout_event,
+    reduce_exercise_events,
+    transient_exercise_state,
+)
+from src.events import Event, ExerciseCompleted, SetLogged
 
 
-def exercise_state(
-    events: list[Event], exercise: str, week: int, workout: int
+def initial_exercise_state(
+    exercise: str, week: int, workout: int
 ) -> ExerciseState:
-    """Build exercise state from events (pure)."""
-    relevant = filter_by_context(
-        events, exercise=exercise, week=week, workout=workout
-    )
-
-    initial: ExerciseState = {
+    """Exercise state before any event of the context happened."""
+    return {
         "started": False,
         "completed": False,
         "sets": [],
@@ -22,16 +30,12 @@ def exercise_state(
         "workout_index": workout,
     }
 
-    return reduce(process_exercise_event, relevant, initial)
 
-
-def workout_state(
-    events: list[Event], exercise_names: list[str], week: int, workout: int
+def initial_workout_state(
+    exercise_names: list[str], week: int, workout: int
 ) -> WorkoutState:
-    """Build workout state from events (pure)."""
-    relevant = filter_by_context(events, week=week, workout=workout)
-
-    initial: WorkoutState = {
+    """Workout state before any event of the context happened."""
+    return {
         "completed": False,
         "completed_exercises": set(),
         "missing_exercises": set(exercise_names),
@@ -39,9 +43,128 @@ def workout_state(
         "workout_index": workout,
     }
 
+
+def exercise_state(
+    events: Iterable[Event],
+    exercise: str,
+    week: int,
+    workout: int,
+    index: ContextIndex | None = None,
+) -> ExerciseState:
+    """Build exercise state from events (pure).
+
+    With an ``index`` (events must then be a sequence) only the events of
+    the context are read instead of scanning the whole history.
+    """
+    if index is not None:
+        index = index_events(events, index)
+        relevant = context_events(events, index, week, workout, exercise)
+    else:
+        relevant = iter_by_context(
+            events, exercise=exercise, week=week, workout=workout
+        )
+
+    initial = initial_exercise_state(exercise, week, workout)
+
+    return reduce_exercise_events(initial, relevant)
+
+
+def workout_state(
+    events: Iterable[Event],
+    exercise_names: list[str],
+    week: int,
+    workout: int,
+    index: ContextIndex | None = None,
+) -> WorkoutState:
+    """Build workout state from events (pure).
+
+    See ``exercise_state`` for ``index``.
+    """
+    if index is not None:
+        index = index_events(events, index)
+        relevant = context_events(events, index, week, workout)
+    else:
+        relevant = iter_by_context(events, week=week, workout=workout)
+
+    initial = initial_workout_state(exercise_names, week, workout)
+
     return reduce(process_workout_event, relevant, initial)
 
 
+def exercise_states(
+    events: Iterable[Event],
+    week: int | None = None,
+    workout: int | None = None,
+) -> dict[tuple[int, int, str], ExerciseState]:
+    """States of every exercise context among the events, optionally of
+    one week and/or workout only (pure).
+
+    Filters, groups by (week, workout, exercise) and reduces in a single
+    lazy pass, so ``events`` may be a stream, e.g.
+    ``storage.iter_events``, and no intermediate lists are built.
+    """
+    states: dict[tuple[int, int, str], ExerciseState] = {}
+    for event in iter_by_context(events, week=week, workout=workout):
+        exercise = getattr(event, "exercise", None)
+        if exercise is None:
+            continue
+        key = (event.week_index, event.workout_index, exercise)
+        state = states.get(key)
+        if state is None:
+            state = states[key] = transient_exercise_state(
+                initial_exercise_state(exercise, *key[:2])
+            )
+        apply_exercise_event(state, event)
+    return states
+
+
+def workout_history(
+    events: Iterable[Event], exercise_names: list[str], week: int, workout: int
+) -> WorkoutHistory:
+    """Build a workout's state, the states of its exercises and their
+    history in a single pass over the events (pure).
+
+    The states equal those of ``workout_state`` and ``exercise_state``.
+    """
+    names = set(exercise_names)
+    exercises = {
+        name: transient_exercise_state(
+            initial_exercise_state(name, week, workout)
+        )
+        for name in exercise_names
+    }
+    state = initial_workout_state(exercise_names, week, workout)
+    sets: dict[str, list[SetLogged]] = {name: [] for name in exercise_names}
+    completions: dict[str, list[ExerciseCompleted]] = {
+        name: [] for name in exercise_names
+    }
+
+    for event in events:
+        in_context = (
+            event.week_index == week and event.workout_index == workout
+        )
+        if in_context:
+            state = process_workout_event(state, event)
+
+        exercise = getattr(event, "exercise", None)
+        if exercise not in names:
+            continue
+        if in_context:
+            apply_exercise_event(exercises[exercise], event)
+        match event:
+            case SetLogged():
+                sets[exercise].append(event)
+            case ExerciseCompleted():
+                completions[exercise].append(event)
+
+    return {
+        "workout": state,
+        "exercises": exercises,
+        "sets": sets,
+        "completions": completions,
+    }
+
+
 # Convenience query functions
 def can_log_set(state: ExerciseState) -> bool:
     """Check if a set can be logged."""
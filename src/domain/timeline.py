@@ -0,0 +1,77 @@
+"""Timeline of an event log, for "as of" queries.
+
+Only ``SetLogged`` events carry a timestamp. Every event is dated by the
+latest set timestamp at or before it, so the events that follow a set
+(e.g. the completion of the exercise) belong to the set's moment. Taking
+the running maximum keeps the timeline sorted even for backfilled sets,
+so the log offset of any moment is found by binary search.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import datetime
+
+from src.domain.columns import epoch_micros
+from src.domain.types import Timeline
+from src.events import Event, SetLogged
+
+# Time of events before the first set
+_BEGINNING = -(2**63)
+
+
+def empty_timeline() -> Timeline:
+    """Timeline of an empty event log."""
+    return {"size": 0, "times": array("q")}
+
+
+def extend_timeline(timeline: Timeline, events: Sequence[Event]) -> Timeline:
+    """Timeline with ``events`` appended (pure).
+
+    Timelines of the same log share one append-only buffer and only read
+    its first ``size`` entries; it is copied only when an older timeline
+    is extended a second way.
+    """
+    times = timeline["times"]
+    if len(times) != timeline["size"]:
+        times = times[: timeline["size"]]
+    latest = times[-1] if times else _BEGINNING
+    for event in events:
+        if isinstance(event, SetLogged):
+            latest = max(latest, epoch_micros(event.timestamp))
+        times.append(latest)
+    return {"size": len(times), "times": times}
+
+
+def timeline_of(
+    events: Sequence[Event], timeline: Timeline | None = None
+) -> Timeline:
+    """Timeline of ``events``, only dating the events ``timeline`` does
+    not cover yet. A timeline of more events than given is discarded."""
+    if timeline is None or timeline["size"] > len(events):
+        timeline = empty_timeline()
+    if timeline["size"] == len(events):
+        return timeline
+    return extend_timeline(timeline, events[timeline["size"] :])
+
+
+def private_timeline(
+    events: Sequence[Event], timeline: Timeline | None = None
+) -> Timeline:
+    """``timeline_of`` that never appends to the buffer of ``timeline``.
+
+    For readers of a timeline that another thread may be extending: the
+    first ``size`` entries are copied before the missing events are
+    dated, so only the timeline's owner appends to the shared buffer.
+    """
+    if timeline is not None and timeline["size"] < len(events):
+        size = timeline["size"]
+        timeline = {"size": size, "times": timeline["times"][:size]}
+    return timeline_of(events, timeline)
+
+
+def offset_at(timeline: Timeline, when: datetime) -> int:
+    """Number of events that had happened at ``when``, in O(log n)."""
+    return bisect_right(
+        timeline["times"], epoch_micros(when), 0, timeline["size"]
+    )
@@ -1,6 +1,7 @@
+from array import array
 from typing import TypedDict
 
-from src.events import SetLogged
+from src.events import Event, ExerciseCompleted, SetLogged
 
 
 class ExerciseState(TypedDict):
@@ -18,3 +19,115 @@ class WorkoutState(TypedDict):
     missing_exercises: set[str]
     week_index: int
     workout_index: int
+
+
+class WorkoutHistory(TypedDict):
+    """States of one workout and its exercises, with the exercises'
+    sets and completions across the whole history."""
+
+    workout: WorkoutState
+    exercises: dict[str, ExerciseState]
+    sets: dict[str, list[SetLogged]]
+    completions: dict[str, list[ExerciseCompleted]]
+
+
+class ContextTotals(TypedDict):
+    """Aggregates of the sets logged in one context."""
+
+    sets: int
+    tonnage: float
+    max_weight: float
+
+
+class Cursor(TypedDict):
+    """Workout completions of the first ``offset`` events, per week: how
+    many there were and the highest workout index completed."""
+
+    offset: int
+    last_week: int | None
+    completed: dict[int, int]
+    last_workout: dict[int, int]
+
+
+class Projection(TypedDict):
+    """Derived state of the whole event log, up to ``offset`` events.
+
+    Workout states only track completions; their ``missing_exercises``
+    are filled in from the template when queried. Exercises are keyed by
+    their id in ``src.domain.catalog``.
+    """
+
+    offset: int
+    exercises: dict[tuple[int, int, int], ExerciseState]
+    workouts: dict[tuple[int, int], WorkoutState]
+    last_completions: dict[int, ExerciseCompleted]
+    cursor: Cursor
+
+
+class ContextIndex(TypedDict):
+    """Positions of events by context, for the first ``size`` events.
+
+    Exercises are keyed by their id in ``src.domain.catalog``.
+    """
+
+    size: int
+    workouts: dict[tuple[int, int], list[int]]
+    exercises: dict[tuple[int, int, int], list[int]]
+
+
+class Timeline(TypedDict):
+    """Time of each of the first ``size`` events, in microseconds since
+    the epoch (see ``src.domain.timeline``)."""
+
+    size: int
+    times: array
+
+
+class ExerciseProgress(TypedDict):
+    """Sets logged against sets required for one exercise of a workout."""
+
+    exercise: str
+    sets_done: int
+    sets_required: int
+    completed: bool
+
+
+class WorkoutProgress(TypedDict):
+    """Progress of one planned workout and each of its exercises, in
+    template order."""
+
+    week_index: int
+    workout_index: int
+    completed: bool
+    exercises: list[ExerciseProgress]
+
+
+class CompletionEntries(TypedDict):
+    """Events of one key of a completion history, in log order, with
+    the log position of each."""
+
+    events: list[Event]
+    positions: array
+
+
+class CompletionBuffers(TypedDict):
+    """Append-only buffers shared by the completion histories of one log,
+    holding its first ``size`` events. Exercises are keyed by their id in
+    ``src.domain.catalog``."""
+
+    size: int
+    completions: dict[int, CompletionEntries]
+    sets: dict[int, CompletionEntries]
+    context_sets: dict[tuple[int, int, int], CompletionEntries]
+
+
+class CompletionHistory(TypedDict):
+    """Completions and sets of each exercise among the first ``size``
+    events, in log order, with the sets also grouped by (week, workout).
+
+    Only the entries of ``buffers`` at positions below ``size`` belong
+    to the history (see ``src.domain.completions``).
+    """
+
+    size: int
+    buffers: CompletionBuffers
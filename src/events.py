@@ -41,3 +41,14 @@ class WorkoutCompleted:
 
 
 Event = Union[ExerciseStarted, ExerciseCompleted, SetLogged, WorkoutCompleted]
+
+# Event classes by their ``type`` discriminator
+EVENT_TYPES: dict[str, type] = {
+    cls.__dataclass_fields__["type"].default: cls
+    for cls in (
+        ExerciseStarted,
+        ExerciseCompleted,
+        SetLogged,
+        WorkoutCompleted,
+    )
+}
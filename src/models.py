@@ -1,6 +1,7 @@
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from numbers import Number
 from typing import Optional
 
@@ -10,6 +11,9 @@ from pydantic import BaseModel, Field
 
 from src.events import Event, WorkoutCompleted, ExerciseCompleted
 
+# Length of a mesocycle unless the template says otherwise
+DEFAULT_MESOCYCLE_WEEKS = 4
+
 
 class ExerciseFeedback(BaseModel):
     """Feedback collected after completing an exercise."""
@@ -82,10 +86,42 @@ class Workout:
         return required_exercises.issubset(performed_exercises)
 
 
+@dataclass(frozen=True)
+class WeekVariation:
+    """Workouts that replace the template's in one week of the mesocycle,
+    e.g. a deload week."""
+
+    week: int
+    workouts: tuple[Workout, ...]
+
+
+def _workouts_from_dicts(items: Iterable[dict]) -> tuple[Workout, ...]:
+    return tuple(
+        Workout(
+            exercises=tuple(
+                Exercise(
+                    name=ex["name"],
+                    sets=(
+                        tuple(SetPrescription(**s) for s in ex.get("sets", []))
+                        if ex.get("sets")
+                        else None
+                    ),
+                )
+                for ex in w["exercises"]
+            ),
+            index=w.get("index"),
+        )
+        for w in items
+    )
+
+
 @dataclass(frozen=True)
 class Template:
     name: str
     workouts: tuple[Workout, ...]
+    weeks: int = DEFAULT_MESOCYCLE_WEEKS
+    # Weeks whose workouts differ from ``workouts``
+    week_variations: tuple[WeekVariation, ...] = ()
 
     def to_yaml(self):
         """Convert template to YAML,
@@ -106,16 +142,41 @@ class Template:
                 return obj
 
         data = asdict(self)
+        # Templates of default length are written as before
+        if data["weeks"] == DEFAULT_MESOCYCLE_WEEKS:
+            del data["weeks"]
+        if not data["week_variations"]:
+            del data["week_variations"]
         data_with_lists = convert_tuples_to_lists(data)
         return yaml.dump(data_with_lists)
 
     def to_mesocycle_plan(self) -> "MesocyclePlan":
+        """The plan is built once per template and shared between calls."""
+        return self._mesocycle_plan
+
+    @cached_property
+    def _mesocycle_plan(self) -> "MesocyclePlan":
+        variations = {v.week: v.workouts for v in self.week_variations}
         weeks = [
-            Week(index=i, workouts=self.workouts)
-            for i in range(4)  # 4 weeks by default
+            Week(index=i, workouts=variations.get(i, self.workouts))
+            for i in range(self.weeks)
         ]
         return MesocyclePlan(template_name=self.name, weeks=weeks)
 
+    @cached_property
+    def _exercise_names(self) -> tuple[str, ...]:
+        workouts = [
+            *self.workouts,
+            *(w for v in self.week_variations for w in v.workouts),
+        ]
+        return tuple(
+            {
+                exercise.name
+                for workout in workouts
+                for exercise in workout.exercises
+            }
+        )
+
     def get_exercise_names(self) -> list[str]:
         """Returns a list of all exercise names in this template.
 
@@ -127,37 +188,30 @@ class Template:
         different operation that should be handled
         separately.
         """
-        return list(
-            {
-                exercise.name
-                for workout in self.workouts
-                for exercise in workout.exercises
-            }
-        )
+        return list(self._exercise_names)
 
     @classmethod
     def from_dict(cls, data: dict) -> "Template":
-        workouts = tuple(
-            Workout(
-                exercises=tuple(
-                    Exercise(
-                        name=ex["name"],
-                        sets=(
-                            tuple(
-                                SetPrescription(**s)
-                                for s in ex.get("sets", [])
-                            )
-                            if ex.get("sets")
-                            else None
-                        ),
-                    )
-                    for ex in w["exercises"]
-                ),
-                index=w.get("index"),
+        weeks = data.get("weeks", DEFAULT_MESOCYCLE_WEEKS)
+        if weeks < 1:
+            raise ValueError(f"A mesocycle needs at least one week: {weeks}")
+        variations = tuple(
+            WeekVariation(
+                week=v["week"], workouts=_workouts_from_dicts(v["workouts"])
             )
-            for w in data["workouts"]
+            for v in data.get("week_variations", [])
+        )
+        varied = [v.week for v in variations]
+        if any(not 0 <= week < weeks for week in varied):
+            raise ValueError(f"Week variation outside the mesocycle: {varied}")
+        if len(set(varied)) != len(varied):
+            raise ValueError(f"Several variations of one week: {varied}")
+        return cls(
+            name=data["name"],
+            workouts=_workouts_from_dicts(data["workouts"]),
+            weeks=weeks,
+            week_variations=variations,
         )
-        return cls(name=data["name"], workouts=workouts)
 
 
 @dataclass(frozen=True)
@@ -210,6 +264,60 @@ class MesocyclePlan:
             for exercise in current_workout.exercises
         }
 
+    @cached_property
+    def _exercises(self) -> dict[tuple[int, int, str], Exercise]:
+        exercises: dict[tuple[int, int, str], Exercise] = {}
+        for week_index, week in enumerate(self.weeks):
+            for workout_index, workout in enumerate(week.workouts):
+                for exercise in workout.exercises:
+                    exercises.setdefault(
+                        (week_index, workout_index, exercise.name), exercise
+                    )
+        return exercises
+
+    @cached_property
+    def _exercise_names(self) -> dict[tuple[int, int], tuple[str, ...]]:
+        return {
+            (week_index, workout_index): tuple(
+                exercise.name for exercise in workout.exercises
+            )
+            for week_index, week in enumerate(self.weeks)
+            for workout_index, workout in enumerate(week.workouts)
+        }
+
+    @cached_property
+    def _locations(self) -> dict[str, tuple[tuple[int, int], ...]]:
+        locations: dict[str, list[tuple[int, int]]] = {}
+        for week_index, workout_index, name in self._exercises:
+            locations.setdefault(name, []).append((week_index, workout_index))
+        return {name: tuple(found) for name, found in locations.items()}
+
+    def get_exercise(
+        self, week_index: int, workout_index: int, name: str
+    ) -> Optional[Exercise]:
+        """Get an exercise of a workout by name, in constant time."""
+        return self._exercises.get((week_index, workout_index, name))
+
+    def required_sets(
+        self, week_index: int, workout_index: int, name: str
+    ) -> Optional[int]:
+        """Number of sets prescribed for an exercise of a workout (one if
+        the template lists none), or None if the workout lacks it."""
+        exercise = self.get_exercise(week_index, workout_index, name)
+        if exercise is None:
+            return None
+        return len(exercise.sets) if exercise.sets else 1
+
+    def exercise_names(
+        self, week_index: int, workout_index: int
+    ) -> tuple[str, ...]:
+        """Names of the exercises of a workout, in template order."""
+        return self._exercise_names.get((week_index, workout_index), ())
+
+    def workouts_with_exercise(self, name: str) -> tuple[tuple[int, int], ...]:
+        """All (week_index, workout_index) whose workout has the exercise."""
+        return self._locations.get(name, ())
+
     def get_week(self, index: int) -> Optional[Week]:
         """Get a specific week by index."""
         if 0 <= index < len(self.weeks):
@@ -0,0 +1,299 @@
+"""Segmented event log.
+
+The log is a directory of JSON Lines segments. Events are appended to the
+newest (active) segment; once it holds ``max_events`` events it is sealed
+and a new one is started. Sealed segments are immutable and carry a small
+summary, so queries can skip segments that cannot contain what they look
+for.
+
+Segment files are named ``segment-<first>-<last>.jsonl`` after the range
+of original segment numbers they contain. Compaction merges runs of small
+sealed segments into one file covering their whole range. The merged
+segment gets its summary before it appears under its name, so readers
+never mistake a merge in progress for an interrupted one; leftovers of an
+interrupted compaction are cleaned up the next time the directory is read
+or compacted.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import TypedDict
+
+from pydantic import TypeAdapter
+
+from src.events import Event, ExerciseCompleted, SetLogged
+from src.storage import append_events as append_to_file
+from src.storage import load_events as load_file
+from src.storage import save_events as save_file
+
+DEFAULT_SEGMENT_SIZE = 1000
+DEFAULT_MIN_SEGMENT_SIZE = 250
+
+_SEGMENT_NAME = re.compile(r"segment-(\d+)-(\d+)\.jsonl")
+
+# Serializes compactions; appends never touch sealed segments
+_compaction_lock = threading.Lock()
+
+
+class SegmentSummary(TypedDict):
+    event_count: int
+    week_range: tuple[int, int] | None
+    workout_range: tuple[int, int] | None
+    exercises: list[str]
+    last_completions: dict[str, ExerciseCompleted]
+
+
+SummaryAdapter = TypeAdapter(SegmentSummary)
+
+
+def _segment_path(directory: Path, first: int, last: int) -> Path:
+    return directory / f"segment-{first:06d}-{last:06d}.jsonl"
+
+
+def _summary_path(segment: Path) -> Path:
+    return segment.with_suffix(".summary.json")
+
+
+def _segment_range(segment: Path) -> tuple[int, int]:
+    match = _SEGMENT_NAME.fullmatch(segment.name)
+    return int(match.group(1)), int(match.group(2))
+
+
+def is_sealed(segment: Path) -> bool:
+    """Sealed segments have a summary and are never written again."""
+    return _summary_path(segment).exists()
+
+
+def segment_paths(directory: Path) -> list[Path]:
+    """All live segments, oldest first.
+
+    Removes leftovers of an interrupted compaction: segments covered by a
+    sealed merged segment, and merged segments that never got a summary.
+    """
+    if not directory.exists():
+        return []
+
+    segments = sorted(
+        (p for p in directory.iterdir() if _SEGMENT_NAME.fullmatch(p.name)),
+        key=lambda p: (_segment_range(p)[0], -_segment_range(p)[1]),
+    )
+    live: list[Path] = []
+    for segment in segments:
+        first, last = _segment_range(segment)
+        incomplete_merge = first != last and not is_sealed(segment)
+        covered = bool(live) and first <= _segment_range(live[-1])[1]
+        if incomplete_merge or covered:
+            _summary_path(segment).unlink(missing_ok=True)
+            segment.unlink()
+            continue
+        live.append(segment)
+    return live
+
+
+def summarize(events: list[Event]) -> SegmentSummary:
+    """Build the summary of a segment's events."""
+    weeks = [e.week_index for e in events]
+    workouts = [e.workout_index for e in events]
+    return {
+        "event_count": len(events),
+        "week_range": (min(weeks), max(weeks)) if weeks else None,
+        "workout_range": (min(workouts), max(workouts)) if workouts else None,
+        "exercises": sorted(
+            {e.exercise for e in events if hasattr(e, "exercise")}
+        ),
+        "last_completions": {
+            e.exercise: e for e in events if isinstance(e, ExerciseCompleted)
+        },
+    }
+
+
+def _write_summary(segment: Path, summary: SegmentSummary) -> None:
+    path = _summary_path(segment)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(SummaryAdapter.dump_json(summary))
+    tmp_path.replace(path)
+
+
+def load_summary(segment: Path) -> SegmentSummary:
+    """Load the summary of a sealed segment."""
+    return SummaryAdapter.validate_json(_summary_path(segment).read_bytes())
+
+
+def roll_segment(directory: Path) -> None:
+    """Seal the active segment, e.g. at the end of a mesocycle.
+
+    The next append starts a new segment.
+    """
+    segments = segment_paths(directory)
+    if segments and not is_sealed(segments[-1]):
+        _write_summary(segments[-1], summarize(load_file(segments[-1])))
+
+
+def append_events(
+    directory: Path,
+    new_events: list[Event],
+    max_events: int = DEFAULT_SEGMENT_SIZE,
+) -> None:
+    """Append events to the active segment, sealing it once it is full."""
+    directory.mkdir(parents=True, exist_ok=True)
+    segments = segment_paths(directory)
+
+    if segments and not is_sealed(segments[-1]):
+        active = segments[-1]
+    else:
+        number = _segment_range(segments[-1])[1] + 1 if segments else 0
+        active = _segment_path(directory, number, number)
+
+    append_to_file(active, new_events)
+    if len(load_file(active)) >= max_events:
+        roll_segment(directory)
+
+
+def load_events(directory: Path) -> list[Event]:
+    """Load the whole log, oldest segment first."""
+    return [
+        event
+        for segment in segment_paths(directory)
+        for event in load_file(segment)
+    ]
+
+
+def _may_contain(
+    summary: SegmentSummary, exercise: str, week: int, workout: int
+) -> bool:
+    return (
+        exercise in summary["exercises"]
+        and summary["week_range"][0] <= week <= summary["week_range"][1]
+        and summary["workout_range"][0]
+        <= workout
+        <= summary["workout_range"][1]
+    )
+
+
+def last_completed_performance(
+    directory: Path,
+    exercise_name: str,
+    current_week_idx: int | None = None,
+    current_workout_idx: int | None = None,
+) -> tuple[list[SetLogged] | None, ExerciseCompleted | None]:
+    """Segment-aware ``prescription._get_last_completed_performance``.
+
+    Sealed segments whose summary shows no completion of the exercise are
+    skipped, and only segments that may hold sets of the found completion
+    are read.
+    """
+
+    def is_current(completion: ExerciseCompleted) -> bool:
+        return (
+            completion.week_index == current_week_idx
+            and completion.workout_index == current_workout_idx
+        )
+
+    segments = segment_paths(directory)
+    summaries = {s: load_summary(s) for s in segments if is_sealed(s)}
+
+    found: tuple[int, ExerciseCompleted] | None = None
+    for position in reversed(range(len(segments))):
+        summary = summaries.get(segments[position])
+        if summary is not None:
+            last = summary["last_completions"].get(exercise_name)
+            if last is None:
+                continue
+            if not is_current(last):
+                found = position, last
+                break
+        completions = [
+            e
+            for e in load_file(segments[position])
+            if isinstance(e, ExerciseCompleted)
+            and e.exercise == exercise_name
+            and not is_current(e)
+        ]
+        if completions:
+            found = position, completions[-1]
+            break
+
+    if found is None:
+        return None, None
+
+    position, completion = found
+    week, workout = completion.week_index, completion.workout_index
+    completion_sets = [
+        e
+        for segment in segments[: position + 1]
+        if segment not in summaries
+        or _may_contain(summaries[segment], exercise_name, week, workout)
+        for e in load_file(segment)
+        if isinstance(e, SetLogged)
+        and e.exercise == exercise_name
+        and e.week_index == week
+        and e.workout_index == workout
+    ]
+    return completion_sets, completion
+
+
+def _remove_orphans(directory: Path) -> None:
+    """Remove temporary files and summaries without a segment left by an
+    interrupted compaction. Only safe while holding the compaction lock."""
+    if not directory.exists():
+        return
+    for path in directory.glob(".tmp-segment-*"):
+        path.unlink(missing_ok=True)
+    for path in directory.glob("segment-*.summary.json"):
+        if not path.with_name(
+            path.name.removesuffix(".summary.json") + ".jsonl"
+        ).exists():
+            path.unlink(missing_ok=True)
+
+
+def compact(
+    directory: Path, min_events: int = DEFAULT_MIN_SEGMENT_SIZE
+) -> int:
+    """Merge runs of adjacent sealed segments smaller than ``min_events``.
+
+    Returns the number of segments removed.
+    """
+    with _compaction_lock:
+        _remove_orphans(directory)
+        sealed = [s for s in segment_paths(directory) if is_sealed(s)]
+        runs: list[list[Path]] = [[]]
+        for segment in sealed:
+            if load_summary(segment)["event_count"] < min_events:
+                runs[-1].append(segment)
+            elif runs[-1]:
+                runs.append([])
+
+        removed = 0
+        for run in runs:
+            if len(run) < 2:
+                continue
+            events = [e for segment in run for e in load_file(segment)]
+            merged = _segment_path(
+                directory,
+                _segment_range(run[0])[0],
+                _segment_range(run[-1])[1],
+            )
+            tmp_path = merged.with_name(".tmp-" + merged.name)
+            save_file(tmp_path, events)
+            # Sealed as soon as it exists: readers never delete it
+            _write_summary(merged, summarize(events))
+            tmp_path.replace(merged)
+            # From here on the originals count as covered by the merge, and
+            # readers may already be removing them
+            for segment in run:
+                _summary_path(segment).unlink(missing_ok=True)
+                segment.unlink(missing_ok=True)
+            removed += len(run) - 1
+        return removed
+
+
+def compact_in_background(
+    directory: Path, min_events: int = DEFAULT_MIN_SEGMENT_SIZE
+) -> threading.Thread:
+    """Run ``compact`` on a daemon thread."""
+    thread = threading.Thread(
+        target=compact, args=(directory, min_events), daemon=True
+    )
+    thread.start()
+    return thread
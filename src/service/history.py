@@ -0,0 +1,95 @@
+"""Time-travel queries: the athlete's state as of a past moment."""
+
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import TypedDict
+
+from src.checkpoints import cursor_at_offset
+from src.domain.completions import completion_history, completions_before
+from src.domain.cursor import position
+from src.domain.index import context_events, index_events
+from src.domain.reducers import reduce_exercise_events
+from src.domain.state import initial_exercise_state
+from src.domain.timeline import offset_at, private_timeline
+from src.domain.types import (
+    CompletionHistory,
+    ContextIndex,
+    ExerciseState,
+    Timeline,
+)
+from src.events import Event, ExerciseStarted
+from src.models import Template
+from src.service.prescription import (
+    Prescription,
+    baseline_prescriptions,
+    prescriptions_from_completions,
+)
+
+
+class AsOfState(TypedDict):
+    offset: int
+    week_index: int
+    workout_index: int
+    exercises: dict[str, ExerciseState]
+    prescriptions: dict[str, list[Prescription]]
+
+
+def state_as_of(
+    events: Sequence[Event],
+    template: Template,
+    when: datetime,
+    checkpoints: Path,
+    timeline: Timeline | None = None,
+    index: ContextIndex | None = None,
+    completions: CompletionHistory | None = None,
+) -> AsOfState:
+    """Position, exercise states and prescriptions as they were at
+    ``when``.
+
+    The log offset of ``when`` is found by binary search on the timeline
+    (see ``src.domain.timeline``) and the position is restored from the
+    nearest checkpoint before it. Exercise states and prescriptions are
+    read through ``index`` and ``completions`` as of that offset, without
+    replaying the events before it. Timezone-aware moments are converted
+    to local time, which is what logged timestamps use.
+
+    ``timeline``, ``index`` and ``completions`` are those of an open store
+    (see ``src.tenants``) and may be shared with its writer: they are
+    read, never extended, and built privately when missing or too short.
+    """
+    if when.tzinfo is not None:
+        when = when.astimezone().replace(tzinfo=None)
+    offset = offset_at(private_timeline(events, timeline), when)
+    # An exercise starts with its first set, which happened after ``when``
+    while offset and isinstance(events[offset - 1], ExerciseStarted):
+        offset -= 1
+    plan = template.to_mesocycle_plan()
+    week, workout = position(
+        cursor_at_offset(events, offset, checkpoints), plan
+    )
+
+    current_workout = plan.get_workout(week, workout)
+    baseline = (
+        baseline_prescriptions(current_workout) if current_workout else {}
+    )
+    if index is None or index["size"] < offset:
+        index = index_events(events, index)
+    if completions is None or completions["size"] < offset:
+        completions = completion_history(events)
+
+    return {
+        "offset": offset,
+        "week_index": week,
+        "workout_index": workout,
+        "exercises": {
+            name: reduce_exercise_events(
+                initial_exercise_state(name, week, workout),
+                context_events(events, index, week, workout, name, offset),
+            )
+            for name in baseline
+        },
+        "prescriptions": prescriptions_from_completions(
+            baseline, completions_before(completions, offset), week, workout
+        ),
+    }
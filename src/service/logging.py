@@ -1,8 +1,9 @@
 # src/service/logging.py (NEW FILE - pure functions)
 from returns.result import Result, Success, Failure
 from datetime import datetime
-from thefuzz import fuzz
+from src.domain.cursor import cursor_at, position
 from src.domain.state import exercise_state, workout_state
+from src.domain.types import ContextIndex, Cursor
 from src.events import (
     Event,
     ExerciseStarted,
@@ -11,29 +12,33 @@ from src.events import (
     WorkoutCompleted,
 )
 from src.models import Template
+from src.service.suggestions import suggest
 
 
 def current_position(
-    events: list[Event], template: Template
+    events: list[Event], template: Template, cursor: Cursor | None = None
 ) -> tuple[int, int]:
-    """Calculate current (week_index, workout_index) from events."""
+    """Calculate current (week_index, workout_index) from events.
+
+    A ``cursor`` (see ``src.domain.cursor``) of an earlier state of the
+    log saves scanning the events it already covers.
+    """
     plan = template.to_mesocycle_plan()
-    week_idx = plan.current_week_index(events)
-    workout_idx = plan.current_workout_index(events)
-    return week_idx, workout_idx
+    return position(cursor_at(events, cursor), plan)
 
 
 def suggest_exercise_name(exercise: str, names: list[str]) -> Result[str, str]:
-
-    match_rank = {fuzz.ratio(exercise, name): name for name in names}
-    best_match_score = max(match_rank.keys())
-    if best_match_score == max(match_rank.keys()):
-        if best_match_score > 80:
-            best_match = match_rank[best_match_score]
-            return Failure(
-                f"Exercise '{exercise}' not in template. Did you mean '{best_match}'?"
-            )
+    """Failure for an unknown exercise, naming the closest known ones."""
+    matches = suggest(exercise, names)
+    if not matches:
         return Failure(f"Unknown exercise: {exercise}")
+    quoted = [f"'{name}'" for name in matches]
+    alternatives = " or ".join(
+        filter(None, [", ".join(quoted[:-1]), quoted[-1]])
+    )
+    return Failure(
+        f"Exercise '{exercise}' not in template. Did you mean {alternatives}?"
+    )
 
 
 def log_set(
@@ -42,10 +47,15 @@ def log_set(
     exercise: str,
     reps: int,
     weight: float,
+    index: ContextIndex | None = None,
+    cursor: Cursor | None = None,
 ) -> Result[list[Event] | str, str]:
     """
     Pure business logic for logging a set.
 
+    ``index`` (see ``src.domain.index``) speeds up the state lookup and
+    ``cursor`` (see ``src.domain.cursor``) the position lookup.
+
     Returns:
         Success(new_events) if valid
         Failure(error_message) if invalid
@@ -56,10 +66,10 @@ def log_set(
         return suggest_exercise_name(exercise, exercise_names)
 
     # Get current context
-    week, workout = current_position(events, template)
+    week, workout = current_position(events, template, cursor)
 
     # Get current state
-    state = exercise_state(events, exercise, week, workout)
+    state = exercise_state(events, exercise, week, workout, index)
 
     # Validate can log
     if state["completed"]:
@@ -99,10 +109,12 @@ def complete_exercise(
     template: Template,
     exercise: str,
     feedback: dict[str, int],
+    index: ContextIndex | None = None,
+    cursor: Cursor | None = None,
 ) -> Result[list[Event], str]:
     """Pure business logic for completing an exercise."""
-    week, workout = current_position(events, template)
-    state = exercise_state(events, exercise, week, workout)
+    week, workout = current_position(events, template, cursor)
+    state = exercise_state(events, exercise, week, workout, index)
 
     # Get required sets from template
     plan = template.to_mesocycle_plan()
@@ -111,15 +123,11 @@ def complete_exercise(
     if not current_workout:
         return Failure(f"No workout found at week {week}, workout {workout}")
 
-    current_exercise = next(
-        (ex for ex in current_workout.exercises if ex.name == exercise), None
-    )
+    required_sets = plan.required_sets(week, workout, exercise)
 
-    if not current_exercise:
+    if required_sets is None:
         return Failure(f"Exercise '{exercise}' not found in workout {workout}")
 
-    required_sets = len(current_exercise.sets) if current_exercise.sets else 1
-
     if len(state["sets"]) < required_sets:
         return Failure(
             f"Cannot complete '{exercise}' - only {len(state['sets'])} of {required_sets} sets completed"
@@ -139,10 +147,13 @@ def complete_exercise(
 
 
 def complete_workout(
-    events: list[Event], template: Template
+    events: list[Event],
+    template: Template,
+    index: ContextIndex | None = None,
+    cursor: Cursor | None = None,
 ) -> Result[list[Event], str]:
     """Pure business logic for completing a workout."""
-    week, workout = current_position(events, template)
+    week, workout = current_position(events, template, cursor)
 
     plan = template.to_mesocycle_plan()
     current_workout = plan.get_workout(week, workout)
@@ -150,8 +161,8 @@ def complete_workout(
     if not current_workout:
         return Failure(f"No workout found at week {week}, workout {workout}")
 
-    exercise_names = [ex.name for ex in current_workout.exercises]
-    state = workout_state(events, exercise_names, week, workout)
+    exercise_names = list(plan.exercise_names(week, workout))
+    state = workout_state(events, exercise_names, week, workout, index)
 
     if state["missing_exercises"]:
         missing = ", ".join(state["missing_exercises"])
@@ -8,10 +8,15 @@ IMPORTANT: Prescriptions are calculated based on COMPLETED workouts only.
 The current in-progress workout does not influence prescriptions.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Optional, Callable
 
+from src.domain.columns import select_sets
+from src.domain.completions import exercise_completions, exercise_sets
+from src.domain.types import CompletionHistory
 from src.events import ExerciseCompleted, SetLogged
+from src.models import Workout
 
 
 @dataclass(frozen=True)
@@ -22,12 +27,26 @@ class Prescription:
     prescribed_weight: Optional[float]
 
 
+def baseline_prescriptions(workout: Workout) -> dict[str, list[Prescription]]:
+    """The template's prescriptions for every exercise of a workout."""
+    return {
+        exercise.name: [
+            Prescription(
+                prescribed_reps=s.prescribed_reps,
+                prescribed_weight=s.prescribed_weight,
+            )
+            for s in exercise.sets or ()
+        ]
+        for exercise in workout.exercises
+    }
+
+
 # Type alias for prescription strategy functions
 PrescriptionStrategy = Callable[
     [
         str,
         list[Prescription],
-        list[SetLogged],
+        Sequence[SetLogged],
         list[ExerciseCompleted],
         int,
         int,
@@ -38,7 +57,7 @@ PrescriptionStrategy = Callable[
 
 def _get_last_completed_performance(
     exercise_name: str,
-    historical_sets: list[SetLogged],
+    historical_sets: Sequence[SetLogged],
     feedback_history: list[ExerciseCompleted],
     current_week_idx: int | None = None,
     current_workout_idx: int | None = None,
@@ -50,7 +69,9 @@ def _get_last_completed_performance(
 
     Args:
         exercise_name: Name of the exercise
-        historical_sets: All sets logged for this exercise
+        historical_sets: All sets logged for this exercise, as a list,
+        ``src.domain.columns.SetColumns`` or
+        ``src.domain.completions.ExerciseSets``
         feedback_history: All ExerciseCompleted events
         current_week_idx: Current week index
         (to exclude from prescription calculation)
@@ -60,33 +81,31 @@ def _get_last_completed_performance(
     Returns:
         Tuple of (sets from last completion, feedback event) or (None, None)
     """
-    # Get all completions for this exercise, excluding current workout
-    completions = [
-        f
-        for f in feedback_history
-        if f.exercise == exercise_name
-        and not (
-            f.week_index == current_week_idx
-            and f.workout_index == current_workout_idx
-        )
-    ]
+    # Get the most recent completion of this exercise, excluding the
+    # current workout
+    last_completion = next(
+        (
+            f
+            for f in reversed(feedback_history)
+            if f.exercise == exercise_name
+            and not (
+                f.week_index == current_week_idx
+                and f.workout_index == current_workout_idx
+            )
+        ),
+        None,
+    )
 
-    if not completions:
+    if last_completion is None:
         return None, None
 
-    # Get the most recent completion
-    last_completion = completions[-1]
-
     # Get all sets from that workout
-    completion_sets = [
-        s
-        for s in historical_sets
-        if (
-            s.exercise == exercise_name
-            and s.week_index == last_completion.week_index
-            and s.workout_index == last_completion.workout_index
-        )
-    ]
+    completion_sets = select_sets(
+        historical_sets,
+        exercise_name,
+        last_completion.week_index,
+        last_completion.workout_index,
+    )
 
     return completion_sets, last_completion
 
@@ -94,7 +113,7 @@ def _get_last_completed_performance(
 def static_progression(
     exercise_name: str,
     baseline_sets: list[Prescription],
-    historical_sets: list[SetLogged],
+    historical_sets: Sequence[SetLogged],
     feedback_history: list[ExerciseCompleted],
     current_week_idx: int,
     current_workout_idx: int,
@@ -192,7 +211,7 @@ def _calculate_set_adjustment(workload: int) -> int:
 def feedback_based_progression(
     exercise_name: str,
     baseline_sets: list[Prescription],
-    historical_sets: list[SetLogged],
+    historical_sets: Sequence[SetLogged],
     feedback_history: list[ExerciseCompleted],
     current_week_idx: int,
     current_workout_idx: int,
@@ -265,7 +284,7 @@ def feedback_based_progression(
 
 def get_prescriptions_for_workout(
     workout_exercises: dict[str, list[Prescription]],
-    all_sets: list[SetLogged],
+    all_sets: Sequence[SetLogged],
     all_feedback: list[ExerciseCompleted],
     current_week_idx: int,
     current_workout_idx: int,
@@ -284,14 +303,71 @@ def get_prescriptions_for_workout(
     Returns:
         Dict of exercise name -> adjusted prescriptions
     """
-    result = {}
-    for exercise_name, baseline_prescriptions in workout_exercises.items():
-        result[exercise_name] = strategy(
+    sets_by_exercise: dict[str, list[SetLogged]] = {}
+    for s in all_sets:
+        sets_by_exercise.setdefault(s.exercise, []).append(s)
+    feedback_by_exercise: dict[str, list[ExerciseCompleted]] = {}
+    for f in all_feedback:
+        feedback_by_exercise.setdefault(f.exercise, []).append(f)
+
+    return prescriptions_from_history(
+        workout_exercises,
+        sets_by_exercise,
+        feedback_by_exercise,
+        current_week_idx,
+        current_workout_idx,
+        strategy,
+    )
+
+
+def prescriptions_from_history(
+    workout_exercises: dict[str, list[Prescription]],
+    sets_by_exercise: dict[str, Sequence[SetLogged]],
+    feedback_by_exercise: dict[str, list[ExerciseCompleted]],
+    current_week_idx: int,
+    current_workout_idx: int,
+    strategy: PrescriptionStrategy = feedback_based_progression,
+) -> dict[str, list[Prescription]]:
+    """Like ``get_prescriptions_for_workout``, with the history already
+    grouped by exercise (see ``src.domain.state.workout_history``).
+
+    Each strategy call only sees the history of its own exercise.
+    """
+    return {
+        exercise_name: strategy(
             exercise_name,
             baseline_prescriptions,
-            all_sets,
-            all_feedback,
+            sets_by_exercise.get(exercise_name, []),
+            feedback_by_exercise.get(exercise_name, []),
             current_week_idx,
             current_workout_idx,
         )
-    return result
+        for exercise_name, baseline_prescriptions in workout_exercises.items()
+    }
+
+
+def prescriptions_from_completions(
+    workout_exercises: dict[str, list[Prescription]],
+    history: CompletionHistory,
+    current_week_idx: int,
+    current_workout_idx: int,
+    strategy: PrescriptionStrategy = feedback_based_progression,
+) -> dict[str, list[Prescription]]:
+    """Like ``get_prescriptions_for_workout``, reading the history through
+    a ``src.domain.completions`` index.
+
+    Each strategy sees views of its exercise's history, so finding the
+    last completed performance takes constant time and the whole workout
+    O(exercises).
+    """
+    return prescriptions_from_history(
+        workout_exercises,
+        {name: exercise_sets(history, name) for name in workout_exercises},
+        {
+            name: exercise_completions(history, name)
+            for name in workout_exercises
+        },
+        current_week_idx,
+        current_workout_idx,
+        strategy,
+    )
@@ -0,0 +1,137 @@
+"""Memoized prescriptions.
+
+Prescriptions only change when an exercise is completed again: the
+strategies start from the last completed performance outside the current
+workout, never from the workout in progress. Results are therefore kept
+per exercise, keyed by that completion (its position among the
+exercise's completions and the number of sets of its workout), the
+baseline and the strategy with its parameters. Repeated requests during
+a session skip the strategies entirely.
+
+Only strategies that, like the built-in ones, depend on nothing but the
+last completed performance and the baseline may be cached.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+
+from src.domain.catalog import exercise_id
+from src.domain.completions import context_sets, exercise_completions
+from src.domain.types import CompletionHistory
+from src.events import Event, ExerciseCompleted
+from src.service.prescription import (
+    Prescription,
+    PrescriptionStrategy,
+    feedback_based_progression,
+    prescriptions_from_completions,
+)
+
+DEFAULT_CACHE_CAPACITY = 1024
+
+
+@dataclass(frozen=True)
+class PrescriptionCache:
+    capacity: int = DEFAULT_CACHE_CAPACITY
+    entries: OrderedDict = field(default_factory=OrderedDict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _strategy_key(strategy: PrescriptionStrategy) -> Hashable:
+    """Strategy with its parameters, for ``functools.partial`` ones."""
+    if isinstance(strategy, partial):
+        return (
+            _strategy_key(strategy.func),
+            strategy.args,
+            tuple(sorted(strategy.keywords.items())),
+        )
+    return strategy
+
+
+def _last_completion(
+    history: CompletionHistory, name: str, week: int, workout: int
+) -> tuple[int, int]:
+    """Position of the last completion outside the current workout among
+    the exercise's completions (-1 if none) and the number of sets of
+    its workout."""
+    completions = exercise_completions(history, name)
+    for position in range(len(completions) - 1, -1, -1):
+        completion = completions[position]
+        context = (completion.week_index, completion.workout_index)
+        if context != (week, workout):
+            return position, len(context_sets(history, name, *context))
+    return -1, 0
+
+
+def cached_prescriptions(
+    cache: PrescriptionCache,
+    workout_exercises: dict[str, list[Prescription]],
+    history: CompletionHistory,
+    current_week_idx: int,
+    current_workout_idx: int,
+    strategy: PrescriptionStrategy = feedback_based_progression,
+) -> dict[str, list[Prescription]]:
+    """``prescriptions_from_completions``, computing only the exercises
+    whose result is not cached yet."""
+    strategy_key = _strategy_key(strategy)
+    keys = {
+        name: (
+            exercise_id(name),
+            *_last_completion(
+                history, name, current_week_idx, current_workout_idx
+            ),
+            tuple(baseline),
+            strategy_key,
+        )
+        for name, baseline in workout_exercises.items()
+    }
+
+    with cache.lock:
+        found = {
+            name: cache.entries[key]
+            for name, key in keys.items()
+            if key in cache.entries
+        }
+        for name in found:
+            cache.entries.move_to_end(keys[name])
+
+    missing = {
+        name: baseline
+        for name, baseline in workout_exercises.items()
+        if name not in found
+    }
+    computed = prescriptions_from_completions(
+        missing, history, current_week_idx, current_workout_idx, strategy
+    )
+
+    with cache.lock:
+        for name, prescriptions in computed.items():
+            cache.entries[keys[name]] = tuple(prescriptions)
+        while len(cache.entries) > cache.capacity:
+            cache.entries.popitem(last=False)
+
+    results = {**found, **computed}
+    return {name: list(results[name]) for name in workout_exercises}
+
+
+def invalidate_prescriptions(
+    cache: PrescriptionCache, events: Iterable[Event]
+) -> None:
+    """Drop the cached prescriptions of exercises completed in
+    ``events``.
+
+    Keys name the completion a result starts from, so entries never go
+    stale; this frees the ones that will mostly not be asked for again.
+    """
+    completed = {
+        exercise_id(event.exercise)
+        for event in events
+        if isinstance(event, ExerciseCompleted)
+    }
+    if not completed:
+        return
+    with cache.lock:
+        for key in [key for key in cache.entries if key[0] in completed]:
+            del cache.entries[key]
@@ -0,0 +1,99 @@
+"""Suggestions of exercise names for misspelled ones.
+
+Names are indexed by their character bigrams, so a lookup only scores the
+names that share a bigram with the misspelling and have a compatible
+length, instead of the whole catalog. Two strings without a common
+(padded) bigram never score above 2/3 with ``fuzz.ratio``, so for
+thresholds above that the index finds exactly the names a full scan
+would.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+from thefuzz import fuzz
+
+# Minimum ``fuzz.ratio`` a name must exceed to be suggested
+SUGGESTION_THRESHOLD = 80
+# Number of names suggested at most
+MAX_SUGGESTIONS = 3
+
+
+@dataclass(frozen=True, eq=False)
+class NameIndex:
+    names: tuple[str, ...]
+    # Positions in ``names`` of the names containing each bigram
+    bigrams: dict[str, tuple[int, ...]]
+
+
+def _bigrams(text: str) -> set[str]:
+    """Bigrams of a text padded with start and end markers."""
+    padded = f"\x02{text}\x03"
+    return {padded[i : i + 2] for i in range(len(padded) - 1)}
+
+
+@lru_cache(maxsize=64)
+def name_index(names: tuple[str, ...]) -> NameIndex:
+    """Index of distinct names, memoized per catalog.
+
+    Names are sorted so that equally good suggestions come in a stable
+    order.
+    """
+    ordered = tuple(sorted(set(names)))
+    bigrams: dict[str, list[int]] = {}
+    for position, name in enumerate(ordered):
+        for bigram in _bigrams(name):
+            bigrams.setdefault(bigram, []).append(position)
+    return NameIndex(
+        names=ordered,
+        bigrams={bigram: tuple(found) for bigram, found in bigrams.items()},
+    )
+
+
+def _could_match(length: int, other: int, threshold: int) -> bool:
+    """Whether strings of these lengths can score above ``threshold``.
+
+    ``fuzz.ratio`` is at most ``200 * min / (length + other)``, and 100
+    for two empty strings.
+    """
+    return length == other or 200 * min(length, other) > threshold * (
+        length + other
+    )
+
+
+@lru_cache(maxsize=1024)
+def suggestions(
+    index: NameIndex,
+    text: str,
+    limit: int = MAX_SUGGESTIONS,
+    threshold: int = SUGGESTION_THRESHOLD,
+) -> tuple[str, ...]:
+    """Up to ``limit`` names scoring above ``threshold`` against ``text``,
+    best first. Recent misspellings are answered from memory."""
+    positions = {
+        position
+        for bigram in _bigrams(text)
+        for position in index.bigrams.get(bigram, ())
+    }
+    scored = [
+        (fuzz.ratio(text, name), position)
+        for position in positions
+        if _could_match(
+            len(text), len(name := index.names[position]), threshold
+        )
+    ]
+    ranked = sorted(
+        (-score, position) for score, position in scored if score > threshold
+    )
+    return tuple(index.names[position] for _, position in ranked[:limit])
+
+
+def suggest(
+    text: str,
+    names: Sequence[str],
+    limit: int = MAX_SUGGESTIONS,
+    threshold: int = SUGGESTION_THRESHOLD,
+) -> tuple[str, ...]:
+    """Names from ``names`` that ``text`` was most likely meant to be."""
+    return suggestions(name_index(tuple(names)), text, limit, threshold)
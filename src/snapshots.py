@@ -0,0 +1,142 @@
+"""Persisted projection snapshots.
+
+A snapshot stores the projection of the event log (see
+``domain.projection``) together with the number of events and, for JSON
+Lines logs, the byte offset it covers. Restoring loads the snapshot and
+only reduces the events appended after it.
+
+Projections are stored pruned (see ``prune_projection``): without the
+exercise states of completed workouts, whose sets would make every
+snapshot a second copy of the log.
+"""
+
+from pathlib import Path
+from typing import TypedDict
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.domain.catalog import exercise_id, exercise_name
+from src.domain.projection import (
+    advance,
+    empty_projection,
+    prune_projection,
+)
+from src.domain.types import Cursor, ExerciseState, Projection, WorkoutState
+from src.events import ExerciseCompleted
+from src.storage import is_jsonl, load_events, read_jsonl_tail
+
+SNAPSHOT_VERSION = 3
+DEFAULT_SNAPSHOT_INTERVAL = 500
+
+
+class Snapshot(TypedDict):
+    version: int
+    offset: int
+    byte_offset: int
+    exercises: list[ExerciseState]
+    workouts: list[WorkoutState]
+    last_completions: dict[str, ExerciseCompleted]
+    cursor: Cursor
+
+
+SnapshotAdapter = TypeAdapter(Snapshot)
+
+
+def to_snapshot(projection: Projection, byte_offset: int = 0) -> Snapshot:
+    """Convert a projection into its persisted, pruned form.
+
+    Exercise ids only hold within a process, so snapshots use names.
+    """
+    projection = prune_projection(projection)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "offset": projection["offset"],
+        "byte_offset": byte_offset,
+        "exercises": list(projection["exercises"].values()),
+        "workouts": list(projection["workouts"].values()),
+        "last_completions": {
+            exercise_name(exercise): completion
+            for exercise, completion in projection["last_completions"].items()
+        },
+        "cursor": projection["cursor"],
+    }
+
+
+def from_snapshot(snapshot: Snapshot) -> Projection:
+    """Rebuild a projection from its persisted form."""
+    return {
+        "offset": snapshot["offset"],
+        "exercises": {
+            (
+                s["week_index"],
+                s["workout_index"],
+                exercise_id(s["exercise"]),
+            ): s
+            for s in snapshot["exercises"]
+        },
+        "workouts": {
+            (s["week_index"], s["workout_index"]): s
+            for s in snapshot["workouts"]
+        },
+        "last_completions": {
+            exercise_id(name): completion
+            for name, completion in snapshot["last_completions"].items()
+        },
+        "cursor": snapshot["cursor"],
+    }
+
+
+def save_snapshot(path: Path, snapshot: Snapshot) -> None:
+    """Atomically write a snapshot file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(SnapshotAdapter.dump_json(snapshot))
+    tmp_path.replace(path)
+
+
+def load_snapshot(path: Path) -> Snapshot | None:
+    """Load a snapshot, or None if it is missing, unreadable or outdated."""
+    if not path.exists():
+        return None
+    try:
+        snapshot = SnapshotAdapter.validate_json(path.read_bytes())
+    except ValidationError:
+        return None
+    if snapshot["version"] != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def restore_projection(
+    events_path: Path,
+    snapshot_path: Path,
+    interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+) -> Projection:
+    """Projection of the event log, replaying only events after the snapshot.
+
+    A snapshot that covers more than the log holds (the log was rewritten)
+    is discarded. When at least ``interval`` events had to be replayed, a
+    new snapshot is written. Exercise states of workouts completed before
+    the snapshot are missing (see ``prune_projection``).
+    """
+    snapshot = load_snapshot(snapshot_path)
+
+    if is_jsonl(events_path):
+        size = events_path.stat().st_size if events_path.exists() else 0
+        if snapshot is None or snapshot["byte_offset"] > size:
+            snapshot = None
+        start = snapshot["byte_offset"] if snapshot else 0
+        tail, byte_offset = read_jsonl_tail(events_path, start)
+    else:
+        events = load_events(events_path)
+        if snapshot is None or snapshot["offset"] > len(events):
+            snapshot = None
+        tail = events[snapshot["offset"] :] if snapshot else events
+        byte_offset = 0
+
+    base = from_snapshot(snapshot) if snapshot else empty_projection()
+    projection = advance(base, tail)
+
+    if len(tail) >= interval:
+        save_snapshot(snapshot_path, to_snapshot(projection, byte_offset))
+
+    return projection
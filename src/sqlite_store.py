@@ -0,0 +1,129 @@
+"""SQLite-backed event store.
+
+Events are stored as JSON payloads next to the context columns used by
+``domain.helpers.filter_by_context``. Those columns are indexed, so the
+state builders and prescription lookups below only read the rows of the
+requested context. The database runs in WAL mode and every append is a
+single transaction, so several server workers can share one file.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from src.domain import state
+from src.domain.types import ExerciseState, WorkoutState
+from src.events import Event, ExerciseCompleted, SetLogged
+from src.storage import EventLineAdapter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    exercise TEXT,
+    week_index INTEGER NOT NULL,
+    workout_index INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_context
+    ON events (week_index, workout_index, exercise);
+CREATE INDEX IF NOT EXISTS events_by_exercise
+    ON events (exercise, type, week_index, workout_index);
+"""
+
+
+def connect(path: Path, timeout: float = 30.0) -> sqlite3.Connection:
+    """Open (and initialise if needed) an event database."""
+    conn = sqlite3.connect(path, timeout=timeout)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _to_row(event: Event) -> tuple:
+    return (
+        event.type,
+        getattr(event, "exercise", None),
+        event.week_index,
+        event.workout_index,
+        EventLineAdapter.dump_json(event).decode(),
+    )
+
+
+def append_events(conn: sqlite3.Connection, new_events: list[Event]) -> None:
+    """Append events in one transaction (all or nothing)."""
+    with conn:
+        conn.executemany(
+            "INSERT INTO events "
+            "(type, exercise, week_index, workout_index, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [_to_row(e) for e in new_events],
+        )
+
+
+def query_events(
+    conn: sqlite3.Connection,
+    exercise: str | None = None,
+    week: int | None = None,
+    workout: int | None = None,
+    event_type: str | None = None,
+) -> list[Event]:
+    """Indexed equivalent of ``filter_by_context``, in append order.
+
+    ``event_type`` is the ``type`` discriminator of the event
+    (e.g. ``"set"`` or ``"exercise_completed"``).
+    """
+    clauses = []
+    params: list = []
+    for column, value in (
+        ("exercise", exercise),
+        ("week_index", week),
+        ("workout_index", workout),
+        ("type", event_type),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT payload FROM events{where} ORDER BY seq", params
+    )
+    return [EventLineAdapter.validate_json(payload) for (payload,) in rows]
+
+
+def load_events(conn: sqlite3.Connection) -> list[Event]:
+    """Load the full event history in append order."""
+    return query_events(conn)
+
+
+def exercise_state(
+    conn: sqlite3.Connection, exercise: str, week: int, workout: int
+) -> ExerciseState:
+    """Build exercise state from the events of one context only."""
+    relevant = query_events(
+        conn, exercise=exercise, week=week, workout=workout
+    )
+    return state.exercise_state(relevant, exercise, week, workout)
+
+
+def workout_state(
+    conn: sqlite3.Connection,
+    exercise_names: list[str],
+    week: int,
+    workout: int,
+) -> WorkoutState:
+    """Build workout state from the events of one workout only."""
+    relevant = query_events(conn, week=week, workout=workout)
+    return state.workout_state(relevant, exercise_names, week, workout)
+
+
+def exercise_history(
+    conn: sqlite3.Connection, exercise: str
+) -> tuple[list[SetLogged], list[ExerciseCompleted]]:
+    """Sets and completions of one exercise, as prescription input."""
+    sets = query_events(conn, exercise=exercise, event_type="set")
+    completions = query_events(
+        conn, exercise=exercise, event_type="exercise_completed"
+    )
+    return sets, completions
@@ -1,19 +1,163 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import takewhile
+from datetime import datetime
 from pathlib import Path
+from typing import IO
+import hashlib
 import json
+import os
 import yaml
 from pydantic import TypeAdapter
-from src.events import Event
+from src.domain.catalog import intern_names
+from src.events import EVENT_TYPES, Event, SetLogged
 from src.models import Template
 
 # Pydantic type adapter for automatic serialization
 EventAdapter = TypeAdapter(list[Event])
 
+# Single-event adapter for the append-only JSON Lines format
+EventLineAdapter = TypeAdapter(Event)
 
-def load_events(path: Path) -> list[Event]:
-    """Load all events from JSON file using Pydantic."""
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+# First line of JSON Lines files written here. Every event in such a file
+# was validated when it was created, so it is read back without validation.
+LOG_HEADER = b'{"format":"muscleapi-events","version":1}\n'
+
+# Bytes before the cached offset that must be unchanged for a JSON Lines
+# file to count as appended to rather than rewritten
+FINGERPRINT_SIZE = 64
+
+
+def is_jsonl(path: Path) -> bool:
+    """Check whether the path uses the append-only JSON Lines format."""
+    return path.suffix in JSONL_SUFFIXES
+
+
+def _encode_lines(events: list[Event]) -> bytes:
+    """Serialize events as newline-terminated JSON documents."""
+    return b"".join(EventLineAdapter.dump_json(e) + b"\n" for e in events)
+
+
+def _has_header(path: Path) -> bool:
+    """Check whether a JSON Lines file starts with the writer's header."""
+    with open(path, "rb") as f:
+        return f.read(len(LOG_HEADER)) == LOG_HEADER
+
+
+def _trusted_event(line: bytes) -> Event:
+    """Build an event from a line written by this module, skipping
+    validation."""
+    data = json.loads(line)
+    cls = EVENT_TYPES[data["type"]]
+    if cls is SetLogged:
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    event = object.__new__(cls)
+    event.__dict__.update(data)
+    return event
+
+
+def _parse_lines(lines: Iterable[bytes], trusted: bool) -> Iterator[Event]:
+    parse = _trusted_event if trusted else EventLineAdapter.validate_json
+    for line in lines:
+        if line.strip() and line.rstrip(b"\n") != LOG_HEADER.rstrip():
+            yield parse(line)
+
+
+def iter_jsonl_events(path: Path, verify: bool = False) -> Iterator[Event]:
+    """Stream events from a JSON Lines file, one line at a time.
+
+    Files stamped with the writer's header are read without validation
+    unless ``verify`` is set. Like ``read_jsonl_tail``, a trailing line
+    without newline is left out: it is still being written.
+    """
+    if not path.exists():
+        return
+
+    trusted = not verify and _has_header(path)
+    with open(path, "rb") as f:
+        complete = takewhile(lambda line: line.endswith(b"\n"), f)
+        yield from _parse_lines(complete, trusted)
+
+
+def read_jsonl_tail(
+    path: Path, byte_offset: int = 0, verify: bool = False
+) -> tuple[list[Event], int]:
+    """Read the events appended to a JSON Lines file after ``byte_offset``.
+
+    Returns the events together with the offset just past the last
+    complete line, which is where the next read should start.
+    """
+    if not path.exists():
+        return [], 0
+
+    trusted = not verify and _has_header(path)
+    with open(path, "rb") as f:
+        f.seek(byte_offset)
+        data = f.read()
+
+    # A trailing line without newline is still being written
+    complete = data.rfind(b"\n") + 1
+    events = list(_parse_lines(data[:complete].splitlines(), trusted))
+    return events, byte_offset + complete
+
+
+def verify_events(path: Path) -> list[Event]:
+    """Load all events with full Pydantic validation, bypassing the cache.
+
+    Raises ``pydantic.ValidationError`` on the first invalid event.
+    """
     if not path.exists():
         return []
+    if is_jsonl(path):
+        return list(iter_jsonl_events(path, verify=True))
+    return _read_json_events(path)
+
+
+def _iter_json_array(path: Path, chunk_size: int) -> Iterator[object]:
+    """Decode the elements of a JSON array file one at a time."""
+    decoder = json.JSONDecoder()
+    with open(path) as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} does not contain a JSON array")
+        buffer = buffer[1:]
+        while True:
+            buffer = buffer.lstrip().removeprefix(",").lstrip()
+            if buffer.startswith("]"):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer += chunk
+                continue
+            yield item
+            buffer = buffer[end:]
+
 
+def iter_events(path: Path, chunk_size: int = 1 << 16) -> Iterator[Event]:
+    """Stream events from disk without loading the whole file.
+
+    Memory use is bounded by one event (JSON Lines) or one read chunk
+    (JSON arrays), whatever the size of the history. Bypasses the cache.
+    """
+    if not path.exists():
+        return
+
+    if is_jsonl(path):
+        yield from iter_jsonl_events(path)
+        return
+
+    for item in _iter_json_array(path, chunk_size):
+        yield EventLineAdapter.validate_python(item)
+
+
+def _read_json_events(path: Path) -> list[Event]:
+    """Parse and validate a whole JSON array event file."""
     with open(path) as f:
         data = json.load(f)
 
@@ -21,26 +165,216 @@ def load_events(path: Path) -> list[Event]:
     return EventAdapter.validate_python(data)
 
 
-def save_events(path: Path, events: list[Event]) -> None:
+@dataclass(frozen=True)
+class _CachedLog:
+    events: list[Event]
+    size: int
+    mtime_ns: int
+    inode: int
+    offset: int
+    fingerprint: bytes
+
+
+# Process-level cache of parsed event files, keyed by path
+_event_cache: dict[Path, _CachedLog] = {}
+
+
+def _read_fingerprint(path: Path, offset: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(max(0, offset - FINGERPRINT_SIZE))
+        return f.read(min(offset, FINGERPRINT_SIZE))
+
+
+def _is_appended(path: Path, cached: _CachedLog, stat: os.stat_result) -> bool:
+    """Check whether a JSON Lines file only grew since it was cached."""
+    return (
+        stat.st_ino == cached.inode
+        and stat.st_size >= cached.offset
+        and _read_fingerprint(path, cached.offset) == cached.fingerprint
+    )
+
+
+def _cache(
+    path: Path, events: list[Event], offset: int, stat: os.stat_result
+) -> None:
+    _event_cache[path] = _CachedLog(
+        events=events,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        inode=stat.st_ino,
+        offset=offset,
+        fingerprint=_read_fingerprint(path, offset) if offset else b"",
+    )
+
+
+def clear_event_cache() -> None:
+    """Forget all cached event files."""
+    _event_cache.clear()
+
+
+def forget_events(path: Path) -> None:
+    """Drop one event file from the cache."""
+    _event_cache.pop(path, None)
+
+
+def load_events(path: Path) -> list[Event]:
+    """Load all events from JSON file using Pydantic.
+
+    Results are cached per path. An unchanged file is served from the
+    cache, a JSON Lines file that was appended to only has its new lines
+    parsed, and anything else is reloaded. The returned list is shared
+    with the cache and must not be mutated.
+    """
+    return load_events_with_offset(path)[0]
+
+
+def load_events_with_offset(path: Path) -> tuple[list[Event], int]:
+    """Like ``load_events``, also returning the byte offset the events
+    cover in a JSON Lines file (0 for JSON array files)."""
+    if not path.exists():
+        _event_cache.pop(path, None)
+        return [], 0
+
+    stat = path.stat()
+    cached = _event_cache.get(path)
+    if cached is not None and (
+        stat.st_size,
+        stat.st_mtime_ns,
+        stat.st_ino,
+    ) == (cached.size, cached.mtime_ns, cached.inode):
+        return cached.events, cached.offset
+
+    if not is_jsonl(path):
+        events = _read_json_events(path)
+        _cache(path, events, 0, stat)
+        return events, 0
+
+    if cached is not None and _is_appended(path, cached, stat):
+        tail, offset = read_jsonl_tail(path, cached.offset)
+        events = [*cached.events, *tail] if tail else cached.events
+    else:
+        events, offset = read_jsonl_tail(path)
+
+    _cache(path, events, offset, stat)
+    return events, offset
+
+
+def _sync(f: IO) -> None:
+    """Force written data to disk."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def save_events(path: Path, events: list[Event], fsync: bool = False) -> None:
     """Save all events to JSON file (overwrites)."""
+    if is_jsonl(path):
+        with open(path, "wb") as f:
+            f.write(LOG_HEADER + _encode_lines(events))
+            if fsync:
+                _sync(f)
+        return
+
     # Pydantic handles serialization
     data = EventAdapter.dump_python(events, mode="json")
 
     with open(path, "w") as f:
         json.dump(data, f, indent=2, default=str)
+        if fsync:
+            _sync(f)
+
 
+def append_events(
+    path: Path, new_events: list[Event], fsync: bool = False
+) -> None:
+    """Append new events to existing file.
+
+    JSON Lines files only get the new events written to their end, so the
+    cost of an append does not depend on the size of the history. Plain
+    JSON files are loaded and rewritten as a whole. With ``fsync`` the
+    data is on disk when this returns.
+    """
+    if is_jsonl(path):
+        with open(path, "ab") as f:
+            header = LOG_HEADER if f.tell() == 0 else b""
+            f.write(header + _encode_lines(new_events))
+            if fsync:
+                _sync(f)
+        return
 
-def append_events(path: Path, new_events: list[Event]) -> None:
-    """Append new events to existing file."""
     existing = load_events(path)
     all_events = existing + new_events
-    save_events(path, all_events)
+    save_events(path, all_events, fsync=fsync)
+
+
+def migrate_legacy_log(path: Path, legacy: Iterable[Path]) -> bool:
+    """Convert an older event file into the log at ``path``, once.
+
+    Only runs while ``path`` does not exist: the first existing file of
+    ``legacy`` (e.g. a JSON array ``events.json``) is written as a JSON
+    Lines log next to ``path`` and renamed into place, so a crash never
+    leaves a partial log. The legacy file is kept as it was. Returns
+    whether a file was converted.
+    """
+    if path.exists():
+        return False
+    source = next((p for p in legacy if p.exists()), None)
+    if source is None:
+        return False
+
+    events = load_events(source)
+    forget_events(source)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.migrating{path.suffix}")
+    save_events(tmp_path, events, fsync=True)
+    tmp_path.replace(path)
+    return True
+
+
+@dataclass(frozen=True)
+class _CachedTemplate:
+    template: Template
+    size: int
+    mtime_ns: int
+
+
+# Last template loaded from each path
+_template_cache: dict[Path, _CachedTemplate] = {}
+
+# Parsed templates by content hash. The same Template instance is handed
+# out for the same content, so its memoized plan is shared as well.
+_compiled_templates: dict[str, Template] = {}
+
+
+def clear_template_cache() -> None:
+    """Forget all loaded templates."""
+    _template_cache.clear()
+    _compiled_templates.clear()
 
 
 def load_template(path: Path) -> Template:
-    """Load template from YAML file."""
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    """Load template from YAML file.
+
+    The file is only read again when its size or mtime changed, and only
+    parsed again when its content hash is new.
+    """
+    stat = path.stat()
+    cached = _template_cache.get(path)
+    if cached is not None and (stat.st_size, stat.st_mtime_ns) == (
+        cached.size,
+        cached.mtime_ns,
+    ):
+        return cached.template
+
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    template = _compiled_templates.get(digest)
+    if template is None:
+        # Use your existing Template parsing logic
+        template = Template.from_dict(yaml.safe_load(content))
+        intern_names(template.get_exercise_names())
+        _compiled_templates[digest] = template
 
-    # Use your existing Template parsing logic
-    return Template.from_dict(data)
+    _template_cache[path] = _CachedTemplate(
+        template, stat.st_size, stat.st_mtime_ns
+    )
+    return template
@@ -0,0 +1,385 @@
+"""Per-user event partitions with an LRU of open stores.
+
+Every user has a directory of their own under a data root holding their
+event log, snapshot, checkpoints and (optionally) template. Stores of
+recently used users stay open: their parsed events live in the storage
+cache, their projection, context index, timeline, completion history and
+group-commit writer in the store. Opening a store only reads the log
+after its snapshot; the index, timeline and completion history are built
+from the whole log by ``load_history``, once a request needs them.
+Events committed by the writer are folded into everything built so far
+right away; anything else appended to the log is picked up by the next
+``load_history``. When more than ``capacity`` stores are open, the least
+recently used one is closed: its writer is drained, a snapshot is
+written and its events are dropped from memory.
+
+Stores in use by a request are pinned (see ``open_store`` and
+``release_store``) and never evicted, so more than ``capacity`` stores
+may stay open while they are busy. Evicted stores are closed in the
+background; opening one again waits for its close, so there is never
+more than one writer per log. Opening a store and the first build of its
+history read the log outside the lock all users share; only installing
+the result takes it.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+
+from src.domain.index import empty_index, index_appended, index_events
+from src.checkpoints import DEFAULT_CHECKPOINT_INTERVAL, update_checkpoints
+from src.domain.completions import (
+    completion_history,
+    completions_appended,
+    empty_completion_history,
+)
+from src.domain.projection import advance
+from src.domain.timeline import empty_timeline, extend_timeline, timeline_of
+from src.domain.types import (
+    CompletionHistory,
+    ContextIndex,
+    Projection,
+    Timeline,
+)
+from src.service.prescription_cache import (
+    PrescriptionCache,
+    invalidate_prescriptions,
+)
+from src.snapshots import (
+    DEFAULT_SNAPSHOT_INTERVAL,
+    restore_projection,
+    save_snapshot,
+    to_snapshot,
+)
+from src.storage import forget_events, load_events, load_events_with_offset
+from src.writer import (
+    Durability,
+    GroupCommitWriter,
+    start_writer,
+    stop_writer,
+)
+
+DEFAULT_CAPACITY = 128
+
+_USER_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+@dataclass(frozen=True)
+class UserPaths:
+    events: Path
+    snapshot: Path
+    checkpoints: Path
+    template: Path
+
+
+@dataclass(frozen=True)
+class UserStore:
+    root: Path
+    user_id: str
+    paths: UserPaths
+    writer: GroupCommitWriter
+    projection: Projection
+    # Cover the whole log only after ``load_history``
+    index: ContextIndex
+    timeline: Timeline
+    completions: CompletionHistory
+    checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL
+    prescriptions: PrescriptionCache = field(default_factory=PrescriptionCache)
+
+
+_open_stores: OrderedDict[tuple[Path, str], UserStore] = OrderedDict()
+# Number of requests using each open store
+_pins: dict[tuple[Path, str], int] = {}
+# Closes of evicted stores that are still running
+_closing: dict[tuple[Path, str], Future] = {}
+# Opens, and first builds of a store's history, that are still running
+_opening: dict[tuple[Path, str], Future] = {}
+_loading: dict[tuple[Path, str], Future] = {}
+_lock = threading.Lock()
+_closer = ThreadPoolExecutor(max_workers=4, thread_name_prefix="close-store")
+
+
+def user_paths(root: Path, user_id: str, default_template: Path) -> UserPaths:
+    """File locations of one user's partition.
+
+    Users without a template of their own use ``default_template``.
+    Raises ValueError for ids that are not safe as a directory name.
+    """
+    if not _USER_ID.fullmatch(user_id):
+        raise ValueError(f"Invalid user id: {user_id!r}")
+    directory = root / user_id
+    template = directory / "template.yaml"
+    return UserPaths(
+        events=directory / "events.jsonl",
+        snapshot=directory / "events.snapshot.json",
+        checkpoints=directory / "checkpoints",
+        template=template if template.exists() else default_template,
+    )
+
+
+def _refresh(store: UserStore) -> UserStore:
+    """Fold the events the store does not cover yet into all of its
+    state."""
+    events = load_events(store.paths.events)
+    offset = store.projection["offset"]
+    if (
+        len(events) == offset
+        and store.index["size"] == offset
+        and store.timeline["size"] == offset
+        and store.completions["size"] == offset
+    ):
+        return store
+    invalidate_prescriptions(store.prescriptions, events[offset:])
+    return replace(
+        store,
+        projection=advance(store.projection, events[offset:]),
+        index=index_events(events, store.index),
+        timeline=timeline_of(events, store.timeline),
+        completions=completion_history(events, store.completions),
+    )
+
+
+def _committed(key: tuple[Path, str], offset: int, events: list) -> None:
+    """Fold a batch the store's writer just committed into its state."""
+    with _lock:
+        store = _open_stores.get(key)
+        if store is None:
+            return
+        # Parts behind the log (or not built yet) are left to
+        # ``load_history``, which reads the missing events
+        if store.projection["offset"] == offset:
+            invalidate_prescriptions(store.prescriptions, events)
+            store = replace(
+                store, projection=advance(store.projection, events)
+            )
+        if store.index["size"] == offset:
+            store = replace(store, index=index_appended(store.index, events))
+        if store.timeline["size"] == offset:
+            store = replace(
+                store, timeline=extend_timeline(store.timeline, events)
+            )
+        if store.completions["size"] == offset:
+            store = replace(
+                store,
+                completions=completions_appended(store.completions, events),
+            )
+        _open_stores[key] = store
+
+
+def close_store(store: UserStore) -> None:
+    """Commit pending writes, snapshot the log and release its memory."""
+    stop_writer(store.writer)
+    events, byte_offset = load_events_with_offset(store.paths.events)
+    projection = advance(
+        store.projection, events[store.projection["offset"] :]
+    )
+    save_snapshot(store.paths.snapshot, to_snapshot(projection, byte_offset))
+    update_checkpoints(
+        store.paths.checkpoints, events, store.checkpoint_interval
+    )
+    forget_events(store.paths.events)
+
+
+def _close_evicted(key: tuple[Path, str], store: UserStore) -> None:
+    try:
+        close_store(store)
+    finally:
+        with _lock:
+            del _closing[key]
+
+
+def _evict(capacity: int) -> None:
+    """Close least recently used stores that are not pinned, in the
+    background, until at most ``capacity`` are open. Call under
+    ``_lock``."""
+    for key in list(_open_stores):
+        if len(_open_stores) <= capacity:
+            return
+        if _pins.get(key):
+            continue
+        store = _open_stores.pop(key)
+        _closing[key] = _closer.submit(_close_evicted, key, store)
+
+
+def _opened(
+    key: tuple[Path, str],
+    default_template: Path,
+    durability: Durability,
+    snapshot_interval: int,
+    checkpoint_interval: int,
+) -> UserStore:
+    """New store of ``key``. Runs outside ``_lock``, guarded by
+    ``_opening``, with no close of the key running.
+
+    The writer starts last, so a log that fails to load leaves no thread
+    behind.
+    """
+    root, user_id = key
+    paths = user_paths(root, user_id, default_template)
+    paths.events.parent.mkdir(parents=True, exist_ok=True)
+    projection = restore_projection(
+        paths.events, paths.snapshot, snapshot_interval
+    )
+    return UserStore(
+        root=root,
+        user_id=user_id,
+        paths=paths,
+        writer=start_writer(
+            paths.events, durability, on_commit=partial(_committed, key)
+        ),
+        projection=projection,
+        index=empty_index(),
+        timeline=empty_timeline(),
+        completions=empty_completion_history(),
+        checkpoint_interval=checkpoint_interval,
+    )
+
+
+def _use(key: tuple[Path, str], pin: bool, capacity: int) -> UserStore:
+    """Mark the open store of ``key`` as used. Call under ``_lock``."""
+    _open_stores.move_to_end(key)
+    if pin:
+        _pins[key] = _pins.get(key, 0) + 1
+    store = _open_stores[key]
+    _evict(capacity)
+    return store
+
+
+def open_store(
+    root: Path,
+    user_id: str,
+    default_template: Path,
+    capacity: int = DEFAULT_CAPACITY,
+    durability: Durability = "batch",
+    snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+    checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    pin: bool = False,
+) -> UserStore:
+    """Get the store of a user, opening it if needed.
+
+    A pinned store is not evicted until it is given back with
+    ``release_store``. Stores are opened outside the lock shared by all
+    users; concurrent requests for the same user wait for one open.
+    """
+    key = (root, user_id)
+    while True:
+        with _lock:
+            if key in _open_stores:
+                return _use(key, pin, capacity)
+            # Evicted a moment ago (its writer must stop before a new
+            # one starts), or being opened by another request
+            busy = _closing.get(key) or _opening.get(key)
+            if busy is None:
+                opening = _opening[key] = Future()
+                break
+        wait([busy])
+
+    try:
+        store = _opened(
+            key,
+            default_template,
+            durability,
+            snapshot_interval,
+            checkpoint_interval,
+        )
+    except BaseException:
+        with _lock:
+            del _opening[key]
+        opening.set_result(None)
+        raise
+
+    with _lock:
+        del _opening[key]
+        _open_stores[key] = store
+        store = _use(key, pin, capacity)
+    opening.set_result(None)
+    return store
+
+
+def _history_built(store: UserStore) -> bool:
+    offset = store.projection["offset"]
+    return (
+        store.index["size"] == offset
+        and store.timeline["size"] == offset
+        and store.completions["size"] == offset
+    )
+
+
+def load_history(store: UserStore) -> UserStore:
+    """The store with its projection, index, timeline and completion
+    history covering the whole log.
+
+    The first call after opening parses the log and builds the history
+    outside the lock shared by all users; later ones only read what was
+    appended to it by others than the store's writer.
+    """
+    key = (store.root, store.user_id)
+    while True:
+        with _lock:
+            live = _open_stores.get(key, store)
+            if _history_built(live):
+                return _installed(key, _refresh(live))
+            busy = _loading.get(key)
+            if busy is None:
+                loading = _loading[key] = Future()
+                break
+        wait([busy])
+
+    try:
+        # Private buffers: nobody else extends them until installed
+        events = load_events(store.paths.events)
+        index = index_events(events)
+        timeline = timeline_of(events)
+        completions = completion_history(events)
+        with _lock:
+            live = _open_stores.get(key, store)
+            # Catches up with what was committed meanwhile
+            live = _refresh(
+                replace(
+                    live,
+                    index=index,
+                    timeline=timeline,
+                    completions=completions,
+                )
+            )
+            return _installed(key, live)
+    finally:
+        with _lock:
+            del _loading[key]
+        loading.set_result(None)
+
+
+def _installed(key: tuple[Path, str], store: UserStore) -> UserStore:
+    """Replace the open store of ``key``, unless it was evicted. Call
+    under ``_lock``."""
+    if key in _open_stores:
+        _open_stores[key] = store
+    return store
+
+
+def release_store(root: Path, user_id: str) -> None:
+    """Unpin a store pinned by ``open_store``."""
+    key = (root, user_id)
+    with _lock:
+        pins = _pins.pop(key, 0) - 1
+        if pins > 0:
+            _pins[key] = pins
+
+
+def close_all_stores() -> None:
+    """Close every open store, e.g. on shutdown."""
+    with _lock:
+        opening = list(_opening.values())
+    wait(opening)
+    with _lock:
+        stores = list(_open_stores.values())
+        _open_stores.clear()
+        _pins.clear()
+        closing = list(_closing.values())
+    for store in stores:
+        close_store(store)
+    wait(closing)
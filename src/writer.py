@@ -0,0 +1,217 @@
+"""Group-commit writer for the event log.
+
+All writes go through one writer thread. Commands submitted while a batch
+is being committed queue up and are committed together: each command is
+decided against the history plus the events accepted earlier in its
+batch, and all accepted events are written with one append (and at most
+one fsync). Callers wait only for the batch that holds their command.
+
+Durability:
+    "event"  fsync after every event
+    "batch"  one fsync per batch
+    "none"   leave flushing to the OS
+"""
+
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Literal, get_args
+
+from returns.pipeline import is_successful
+from returns.result import Result, Success
+
+from src.events import Event
+from src.storage import append_events, load_events
+
+Durability = Literal["event", "batch", "none"]
+
+# Decides which events to append, given the current history (read-only)
+Command = Callable[[Sequence[Event]], Result[list[Event], str]]
+
+# Told the position of the first committed event and the events of a batch
+CommitListener = Callable[[int, list[Event]], None]
+
+DEFAULT_MAX_BATCH = 256
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class _Pending(Sequence):
+    """Read-only view of the history followed by the events accepted
+    earlier in a batch, so commands see them without a copy of the
+    whole history."""
+
+    history: Sequence[Event]
+    accepted: tuple[Event, ...]
+
+    def __len__(self) -> int:
+        return len(self.history) + len(self.accepted)
+
+    def __getitem__(self, position):
+        size = len(self.history)
+        if isinstance(position, slice):
+            start, stop, step = position.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return [
+                *self.history[start : min(stop, size)],
+                *self.accepted[max(start - size, 0) : max(stop - size, 0)],
+            ]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        if position < size:
+            return self.history[position]
+        return self.accepted[position - size]
+
+
+@dataclass(frozen=True)
+class GroupCommitWriter:
+    path: Path
+    durability: Durability = "batch"
+    max_batch: int = DEFAULT_MAX_BATCH
+    requests: queue.Queue = field(default_factory=queue.Queue)
+    thread: threading.Thread | None = None
+    on_commit: CommitListener | None = None
+    # Set by ``stop_writer``; guarded by ``lock`` together with the queue
+    stopped: threading.Event = field(default_factory=threading.Event)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def start_writer(
+    path: Path,
+    durability: Durability = "batch",
+    max_batch: int = DEFAULT_MAX_BATCH,
+    on_commit: CommitListener | None = None,
+) -> GroupCommitWriter:
+    """Start the writer thread for an event log.
+
+    ``on_commit`` is called on the writer thread after each batch is
+    written and before its callers are answered. Raises ValueError for
+    an unknown ``durability``.
+    """
+    if durability not in get_args(Durability):
+        raise ValueError(f"Unknown durability: {durability!r}")
+    writer = GroupCommitWriter(
+        path, durability, max_batch, on_commit=on_commit
+    )
+    thread = threading.Thread(target=_run, args=(writer,), daemon=True)
+    thread.start()
+    return replace(writer, thread=thread)
+
+
+def stop_writer(writer: GroupCommitWriter) -> None:
+    """Commit everything already submitted, then stop the thread."""
+    with writer.lock:
+        if not writer.stopped.is_set():
+            writer.stopped.set()
+            writer.requests.put(_STOP)
+    writer.thread.join()
+
+
+def submit(
+    writer: GroupCommitWriter, command: Command
+) -> Future[Result[list[Event], str]]:
+    """Queue a command; the future resolves once its batch is committed.
+
+    Raises RuntimeError if the writer is stopped: nothing would ever
+    commit the command.
+    """
+    future: Future = Future()
+    with writer.lock:
+        if writer.stopped.is_set():
+            raise RuntimeError(f"Writer of {writer.path} is stopped")
+        writer.requests.put((command, future))
+    return future
+
+
+def submit_events(
+    writer: GroupCommitWriter, events: list[Event]
+) -> Future[Result[list[Event], str]]:
+    """Queue events that need no decision against the history."""
+    return submit(writer, lambda _: Success(events))
+
+
+def _run(writer: GroupCommitWriter) -> None:
+    while True:
+        item = writer.requests.get()
+        if item is _STOP:
+            return
+
+        batch = [item]
+        stopping = False
+        while len(batch) < writer.max_batch:
+            try:
+                item = writer.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+
+        _commit(writer, batch)
+        if stopping:
+            return
+
+
+def _commit(writer: GroupCommitWriter, batch: list) -> None:
+    try:
+        history = load_events(writer.path)
+    except Exception as exc:
+        for _, future in batch:
+            future.set_exception(exc)
+        return
+
+    accepted: list[Event] = []
+    outcomes = []
+    for command, future in batch:
+        current = _Pending(history, tuple(accepted)) if accepted else history
+        try:
+            result = command(current)
+        except Exception as exc:
+            outcomes.append((future, exc))
+            continue
+        if is_successful(result):
+            accepted.extend(result.unwrap())
+        outcomes.append((future, result))
+
+    try:
+        _write(writer, accepted)
+    except Exception as exc:
+        for _, future in batch:
+            future.set_exception(exc)
+        return
+
+    if writer.on_commit is not None and accepted:
+        try:
+            writer.on_commit(len(history), accepted)
+        except Exception:
+            # The events are on disk; listeners catch up from the log
+            pass
+
+    for future, outcome in outcomes:
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
+
+
+def _write(writer: GroupCommitWriter, events: list[Event]) -> None:
+    if not events:
+        return
+    match writer.durability:
+        case "event":
+            for event in events:
+                append_events(writer.path, [event], fsync=True)
+        case "batch":
+            append_events(writer.path, events, fsync=True)
+        case "none":
+            append_events(writer.path, events)
+        case _:
+            raise ValueError(f"Unknown durability: {writer.durability!r}")
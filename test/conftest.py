@@ -1,5 +1,15 @@
+from datetime import datetime
+
 from pytest import fixture
-from src.models import Exercise, SetPrescription, Workout, Template
+from src.events import SetLogged
+from src.models import (
+    Exercise,
+    MesocyclePlan,
+    SetPrescription,
+    Week,
+    Workout,
+    Template,
+)
 
 
 @fixture
@@ -15,3 +25,47 @@ def sample_template():
     )
     workouts = (Workout(exercises=exercises1), Workout(exercises=exercises2))
     return Template("twice a week maintenance", workouts=workouts)
+
+
+@fixture(scope="session")
+def make_set():
+    """Factory of SetLogged events, all logged at the same moment."""
+
+    def make(
+        exercise: str,
+        week: int,
+        workout: int,
+        reps: int = 10,
+        weight: float = 100,
+    ) -> SetLogged:
+        return SetLogged(
+            exercise=exercise,
+            reps=reps,
+            weight=weight,
+            week_index=week,
+            workout_index=workout,
+            timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        )
+
+    return make
+
+
+@fixture(scope="session")
+def make_plan():
+    """Factory of mesocycle plans repeating the same workouts every week,
+    by default a Squat and a Bench workout of one set each."""
+
+    def make(
+        n_weeks: int = 2, workouts: tuple[Workout, ...] | None = None
+    ) -> MesocyclePlan:
+        if workouts is None:
+            workouts = tuple(
+                Workout(exercises=(Exercise(name, (SetPrescription(),)),))
+                for name in ("Squat", "Bench")
+            )
+        return MesocyclePlan(
+            template_name="Test",
+            weeks=[Week(index=i, workouts=workouts) for i in range(n_weeks)],
+        )
+
+    return make
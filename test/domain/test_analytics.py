@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from hypothesis import given, strategies as st  # noqa: E402
+
+from src.domain import helpers  # noqa: E402
+from src.domain.analytics import (  # noqa: E402
+    concat_tables,
+    context_totals,
+    event_table,
+    filter_by_context,
+    filter_events_by_type,
+    mask,
+)
+from src.events import (  # noqa: E402
+    ExerciseCompleted,
+    ExerciseStarted,
+    SetLogged,
+    WorkoutCompleted,
+)
+
+
+@pytest.fixture
+def log(make_set):
+    return [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        make_set("Squat", 0, 0, reps=5, weight=100),
+        make_set("Squat", 0, 0, reps=5, weight=110),
+        make_set("Bench", 0, 1, reps=8, weight=60),
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+
+
+context = st.integers(min_value=0, max_value=2)
+events_strategy = st.lists(
+    st.one_of(
+        st.builds(
+            SetLogged,
+            exercise=st.sampled_from(["Squat", "Bench"]),
+            week_index=context,
+            workout_index=context,
+            reps=st.integers(min_value=1, max_value=20),
+            weight=st.floats(min_value=1, max_value=200),
+            timestamp=st.just(datetime(2024, 1, 1)),
+        ),
+        st.builds(WorkoutCompleted, week_index=context, workout_index=context),
+        st.builds(
+            ExerciseStarted,
+            exercise=st.sampled_from(["Squat", "Bench"]),
+            week_index=context,
+            workout_index=context,
+        ),
+    ),
+    max_size=20,
+)
+
+
+@given(
+    events=events_strategy,
+    exercise=st.sampled_from([None, "Squat", "Bench", "Row"]),
+    week=st.one_of(st.none(), context),
+    workout=st.one_of(st.none(), context),
+)
+def test_filters_agree_with_helpers(events, exercise, week, workout):
+    table = event_table(events)
+
+    assert filter_by_context(
+        events, table, exercise=exercise, week=week, workout=workout
+    ) == helpers.filter_by_context(
+        events, exercise=exercise, week=week, workout=workout
+    )
+    for event_type in (SetLogged, WorkoutCompleted, ExerciseCompleted):
+        assert filter_events_by_type(
+            events, table, event_type
+        ) == helpers.filter_events_by_type(events, event_type)
+
+
+def test_context_totals(log):
+    totals = context_totals(event_table(log))
+
+    assert totals == {
+        (0, 0, "Squat"): {"sets": 2, "tonnage": 1050.0, "max_weight": 110.0},
+        (0, 1, "Bench"): {"sets": 1, "tonnage": 480.0, "max_weight": 60.0},
+    }
+
+
+def test_context_totals_of_mask(log):
+    table = event_table(log)
+
+    totals = context_totals(table, mask(table, exercise="Bench"))
+
+    assert list(totals) == [(0, 1, "Bench")]
+
+
+def test_empty_table():
+    table = event_table([])
+
+    assert len(table) == 0
+    assert context_totals(table) == {}
+    assert filter_by_context([], table, week=0) == []
+
+
+def test_concat_tables_aggregates_across_logs(log):
+    table = concat_tables([event_table(log), event_table(log[1:2])])
+
+    assert len(table) == len(log) + 1
+    assert context_totals(table)[(0, 0, "Squat")]["sets"] == 3
@@ -0,0 +1,49 @@
+from src.domain import catalog
+from src.domain.catalog import (
+    exercise_id,
+    exercise_name,
+    intern_names,
+    lookup_id,
+)
+from src.domain.completions import completion_history, exercise_completions
+from src.domain.index import context_events, index_events
+from src.domain.projection import empty_projection, exercise_state_at
+
+
+def test_ids_are_stable_and_distinct():
+    squat = exercise_id("Catalog squat")
+
+    assert exercise_id("Catalog squat") == squat
+    assert exercise_id("Catalog bench") != squat
+    assert exercise_name(squat) == "Catalog squat"
+
+
+def test_intern_names():
+    ids = intern_names(["Catalog row", "Catalog press", "Catalog row"])
+
+    assert ids[0] == ids[2] != ids[1]
+    assert [exercise_name(i) for i in ids] == [
+        "Catalog row",
+        "Catalog press",
+        "Catalog row",
+    ]
+
+
+def test_lookup_id_does_not_intern():
+    squat = exercise_id("Catalog deadlift")
+
+    assert lookup_id("Catalog deadlift") == squat
+    assert lookup_id("Catalog never seen") is None
+    assert "Catalog never seen" not in catalog._ids
+
+
+def test_queries_do_not_grow_the_catalog():
+    size = len(catalog._names)
+
+    assert context_events([], index_events([]), 0, 0, "Catalog junk") == []
+    assert not exercise_state_at(empty_projection(), "Catalog junk", 0, 0)[
+        "started"
+    ]
+    assert exercise_completions(completion_history([]), "Catalog junk") == []
+
+    assert len(catalog._names) == size
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+from hypothesis import given, strategies as st
+
+from src.domain.catalog import exercise_id
+from src.domain.columns import (
+    append_sets,
+    select_sets,
+    set_columns,
+    to_events,
+    to_numpy,
+)
+from src.events import ExerciseCompleted, SetLogged, WorkoutCompleted
+from src.service.prescription import feedback_based_progression, Prescription
+
+
+@pytest.fixture
+def logged_sets(make_set):
+    return [
+        make_set("Squat", 0, 0, weight=102.5),
+        make_set("Bench", 0, 0, weight=102.5),
+        make_set("Squat", 0, 1, reps=8, weight=102.5),
+    ]
+
+
+sets_strategy = st.lists(
+    st.builds(
+        SetLogged,
+        exercise=st.sampled_from(["Squat", "Bench", "Row"]),
+        timestamp=st.datetimes(),
+        week_index=st.integers(min_value=0, max_value=10),
+        workout_index=st.integers(min_value=0, max_value=10),
+        reps=st.integers(min_value=1, max_value=100),
+        weight=st.floats(min_value=0.5, max_value=1000),
+    ),
+    max_size=20,
+)
+
+
+@given(sets=sets_strategy)
+def test_round_trip_is_lossless(sets):
+    assert to_events(set_columns(sets)) == sets
+
+
+def test_columns_skip_other_events(logged_sets):
+    columns = set_columns(
+        [WorkoutCompleted(week_index=0, workout_index=0), *logged_sets]
+    )
+
+    assert len(columns) == 3
+    squat, bench = exercise_id("Squat"), exercise_id("Bench")
+    assert list(columns.exercise) == [squat, bench, squat]
+    assert columns[2] == logged_sets[2]
+    assert columns[1:] == logged_sets[1:]
+
+
+def test_append_sets_extends_columns(logged_sets):
+    columns = set_columns(logged_sets[:1])
+
+    append_sets(columns, logged_sets[1:])
+
+    assert columns == logged_sets
+
+
+def test_aware_timestamps_are_rejected():
+    aware = SetLogged(
+        exercise="Squat",
+        reps=5,
+        weight=100,
+        week_index=0,
+        workout_index=0,
+        timestamp=datetime.fromisoformat("2024-01-01T12:00:00+00:00"),
+    )
+
+    with pytest.raises(ValueError):
+        set_columns([aware])
+
+
+def test_select_sets_agrees_for_lists_and_columns(logged_sets):
+    columns = set_columns(logged_sets)
+
+    for exercise in ["Squat", "Bench", "Row"]:
+        assert select_sets(columns, exercise, 0, 0) == select_sets(
+            logged_sets, exercise, 0, 0
+        )
+
+
+def test_prescriptions_accept_columns(logged_sets):
+    feedback = [
+        ExerciseCompleted(
+            exercise="Squat",
+            week_index=0,
+            workout_index=1,
+            feedback={"joint_pain": 0, "pump": 2, "workload": 2},
+        )
+    ]
+    baseline = [Prescription(prescribed_reps=10, prescribed_weight=100.0)]
+
+    assert feedback_based_progression(
+        "Squat", baseline, set_columns(logged_sets), feedback, 1, 0
+    ) == feedback_based_progression(
+        "Squat", baseline, logged_sets, feedback, 1, 0
+    )
+
+
+def test_to_numpy_shares_memory(logged_sets):
+    np = pytest.importorskip("numpy")
+    columns = set_columns(logged_sets)
+
+    arrays = to_numpy(columns)
+
+    assert arrays["reps"].tolist() == [10, 10, 8]
+    assert arrays["weight"].dtype == np.float64
+    assert arrays["timestamp"][0] == columns.timestamp[0]
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from hypothesis import given, strategies as st
+
+from src.domain.columns import select_sets
+from src.domain.completions import (
+    completion_history,
+    exercise_completions,
+    exercise_sets,
+)
+from src.events import ExerciseCompleted, ExerciseStarted, SetLogged
+
+contexts = {
+    "exercise": st.sampled_from(["Squat", "Bench"]),
+    "week_index": st.integers(min_value=0, max_value=2),
+    "workout_index": st.integers(min_value=0, max_value=1),
+}
+events_strategy = st.lists(
+    st.one_of(
+        st.builds(
+            SetLogged,
+            reps=st.integers(min_value=1, max_value=10),
+            weight=st.floats(min_value=1, max_value=200),
+            timestamp=st.just(datetime(2024, 1, 1)),
+            **contexts,
+        ),
+        st.builds(ExerciseCompleted, feedback=st.just({}), **contexts),
+        st.builds(ExerciseStarted, **contexts),
+    ),
+    max_size=30,
+)
+
+
+@given(events_strategy, st.integers(min_value=0, max_value=30))
+def test_history_matches_scans_when_extended(events, split):
+    earlier = completion_history(events[:split])
+    history = completion_history(events, earlier)
+
+    for name in ("Squat", "Bench"):
+        sets = [e for e in events if isinstance(e, SetLogged)]
+        own = [s for s in sets if s.exercise == name]
+        assert list(exercise_sets(history, name)) == own
+        assert exercise_completions(history, name) == [
+            e
+            for e in events
+            if isinstance(e, ExerciseCompleted) and e.exercise == name
+        ]
+        for week in range(3):
+            for workout in range(2):
+                assert select_sets(
+                    exercise_sets(history, name), name, week, workout
+                ) == select_sets(sets, name, week, workout)
+
+    # Extending did not change what the earlier history holds
+    rebuilt = completion_history(events[:split])
+    for name in ("Squat", "Bench"):
+        assert list(exercise_sets(earlier, name)) == list(
+            exercise_sets(rebuilt, name)
+        )
+        assert exercise_completions(earlier, name) == exercise_completions(
+            rebuilt, name
+        )
+
+
+def test_history_of_fewer_events_is_rebuilt():
+    event = ExerciseCompleted(
+        exercise="Squat", week_index=0, workout_index=0, feedback={}
+    )
+    history = completion_history([event, event])
+
+    assert completion_history([event], history)["size"] == 1
+    assert exercise_completions(completion_history([]), "Squat") == []
+
+
+def test_older_history_extended_again_keeps_both_branches():
+    def completed(workout: int) -> ExerciseCompleted:
+        return ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=workout, feedback={}
+        )
+
+    base = completion_history([completed(0)])
+    first = completion_history([completed(0), completed(1)], base)
+    second = completion_history([completed(0), completed(2)], base)
+
+    assert [c.workout_index for c in exercise_completions(base, "Squat")] == [
+        0
+    ]
+    assert [c.workout_index for c in exercise_completions(first, "Squat")] == [
+        0,
+        1,
+    ]
+    assert [
+        c.workout_index for c in exercise_completions(second, "Squat")
+    ] == [0, 2]
@@ -0,0 +1,62 @@
+from hypothesis import given, strategies as st
+
+from src.domain.cursor import (
+    advance_cursor,
+    cursor_at,
+    empty_cursor,
+    position,
+)
+from src.events import ExerciseStarted, WorkoutCompleted
+
+
+events_strategy = st.lists(
+    st.one_of(
+        st.builds(
+            WorkoutCompleted,
+            week_index=st.integers(min_value=0, max_value=4),
+            workout_index=st.integers(min_value=0, max_value=2),
+        ),
+        st.builds(
+            ExerciseStarted,
+            exercise=st.just("Squat"),
+            week_index=st.integers(min_value=0, max_value=4),
+            workout_index=st.integers(min_value=0, max_value=2),
+        ),
+    ),
+    max_size=15,
+)
+
+
+@given(
+    events=events_strategy,
+    n_weeks=st.integers(min_value=1, max_value=4),
+    split=st.integers(min_value=0, max_value=15),
+)
+def test_incremental_cursor_agrees_with_mesocycle_plan(
+    events, n_weeks, split, make_plan
+):
+    plan = make_plan(n_weeks)
+    earlier = cursor_at(events[:split])
+
+    cursor = cursor_at(events, earlier)
+
+    assert cursor == advance_cursor(empty_cursor(), events)
+    assert position(cursor, plan) == (
+        plan.current_week_index(events),
+        plan.current_workout_index(events),
+    )
+
+
+def test_cursor_of_longer_log_is_discarded():
+    events = [WorkoutCompleted(week_index=0, workout_index=0)]
+
+    assert cursor_at([], cursor_at(events)) == empty_cursor()
+
+
+def test_advance_cursor_is_pure():
+    cursor = cursor_at([WorkoutCompleted(week_index=0, workout_index=0)])
+
+    advance_cursor(cursor, [WorkoutCompleted(week_index=0, workout_index=1)])
+
+    assert cursor["completed"] == {0: 1}
+    assert cursor["offset"] == 1
@@ -1,6 +1,17 @@
 import pytest
-from src.domain.helpers import filter_by_context, filter_events_by_type
-from src.events import Event, SetLogged, ExerciseStarted, ExerciseCompleted
+from src.domain.helpers import (
+    filter_by_context,
+    filter_events_by_type,
+    iter_by_context,
+    iter_events_by_type,
+)
+from src.events import (
+    Event,
+    SetLogged,
+    ExerciseStarted,
+    ExerciseCompleted,
+    WorkoutCompleted,
+)
 from datetime import datetime
 
 
@@ -109,3 +120,15 @@ def test_filter_events_by_type():
     sets = filter_events_by_type(events, SetLogged)
     assert len(sets) == 1
     assert isinstance(sets[0], SetLogged)
+
+
+def test_iterators_are_lazy():
+    def events():
+        yield WorkoutCompleted(week_index=0, workout_index=0)
+        raise AssertionError("read past the first match")
+
+    by_context = iter_by_context(events(), week=0)
+    by_type = iter_events_by_type(events(), WorkoutCompleted)
+
+    assert next(by_context).workout_index == 0
+    assert next(by_type).workout_index == 0
@@ -0,0 +1,75 @@
+import pytest
+
+from src.domain.catalog import exercise_id
+from src.domain.index import context_events, empty_index, index_events
+from src.domain.state import exercise_state, workout_state
+from src.events import (
+    ExerciseStarted,
+    ExerciseCompleted,
+    WorkoutCompleted,
+)
+
+
+@pytest.fixture
+def events(make_set):
+    return [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        make_set("Squat", 0, 0),
+        make_set("Bench", 0, 1),
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+        make_set("Squat", 1, 0),
+    ]
+
+
+def test_index_maps_contexts_to_positions(events):
+    index = index_events(events)
+
+    assert index["size"] == len(events)
+    assert index["workouts"][(0, 0)] == [0, 1, 3, 4]
+    squat = exercise_id("Squat")
+    assert index["exercises"][(0, 0, squat)] == [0, 1, 3]
+    assert index["exercises"][(1, 0, squat)] == [5]
+
+
+def test_index_extends_without_touching_old_index(events):
+    old = index_events(events[:3])
+
+    new = index_events(events, old)
+
+    assert new == index_events(events)
+    assert old["workouts"][(0, 0)] == [0, 1]
+    assert old["size"] == 3
+
+
+def test_index_is_rebuilt_for_shorter_log(events):
+    index = index_events(events)
+
+    assert index_events(events[:2], index) == index_events(events[:2])
+
+
+def test_context_events_unknown_context(events):
+    assert context_events(events, index_events(events), 3, 0) == []
+    assert context_events([], empty_index(), 0, 0, "Squat") == []
+
+
+def test_context_events_before_a_size(events):
+    index = index_events(events)
+    everything = context_events(events, index, 0, 0)
+
+    assert context_events(events, index, 0, 0, size=len(events)) == everything
+    assert context_events(events, index, 0, 0, size=0) == []
+
+
+def test_state_builders_agree_with_and_without_index(events):
+    stale = index_events(events[:2])
+    for week, workout in [(0, 0), (0, 1), (1, 0), (2, 0)]:
+        for exercise in ["Squat", "Bench"]:
+            assert exercise_state(
+                events, exercise, week, workout, stale
+            ) == exercise_state(events, exercise, week, workout)
+        assert workout_state(
+            events, ["Squat", "Bench"], week, workout, stale
+        ) == workout_state(events, ["Squat", "Bench"], week, workout)
@@ -0,0 +1,76 @@
+import pytest
+
+from src.domain.progress import plan_progress
+from src.events import (
+    ExerciseCompleted,
+    ExerciseStarted,
+    WorkoutCompleted,
+)
+from src.models import Exercise, SetPrescription, Workout
+
+
+@pytest.fixture
+def plan(make_plan):
+    return make_plan(
+        workouts=(
+            Workout(
+                exercises=(
+                    Exercise("Squat", (SetPrescription(), SetPrescription())),
+                    Exercise("Bench", None),
+                )
+            ),
+            Workout(exercises=(Exercise("Row", (SetPrescription(),)),)),
+        )
+    )
+
+
+def test_plan_progress_before_any_event(plan):
+    matrix = plan_progress([], plan)
+
+    assert [len(week) for week in matrix] == [2, 2]
+    assert matrix[1][0]["exercises"] == [
+        {
+            "exercise": "Squat",
+            "sets_done": 0,
+            "sets_required": 2,
+            "completed": False,
+        },
+        {
+            "exercise": "Bench",
+            "sets_done": 0,
+            "sets_required": 1,
+            "completed": False,
+        },
+    ]
+
+
+def test_plan_progress_counts_events_of_each_context(plan, make_set):
+    feedback = {"joint_pain": 0, "pump": 1, "workload": 1}
+    events = iter(
+        [
+            ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+            make_set("Squat", 0, 0),
+            make_set("Squat", 0, 0),
+            ExerciseCompleted(
+                exercise="Squat",
+                week_index=0,
+                workout_index=0,
+                feedback=feedback,
+            ),
+            make_set("Bench", 0, 0),
+            WorkoutCompleted(week_index=0, workout_index=0),
+            make_set("Row", 1, 1),
+            make_set("Lunge", 1, 1),
+            make_set("Row", 5, 1),
+        ]
+    )
+
+    matrix = plan_progress(events, plan)
+
+    first = matrix[0][0]
+    assert first["completed"]
+    assert [e["sets_done"] for e in first["exercises"]] == [2, 1]
+    assert [e["completed"] for e in first["exercises"]] == [True, False]
+    assert not matrix[1][1]["completed"]
+    assert matrix[1][1]["exercises"][0]["sets_done"] == 1
+    assert matrix[0][1]["exercises"][0]["sets_done"] == 0
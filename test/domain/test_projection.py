@@ -0,0 +1,126 @@
+from datetime import datetime
+
+from hypothesis import given, strategies as st
+
+from src.domain.catalog import exercise_id
+from src.domain.projection import (
+    advance,
+    build_projection,
+    current_position,
+    empty_projection,
+    exercise_state_at,
+    verify_projection,
+    workout_state_at,
+)
+from src.domain.state import exercise_state, workout_state
+from src.events import (
+    ExerciseStarted,
+    SetLogged,
+    ExerciseCompleted,
+    WorkoutCompleted,
+)
+
+
+EVENTS = [
+    ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+    SetLogged(
+        exercise="Squat",
+        reps=10,
+        weight=100,
+        week_index=0,
+        workout_index=0,
+        timestamp=datetime(2024, 1, 1),
+    ),
+    SetLogged(
+        exercise="Squat",
+        reps=8,
+        weight=100,
+        week_index=0,
+        workout_index=0,
+        timestamp=datetime(2024, 1, 1),
+    ),
+    ExerciseCompleted(
+        exercise="Squat", week_index=0, workout_index=0, feedback={"pump": 2}
+    ),
+    WorkoutCompleted(week_index=0, workout_index=0),
+]
+
+
+def test_empty_projection(make_plan):
+    projection = empty_projection()
+
+    assert projection["offset"] == 0
+    assert current_position(projection, make_plan()) == (0, 0)
+    assert exercise_state_at(projection, "Squat", 0, 0) == exercise_state(
+        [], "Squat", 0, 0
+    )
+
+
+def test_exercise_state_matches_state_builder():
+    projection = build_projection(EVENTS)
+
+    assert projection["offset"] == len(EVENTS)
+    assert exercise_state_at(projection, "Squat", 0, 0) == exercise_state(
+        EVENTS, "Squat", 0, 0
+    )
+
+
+def test_workout_state_matches_state_builder():
+    projection = build_projection(EVENTS)
+
+    for names in (["Squat"], ["Squat", "Bench"]):
+        assert workout_state_at(projection, names, 0, 0) == workout_state(
+            EVENTS, names, 0, 0
+        )
+    assert workout_state_at(projection, ["Bench"], 0, 1) == workout_state(
+        EVENTS, ["Bench"], 0, 1
+    )
+
+
+def test_last_completions():
+    projection = build_projection(EVENTS)
+
+    assert projection["last_completions"][exercise_id("Squat")] == EVENTS[3]
+    assert exercise_id("Bench") not in projection["last_completions"]
+
+
+def test_advance_is_pure():
+    base = build_projection(EVENTS[:2])
+
+    advanced = advance(base, EVENTS[2:])
+
+    assert base["offset"] == 2
+    assert len(base["exercises"][(0, 0, exercise_id("Squat"))]["sets"]) == 1
+    assert base["cursor"]["last_week"] is None
+    assert advanced == build_projection(EVENTS)
+
+
+def test_verify_projection():
+    projection = advance(build_projection(EVENTS[:2]), EVENTS[2:4])
+
+    assert verify_projection(projection, EVENTS)
+    assert not verify_projection(build_projection(EVENTS), EVENTS[:2])
+    assert not verify_projection(projection, [*EVENTS[:2], *EVENTS[3:]])
+
+
+@given(
+    completions=st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=3),
+            st.integers(min_value=0, max_value=1),
+        ),
+        max_size=12,
+    ),
+    n_weeks=st.integers(min_value=1, max_value=4),
+)
+def test_position_agrees_with_mesocycle_plan(completions, n_weeks, make_plan):
+    plan = make_plan(n_weeks)
+    events = [
+        WorkoutCompleted(week_index=week, workout_index=workout)
+        for week, workout in completions
+    ]
+
+    assert current_position(build_projection(events), plan) == (
+        plan.current_week_index(events),
+        plan.current_workout_index(events),
+    )
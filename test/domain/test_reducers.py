@@ -1,5 +1,12 @@
 import pytest
-from src.domain.reducers import process_exercise_event, process_workout_event
+from functools import reduce
+from hypothesis import given, strategies as st
+from src.domain.reducers import (
+    process_exercise_event,
+    process_workout_event,
+    reduce_exercise_events,
+)
+from src.domain.state import initial_exercise_state
 from src.domain.types import ExerciseState, WorkoutState
 from src.events import (
     ExerciseStarted,
@@ -151,3 +158,51 @@ def test_process_workout_event_workout_completed():
     result = process_workout_event(state, event)
 
     assert result["completed"] is True
+
+
+def _events_strategy():
+    event = st.sampled_from(
+        [
+            ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+            ExerciseCompleted(
+                exercise="Squat", week_index=0, workout_index=0, feedback={}
+            ),
+            SetLogged(
+                exercise="Squat",
+                reps=5,
+                weight=100,
+                week_index=0,
+                workout_index=0,
+                timestamp=datetime(2024, 1, 1),
+            ),
+        ]
+    )
+    return st.lists(event, max_size=20)
+
+
+@given(events=_events_strategy())
+def test_reduce_exercise_events_matches_reduce(events):
+    state = initial_exercise_state("Squat", 0, 0)
+
+    assert reduce_exercise_events(state, events) == reduce(
+        process_exercise_event, events, state
+    )
+
+
+def test_reduce_exercise_events_is_pure():
+    sets = [
+        SetLogged(
+            exercise="Squat",
+            reps=5,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime(2024, 1, 1),
+        )
+    ]
+    state = {**initial_exercise_state("Squat", 0, 0), "sets": sets}
+
+    result = reduce_exercise_events(state, sets)
+
+    assert len(result["sets"]) == 2
+    assert len(state["sets"]) == 1
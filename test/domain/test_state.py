@@ -4,6 +4,8 @@ from src.domain.state import (
     can_log_set,
     can_complete_exercise,
     can_complete_workout,
+    exercise_states,
+    workout_history,
 )
 from src.events import (
     ExerciseStarted,
@@ -12,6 +14,7 @@ from src.events import (
     WorkoutCompleted,
 )
 from datetime import datetime
+from src.storage import iter_events, save_events
 
 
 def test_exercise_state_initial():
@@ -257,3 +260,109 @@ def test_can_complete_workout_when_missing():
     ]
     state = workout_state(events, ["Squat", "Bench"], 0, 0)
     assert can_complete_workout(state) is False
+
+
+def test_state_builders_accept_iterators():
+    events = [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        SetLogged(
+            exercise="Squat",
+            reps=10,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime.now(),
+        ),
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+    ]
+
+    assert exercise_state(iter(events), "Squat", 0, 0) == exercise_state(
+        events, "Squat", 0, 0
+    )
+    assert workout_state(
+        (e for e in events), ["Squat"], 0, 0
+    ) == workout_state(events, ["Squat"], 0, 0)
+
+
+def test_workout_history_matches_state_builders():
+    events = [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        SetLogged(
+            exercise="Squat",
+            reps=10,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime.now(),
+        ),
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+        SetLogged(
+            exercise="Squat",
+            reps=8,
+            weight=105,
+            week_index=1,
+            workout_index=0,
+            timestamp=datetime.now(),
+        ),
+        SetLogged(
+            exercise="Row",
+            reps=8,
+            weight=50,
+            week_index=1,
+            workout_index=0,
+            timestamp=datetime.now(),
+        ),
+    ]
+    names = ["Squat", "Bench"]
+
+    for week in (0, 1):
+        history = workout_history(iter(events), names, week, 0)
+
+        assert history["workout"] == workout_state(events, names, week, 0)
+        for name in names:
+            assert history["exercises"][name] == exercise_state(
+                events, name, week, 0
+            )
+        assert history["sets"] == {
+            "Squat": [events[1], events[4]],
+            "Bench": [],
+        }
+        assert history["completions"] == {"Squat": [events[2]], "Bench": []}
+
+
+def test_exercise_states_from_stream(tmp_path):
+    events = [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        SetLogged(
+            exercise="Squat",
+            reps=10,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime(2024, 1, 1),
+        ),
+        SetLogged(
+            exercise="Bench",
+            reps=8,
+            weight=60,
+            week_index=0,
+            workout_index=1,
+            timestamp=datetime(2024, 1, 1),
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+    path = tmp_path / "events.jsonl"
+    save_events(path, events)
+
+    states = exercise_states(iter_events(path))
+
+    assert states == {
+        (0, 0, "Squat"): exercise_state(events, "Squat", 0, 0),
+        (0, 1, "Bench"): exercise_state(events, "Bench", 0, 1),
+    }
+    assert list(exercise_states(events, workout=1)) == [(0, 1, "Bench")]
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from src.domain.timeline import (
+    empty_timeline,
+    extend_timeline,
+    offset_at,
+    private_timeline,
+    timeline_of,
+)
+from src.events import ExerciseCompleted, SetLogged, WorkoutCompleted
+
+
+def _set(hour: int) -> SetLogged:
+    return SetLogged(
+        exercise="Squat",
+        reps=5,
+        weight=100,
+        week_index=0,
+        workout_index=0,
+        timestamp=datetime(2024, 1, 1, hour),
+    )
+
+
+EVENTS = [
+    WorkoutCompleted(week_index=0, workout_index=0),
+    _set(10),
+    _set(11),
+    ExerciseCompleted(
+        exercise="Squat", week_index=0, workout_index=0, feedback={}
+    ),
+    _set(9),  # backfilled
+    _set(12),
+]
+
+
+def test_offset_at():
+    timeline = timeline_of(EVENTS)
+
+    assert offset_at(timeline, datetime(2024, 1, 1, 8)) == 1
+    assert offset_at(timeline, datetime(2024, 1, 1, 10)) == 2
+    assert offset_at(timeline, datetime(2024, 1, 1, 11, 30)) == 5
+    assert offset_at(timeline, datetime(2024, 1, 2)) == 6
+
+
+def test_timeline_is_extended_incrementally():
+    earlier = timeline_of(EVENTS[:3])
+
+    assert timeline_of(EVENTS, earlier) == timeline_of(EVENTS)
+    assert timeline_of(EVENTS[:2], earlier) == timeline_of(EVENTS[:2])
+
+
+def test_older_timelines_stay_valid():
+    base = extend_timeline(empty_timeline(), EVENTS[:2])
+    first = extend_timeline(base, [_set(23)])
+
+    second = extend_timeline(base, [_set(1)])
+
+    assert offset_at(base, datetime(2024, 1, 2)) == 2
+    assert offset_at(first, datetime(2024, 1, 1, 12)) == 2
+    assert offset_at(second, datetime(2024, 1, 1, 12)) == 3
+
+
+def test_private_timeline_leaves_the_shared_buffer_alone():
+    shared = timeline_of(EVENTS[:3])
+
+    private = private_timeline(EVENTS, shared)
+
+    assert private == timeline_of(EVENTS)
+    assert len(shared["times"]) == 3
+    assert private_timeline(EVENTS[:3], shared) is shared
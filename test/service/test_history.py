@@ -0,0 +1,110 @@
+from datetime import datetime
+from pathlib import Path
+
+from src.checkpoints import update_checkpoints
+from src.domain.completions import completion_history
+from src.domain.index import index_events
+from src.domain.timeline import timeline_of
+from src.events import (
+    ExerciseCompleted,
+    ExerciseStarted,
+    SetLogged,
+    WorkoutCompleted,
+)
+from src.models import Exercise, SetPrescription, Template, Workout
+from src.service.history import state_as_of
+
+TEMPLATE = Template(
+    name="Test",
+    workouts=(
+        Workout(
+            exercises=(
+                Exercise(
+                    "Squat",
+                    (
+                        SetPrescription(
+                            prescribed_reps=5, prescribed_weight=100
+                        ),
+                    ),
+                ),
+            )
+        ),
+    ),
+)
+
+
+def _day(week: int, day: int) -> list:
+    return [
+        ExerciseStarted(exercise="Squat", week_index=week, workout_index=0),
+        SetLogged(
+            exercise="Squat",
+            reps=5,
+            weight=100,
+            week_index=week,
+            workout_index=0,
+            timestamp=datetime(2024, 1, day, 18),
+        ),
+        ExerciseCompleted(
+            exercise="Squat",
+            week_index=week,
+            workout_index=0,
+            feedback={"joint_pain": 0, "pump": 2, "workload": 0},
+        ),
+        WorkoutCompleted(week_index=week, workout_index=0),
+    ]
+
+
+EVENTS = [*_day(0, 1), *_day(1, 8)]
+
+
+def test_state_before_anything_happened(tmp_path: Path):
+    state = state_as_of(EVENTS, TEMPLATE, datetime(2023, 12, 1), tmp_path)
+
+    assert state["offset"] == 0
+    assert (state["week_index"], state["workout_index"]) == (0, 0)
+    assert state["exercises"]["Squat"]["started"] is False
+    assert state["prescriptions"]["Squat"][0].prescribed_weight == 100
+
+
+def test_state_between_workouts(tmp_path: Path):
+    update_checkpoints(tmp_path, EVENTS, interval=3)
+
+    state = state_as_of(EVENTS, TEMPLATE, datetime(2024, 1, 5), tmp_path)
+
+    assert state["offset"] == 4
+    assert (state["week_index"], state["workout_index"]) == (1, 0)
+    assert state["prescriptions"]["Squat"][0].prescribed_weight == 110
+
+
+def test_events_after_a_set_share_its_time(tmp_path: Path):
+    when = datetime(2024, 1, 8, 18)
+
+    state = state_as_of(EVENTS, TEMPLATE, when, tmp_path)
+
+    assert state["offset"] == 8
+    assert state["week_index"] == 2
+
+
+def test_aware_moment_is_converted_to_local_time(tmp_path: Path):
+    when = datetime(2024, 1, 5).astimezone()
+
+    state = state_as_of(EVENTS, TEMPLATE, when, tmp_path)
+
+    assert state["offset"] == 4
+
+
+def test_store_history_is_read_as_of_the_offset(tmp_path: Path):
+    when = datetime(2024, 1, 5)
+
+    state = state_as_of(
+        EVENTS,
+        TEMPLATE,
+        when,
+        tmp_path,
+        timeline_of(EVENTS),
+        index_events(EVENTS),
+        completion_history(EVENTS),
+    )
+
+    expected = state_as_of(EVENTS[: state["offset"]], TEMPLATE, when, tmp_path)
+    assert state == expected
@@ -170,3 +170,10 @@ def test_log_set_valid_ranges(sample_template, reps, weight):
     new_events = result.unwrap()
     assert new_events[1].reps == reps
     assert new_events[1].weight == weight
+
+
+def test_log_set_suggests_close_exercise(sample_template):
+    result = log_set([], sample_template, "Squatt", 10, 100)
+
+    assert not is_successful(result)
+    assert "Did you mean 'Squat'?" in result.failure()
@@ -0,0 +1,120 @@
+from datetime import datetime
+from functools import partial
+
+from src.domain.completions import completion_history
+from src.events import ExerciseCompleted, SetLogged
+from src.service.prescription import (
+    Prescription,
+    prescriptions_from_completions,
+    static_progression,
+)
+from src.service.prescription_cache import (
+    PrescriptionCache,
+    cached_prescriptions,
+    invalidate_prescriptions,
+)
+
+BASELINE = {"Squat": [Prescription(prescribed_reps=5, prescribed_weight=100)]}
+
+
+def _completed(week: int, workload: int = 1) -> list:
+    return [
+        SetLogged(
+            exercise="Squat",
+            week_index=week,
+            workout_index=0,
+            reps=5,
+            weight=100 + week,
+            timestamp=datetime(2024, 1, 1 + week),
+        ),
+        ExerciseCompleted(
+            exercise="Squat",
+            week_index=week,
+            workout_index=0,
+            feedback={"joint_pain": 0, "pump": 1, "workload": workload},
+        ),
+    ]
+
+
+def _counting(calls: list):
+    def strategy(name, baseline, *history):
+        calls.append(name)
+        return static_progression(name, baseline, *history)
+
+    return strategy
+
+
+def test_cached_prescriptions_match_and_skip_the_strategy():
+    cache = PrescriptionCache()
+    calls = []
+    strategy = _counting(calls)
+    history = completion_history(_completed(0))
+
+    first = cached_prescriptions(cache, BASELINE, history, 1, 0, strategy)
+    again = cached_prescriptions(cache, BASELINE, history, 1, 0, strategy)
+
+    assert (
+        first
+        == again
+        == prescriptions_from_completions(
+            BASELINE, history, 1, 0, static_progression
+        )
+    )
+    assert calls == ["Squat"]
+
+
+def test_new_completion_changes_the_prescriptions():
+    cache = PrescriptionCache()
+    events = _completed(0)
+    before = cached_prescriptions(
+        cache, BASELINE, completion_history(events), 2, 0
+    )
+
+    # Completing the current workout does not change them
+    events += _completed(2, workload=0)
+    during = cached_prescriptions(
+        cache, BASELINE, completion_history(events), 2, 0
+    )
+    after = cached_prescriptions(
+        cache, BASELINE, completion_history(events), 3, 0
+    )
+
+    assert during == before
+    assert after != before
+    assert after == prescriptions_from_completions(
+        BASELINE, completion_history(events), 3, 0
+    )
+
+
+def test_strategy_parameters_are_part_of_the_key():
+    cache = PrescriptionCache()
+    history = completion_history(_completed(0))
+
+    low, high = (
+        cached_prescriptions(
+            cache,
+            BASELINE,
+            history,
+            1,
+            0,
+            partial(static_progression, multiplier=multiplier),
+        )
+        for multiplier in (1.0, 1.5)
+    )
+
+    assert low != high
+
+
+def test_completions_invalidate_and_capacity_bounds_the_cache():
+    cache = PrescriptionCache(capacity=2)
+    history = completion_history(_completed(0))
+    for week in range(1, 4):
+        baseline = {
+            "Squat": [Prescription(prescribed_reps=week, prescribed_weight=1)]
+        }
+        cached_prescriptions(cache, baseline, history, week, 0)
+    assert len(cache.entries) == 2
+
+    invalidate_prescriptions(cache, _completed(4))
+
+    assert len(cache.entries) == 0
@@ -0,0 +1,41 @@
+from hypothesis import given, strategies as st
+from thefuzz import fuzz
+
+from src.service.suggestions import SUGGESTION_THRESHOLD, suggest
+
+
+def _full_scan(text: str, names: list[str]) -> set[str]:
+    return {
+        name for name in names if fuzz.ratio(text, name) > SUGGESTION_THRESHOLD
+    }
+
+
+@given(
+    st.text(alphabet="abc ", max_size=8),
+    st.lists(st.text(alphabet="abc ", max_size=8), max_size=20),
+)
+def test_suggest_finds_what_a_full_scan_finds(text, names):
+    found = suggest(text, names, limit=len(names))
+
+    assert set(found) == _full_scan(text, names)
+
+
+def test_suggest_keeps_equally_good_names():
+    assert suggest("Squatt", ["Squats", "Bench press", "Squat"]) == (
+        "Squat",
+        "Squats",
+    )
+
+
+def test_suggest_ranks_best_first_and_limits():
+    names = ["Bench press", "Bench presses", "Bench pres", "Benchpress"]
+
+    assert suggest("Bench press", names, limit=2) == (
+        "Bench press",
+        "Bench pres",
+    )
+
+
+def test_suggest_without_close_names():
+    assert suggest("Deadlift", ["Squat", "Bench press"]) == ()
+    assert suggest("Deadlift", []) == ()
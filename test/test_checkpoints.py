@@ -0,0 +1,92 @@
+from datetime import datetime
+from pathlib import Path
+
+from src.checkpoints import (
+    checkpoint_offsets,
+    checkpoint_path,
+    cursor_at_offset,
+    update_checkpoints,
+)
+from src.domain.cursor import cursor_at
+from src.domain.projection import build_projection
+from src.snapshots import save_snapshot, to_snapshot
+from src.events import SetLogged, WorkoutCompleted
+
+
+def _events(n: int) -> list:
+    return [
+        (
+            WorkoutCompleted(week_index=i // 3, workout_index=i % 3)
+            if i % 4 == 3
+            else SetLogged(
+                exercise="Squat",
+                reps=5,
+                weight=100,
+                week_index=0,
+                workout_index=0,
+                timestamp=datetime(2024, 1, 1),
+            )
+        )
+        for i in range(n)
+    ]
+
+
+def test_update_checkpoints(tmp_path: Path):
+    events = _events(25)
+
+    update_checkpoints(tmp_path, events[:12], interval=5)
+    assert checkpoint_offsets(tmp_path) == [5, 10]
+
+    update_checkpoints(tmp_path, events, interval=5)
+    assert checkpoint_offsets(tmp_path) == [5, 10, 15, 20, 25]
+
+
+def test_cursor_at_offset_matches_rebuild(tmp_path: Path):
+    events = _events(25)
+    update_checkpoints(tmp_path, events, interval=5)
+
+    for offset in (0, 3, 5, 17, 25, 30):
+        assert cursor_at_offset(events, offset, tmp_path) == cursor_at(
+            events[:offset]
+        )
+
+
+def test_cursor_at_offset_without_checkpoints(tmp_path: Path):
+    events = _events(7)
+
+    assert cursor_at_offset(events, 7, tmp_path / "missing") == (
+        cursor_at(events)
+    )
+
+
+def test_checkpoints_do_not_grow_with_the_log(tmp_path: Path):
+    # Sets of a single week: only the exercise states grow
+    events = [event for event in _events(400) if isinstance(event, SetLogged)]
+    update_checkpoints(tmp_path, events, interval=100)
+
+    sizes = {
+        checkpoint_path(tmp_path, offset).stat().st_size
+        for offset in checkpoint_offsets(tmp_path)
+    }
+    assert len(sizes) == 1
+
+
+def test_projection_checkpoints_are_replaced(tmp_path: Path):
+    events = _events(12)
+    tmp_path.mkdir(exist_ok=True)
+    # Version 2 checkpoints were projection snapshots
+    old = {**to_snapshot(build_projection(events[:5])), "version": 2}
+    save_snapshot(checkpoint_path(tmp_path, 5), old)
+
+    update_checkpoints(tmp_path, events, interval=5)
+
+    assert checkpoint_offsets(tmp_path) == [5, 10]
+    assert b"exercises" not in checkpoint_path(tmp_path, 5).read_bytes()
+
+
+def test_unreadable_checkpoint_is_skipped(tmp_path: Path):
+    events = _events(12)
+    update_checkpoints(tmp_path, events, interval=5)
+    (tmp_path / "checkpoint-000000010.json").write_text("{")
+
+    assert cursor_at_offset(events, 12, tmp_path) == cursor_at(events)
@@ -2,11 +2,14 @@
 
 from src.service.prescription import (
     get_prescriptions_for_workout,
+    prescriptions_from_completions,
+    prescriptions_from_history,
     static_progression,
     feedback_based_progression,
     Prescription,
 )
 
+from src.domain.completions import completion_history
 from src.events import ExerciseCompleted, SetLogged
 from datetime import datetime
 
@@ -440,6 +443,21 @@ def test_different_exercises_independent():
     # Squat should stay as template (no history)
     assert result["Squat"][0].prescribed_weight == 150.0
 
+    grouped = prescriptions_from_history(
+        workout,
+        {"Bench Press": historical_sets},
+        {"Bench Press": feedback},
+        current_week_idx=1,
+        current_workout_idx=0,
+    )
+    assert grouped == result
+
+    history = completion_history([*historical_sets, *feedback])
+    indexed = prescriptions_from_completions(
+        workout, history, current_week_idx=1, current_workout_idx=0
+    )
+    assert indexed == result
+
 
 def test_static_progression_no_history():
     """Static progression with no history returns template."""
@@ -0,0 +1,218 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src import segments
+from src.events import SetLogged, ExerciseCompleted, WorkoutCompleted
+from src.service.prescription import _get_last_completed_performance
+
+
+def _workout(week: int, workout: int, exercise: str, reps: int) -> list:
+    return [
+        SetLogged(
+            exercise=exercise,
+            reps=reps,
+            weight=100,
+            week_index=week,
+            workout_index=workout,
+            timestamp=datetime(2024, 1, 1),
+        ),
+        ExerciseCompleted(
+            exercise=exercise,
+            week_index=week,
+            workout_index=workout,
+            feedback={"workload": reps},
+        ),
+        WorkoutCompleted(week_index=week, workout_index=workout),
+    ]
+
+
+@pytest.fixture
+def history() -> list:
+    return [
+        *_workout(0, 0, "Squat", 1),
+        *_workout(0, 1, "Bench", 2),
+        *_workout(1, 0, "Squat", 3),
+        *_workout(1, 1, "Bench", 4),
+        *_workout(2, 0, "Squat", 5),
+    ]
+
+
+def _write(directory: Path, events: list, max_events: int) -> None:
+    for event in events:
+        segments.append_events(directory, [event], max_events=max_events)
+
+
+def test_append_rolls_over_into_sealed_segments(tmp_path: Path, history):
+    _write(tmp_path, history, max_events=4)
+
+    paths = segments.segment_paths(tmp_path)
+
+    assert len(paths) == 4
+    assert all(segments.is_sealed(p) for p in paths[:-1])
+    assert not segments.is_sealed(paths[-1])
+    assert segments.load_events(tmp_path) == history
+
+
+def test_summary(tmp_path: Path, history):
+    _write(tmp_path, history, max_events=6)
+
+    summary = segments.load_summary(segments.segment_paths(tmp_path)[0])
+
+    assert summary["event_count"] == 6
+    assert summary["week_range"] == (0, 0)
+    assert summary["workout_range"] == (0, 1)
+    assert summary["exercises"] == ["Bench", "Squat"]
+    assert summary["last_completions"]["Squat"] == history[1]
+
+
+def test_roll_segment_seals_active_segment(tmp_path: Path, history):
+    _write(tmp_path, history[:3], max_events=100)
+
+    segments.roll_segment(tmp_path)
+    segments.append_events(tmp_path, history[3:])
+
+    assert len(segments.segment_paths(tmp_path)) == 2
+    assert segments.load_events(tmp_path) == history
+
+
+@pytest.mark.parametrize("max_events", [1, 2, 4, 100])
+@pytest.mark.parametrize(
+    "exercise,week,workout",
+    [
+        ("Squat", None, None),
+        ("Squat", 2, 0),
+        ("Squat", 1, 0),
+        ("Bench", 1, 1),
+        ("Deadlift", None, None),
+    ],
+)
+def test_last_completed_performance_matches_prescription(
+    tmp_path: Path, history, max_events, exercise, week, workout
+):
+    _write(tmp_path, history, max_events=max_events)
+
+    expected = _get_last_completed_performance(
+        exercise,
+        [e for e in history if isinstance(e, SetLogged)],
+        [e for e in history if isinstance(e, ExerciseCompleted)],
+        week,
+        workout,
+    )
+
+    assert (
+        segments.last_completed_performance(tmp_path, exercise, week, workout)
+        == expected
+    )
+
+
+def test_last_completed_performance_skips_segments(
+    tmp_path: Path, history, monkeypatch
+):
+    _write(tmp_path, history, max_events=3)
+    read = []
+    original = segments.load_file
+
+    def spy(path):
+        read.append(path)
+        return original(path)
+
+    monkeypatch.setattr(segments, "load_file", spy)
+
+    sets, completion = segments.last_completed_performance(tmp_path, "Bench")
+
+    assert completion == history[10]
+    assert [s.reps for s in sets] == [4]
+    assert read == [segments.segment_paths(tmp_path)[3]]
+
+
+def test_compact_merges_small_segments(tmp_path: Path, history):
+    _write(tmp_path, history[:-1], max_events=3)
+    before = segments.segment_paths(tmp_path)
+
+    removed = segments.compact(tmp_path, min_events=10)
+
+    after = segments.segment_paths(tmp_path)
+    assert removed == 3
+    assert len(after) == 2
+    assert segments.load_summary(after[0])["event_count"] == 12
+    assert after[-1] == before[-1]
+    assert segments.load_events(tmp_path) == history[:-1]
+
+
+def test_compact_leaves_large_segments(tmp_path: Path, history):
+    _write(tmp_path, history, max_events=3)
+
+    assert segments.compact(tmp_path, min_events=3) == 0
+    assert len(segments.segment_paths(tmp_path)) == 5
+
+
+def test_compact_in_background(tmp_path: Path, history):
+    _write(tmp_path, history, max_events=3)
+
+    segments.compact_in_background(tmp_path, min_events=10).join()
+
+    assert len(segments.segment_paths(tmp_path)) == 1
+    assert segments.load_events(tmp_path) == history
+
+
+def test_interrupted_compaction_is_cleaned_up(tmp_path: Path, history):
+    _write(tmp_path, history, max_events=3)
+    originals = segments.segment_paths(tmp_path)
+
+    # Merged file written, but its summary is missing
+    merged = tmp_path / "segment-000000-000001.jsonl"
+    merged.write_bytes(originals[0].read_bytes())
+
+    assert segments.segment_paths(tmp_path) == originals
+    assert not merged.exists()
+
+
+def test_covered_segments_are_cleaned_up(tmp_path: Path, history):
+    _write(tmp_path, history, max_events=3)
+    segments.compact(tmp_path, min_events=10)
+    merged = segments.segment_paths(tmp_path)[0]
+
+    # Original segment left behind after the merge was sealed
+    stale = tmp_path / "segment-000001-000001.jsonl"
+    segments.save_file(stale, history[3:6])
+
+    assert segments.segment_paths(tmp_path)[0] == merged
+    assert not stale.exists()
+    assert segments.load_events(tmp_path) == history
+
+
+def test_appends_during_compaction_keep_all_events(
+    tmp_path: Path, history, monkeypatch
+):
+    _write(tmp_path, history, max_events=3)
+    original = Path.replace
+
+    def replace_then_read(self, target):
+        result = original(self, target)
+        # A concurrent append reads (and cleans up) the directory here
+        segments.segment_paths(tmp_path)
+        return result
+
+    monkeypatch.setattr(Path, "replace", replace_then_read)
+    segments.compact(tmp_path, min_events=10)
+
+    assert segments.load_events(tmp_path) == history
+
+
+def test_orphans_of_interrupted_compaction_are_removed(
+    tmp_path: Path, history
+):
+    _write(tmp_path, history, max_events=3)
+    # Summary and temporary file written, but never renamed into place
+    tmp = tmp_path / ".tmp-segment-000000-000001.jsonl"
+    segments.save_file(tmp, history[:6])
+    orphan = tmp_path / "segment-000000-000001.summary.json"
+    orphan.write_bytes(b"{}")
+
+    segments.compact(tmp_path, min_events=1)
+
+    assert not tmp.exists()
+    assert not orphan.exists()
+    assert segments.load_events(tmp_path) == history
@@ -0,0 +1,136 @@
+from datetime import datetime
+from pathlib import Path
+
+from src.domain.projection import build_projection, prune_projection
+from src.events import SetLogged, ExerciseCompleted, WorkoutCompleted
+from src.snapshots import (
+    from_snapshot,
+    load_snapshot,
+    restore_projection,
+    save_snapshot,
+    to_snapshot,
+)
+from src.storage import append_events, load_events
+
+
+def _events(n_sets: int) -> list:
+    sets = [
+        SetLogged(
+            exercise="Squat",
+            reps=10,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime(2024, 1, 1),
+        )
+        for _ in range(n_sets)
+    ]
+    return [
+        *sets,
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+
+
+def test_snapshot_round_trip(tmp_path: Path):
+    path = tmp_path / "snapshot.json"
+    projection = build_projection(_events(3))
+
+    save_snapshot(path, to_snapshot(projection))
+
+    assert from_snapshot(load_snapshot(path)) == prune_projection(projection)
+    assert list(load_snapshot(path)["last_completions"]) == ["Squat"]
+
+
+def test_load_snapshot_missing_or_corrupt(tmp_path: Path):
+    path = tmp_path / "snapshot.json"
+    assert load_snapshot(path) is None
+
+    path.write_text('{"version": 1}')
+    assert load_snapshot(path) is None
+
+
+def test_restore_without_snapshot_builds_from_scratch(tmp_path: Path):
+    events_path = tmp_path / "events.jsonl"
+    append_events(events_path, _events(3))
+
+    projection = restore_projection(
+        events_path, tmp_path / "snapshot.json", interval=100
+    )
+
+    assert projection == build_projection(load_events(events_path))
+    assert not (tmp_path / "snapshot.json").exists()
+
+
+def test_restore_writes_snapshot_after_interval(tmp_path: Path):
+    events_path = tmp_path / "events.jsonl"
+    snapshot_path = tmp_path / "snapshot.json"
+    append_events(events_path, _events(3))
+
+    restore_projection(events_path, snapshot_path, interval=5)
+
+    snapshot = load_snapshot(snapshot_path)
+    assert snapshot["offset"] == 5
+    assert snapshot["byte_offset"] == events_path.stat().st_size
+
+
+def test_restore_replays_only_the_tail(tmp_path: Path):
+    events_path = tmp_path / "events.jsonl"
+    snapshot_path = tmp_path / "snapshot.json"
+    append_events(events_path, _events(3))
+    restore_projection(events_path, snapshot_path, interval=1)
+
+    # Events before the snapshot offset are not read again
+    covered = events_path.stat().st_size
+    events_path.write_bytes(b"x" * covered)
+    append_events(
+        events_path, [WorkoutCompleted(week_index=0, workout_index=1)]
+    )
+
+    projection = restore_projection(events_path, snapshot_path, interval=100)
+
+    assert projection["offset"] == 6
+    assert projection["cursor"]["completed"] == {0: 2}
+
+
+def test_restore_discards_snapshot_of_rewritten_log(tmp_path: Path):
+    events_path = tmp_path / "events.jsonl"
+    snapshot_path = tmp_path / "snapshot.json"
+    append_events(events_path, _events(3))
+    restore_projection(events_path, snapshot_path, interval=1)
+
+    events_path.unlink()
+    append_events(events_path, _events(0))
+
+    projection = restore_projection(events_path, snapshot_path, interval=100)
+
+    assert projection == build_projection(_events(0))
+
+
+def test_restore_json_array_log(tmp_path: Path):
+    events_path = tmp_path / "events.json"
+    snapshot_path = tmp_path / "snapshot.json"
+    append_events(events_path, _events(2))
+    restore_projection(events_path, snapshot_path, interval=1)
+    append_events(
+        events_path, [WorkoutCompleted(week_index=0, workout_index=1)]
+    )
+
+    projection = restore_projection(events_path, snapshot_path, interval=100)
+
+    assert projection == prune_projection(
+        build_projection(load_events(events_path))
+    )
+
+
+def test_snapshot_keeps_sets_of_open_workouts_only(tmp_path: Path):
+    path = tmp_path / "snapshot.json"
+
+    save_snapshot(path, to_snapshot(build_projection(_events(300))))
+    assert load_snapshot(path)["exercises"] == []
+
+    # Without its completion, the workout's sets are still needed
+    save_snapshot(path, to_snapshot(build_projection(_events(3)[:3])))
+    assert len(load_snapshot(path)["exercises"][0]["sets"]) == 3
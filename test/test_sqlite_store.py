@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+
+from src import sqlite_store
+from src.events import (
+    ExerciseStarted,
+    ExerciseCompleted,
+    WorkoutCompleted,
+)
+
+
+@pytest.fixture
+def conn(tmp_path: Path):
+    connection = sqlite_store.connect(tmp_path / "events.db")
+    yield connection
+    connection.close()
+
+
+def test_empty_database(conn):
+    assert sqlite_store.load_events(conn) == []
+
+
+def test_round_trip_preserves_order(conn, make_set):
+    events = [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        make_set("Squat", 0, 0),
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+    sqlite_store.append_events(conn, events[:2])
+    sqlite_store.append_events(conn, events[2:])
+
+    assert sqlite_store.load_events(conn) == events
+
+
+def test_persists_across_connections(tmp_path: Path, make_set):
+    path = tmp_path / "events.db"
+    first = sqlite_store.connect(path)
+    sqlite_store.append_events(first, [make_set("Squat", 0, 0)])
+    first.close()
+
+    second = sqlite_store.connect(path)
+    assert len(sqlite_store.load_events(second)) == 1
+    second.close()
+
+
+def test_failed_append_is_rolled_back(conn, make_set):
+    with pytest.raises(AttributeError):
+        sqlite_store.append_events(conn, [make_set("Squat", 0, 0), object()])
+
+    assert sqlite_store.load_events(conn) == []
+
+
+@pytest.mark.parametrize(
+    "exercise,week,workout,expected_count",
+    [
+        ("Squat", None, None, 2),
+        (None, 0, None, 2),
+        ("Squat", 0, 0, 1),
+        ("Bench", 1, 1, 0),
+    ],
+)
+def test_query_events_matches_filter_by_context(
+    conn, exercise, week, workout, expected_count, make_set
+):
+    sqlite_store.append_events(
+        conn,
+        [
+            make_set("Squat", 0, 0),
+            make_set("Squat", 1, 0),
+            ExerciseStarted(exercise="Bench", week_index=0, workout_index=0),
+        ],
+    )
+
+    result = sqlite_store.query_events(
+        conn, exercise=exercise, week=week, workout=workout
+    )
+    assert len(result) == expected_count
+
+
+def test_exercise_state(conn, make_set):
+    sqlite_store.append_events(
+        conn,
+        [
+            ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+            make_set("Squat", 0, 0, reps=10),
+            make_set("Bench", 0, 0),
+            make_set("Squat", 1, 0),
+            make_set("Squat", 0, 0, reps=8),
+        ],
+    )
+
+    state = sqlite_store.exercise_state(conn, "Squat", 0, 0)
+
+    assert state["started"] is True
+    assert [s.reps for s in state["sets"]] == [10, 8]
+
+
+def test_workout_state(conn):
+    sqlite_store.append_events(
+        conn,
+        [
+            ExerciseCompleted(
+                exercise="Squat", week_index=0, workout_index=0, feedback={}
+            ),
+            ExerciseCompleted(
+                exercise="Bench", week_index=0, workout_index=1, feedback={}
+            ),
+        ],
+    )
+
+    state = sqlite_store.workout_state(conn, ["Squat", "Bench"], 0, 0)
+
+    assert state["completed_exercises"] == {"Squat"}
+    assert state["missing_exercises"] == {"Bench"}
+
+
+def test_exercise_history(conn, make_set):
+    sqlite_store.append_events(
+        conn,
+        [
+            make_set("Squat", 0, 0),
+            make_set("Bench", 0, 0),
+            ExerciseCompleted(
+                exercise="Squat", week_index=0, workout_index=0, feedback={}
+            ),
+        ],
+    )
+
+    sets, completions = sqlite_store.exercise_history(conn, "Squat")
+
+    assert [s.exercise for s in sets] == ["Squat"]
+    assert len(completions) == 1
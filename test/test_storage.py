@@ -1,7 +1,18 @@
 import pytest
 from pathlib import Path
 from datetime import datetime
-from src.storage import load_events, save_events, append_events, load_template
+from src import storage
+from src.storage import (
+    LOG_HEADER,
+    load_events,
+    save_events,
+    append_events,
+    iter_events,
+    iter_jsonl_events,
+    load_template,
+    migrate_legacy_log,
+    verify_events,
+)
 from src.events import (
     ExerciseStarted,
     SetLogged,
@@ -121,3 +132,349 @@ def test_pydantic_validation_on_load(tmp_path: Path):
 
     with pytest.raises(Exception):  # Pydantic ValidationError
         load_events(path)
+
+
+def test_jsonl_append_writes_one_line_per_event(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+
+    append_events(
+        path,
+        [ExerciseStarted(exercise="Squat", week_index=0, workout_index=0)],
+    )
+    append_events(
+        path,
+        [
+            SetLogged(
+                exercise="Squat",
+                reps=10,
+                weight=100,
+                week_index=0,
+                workout_index=0,
+                timestamp=datetime(2024, 1, 1, 12, 0, 0),
+            ),
+            ExerciseCompleted(
+                exercise="Squat", week_index=0, workout_index=0, feedback={}
+            ),
+        ],
+    )
+
+    header, *lines = path.read_bytes().splitlines(keepends=True)
+    assert header == LOG_HEADER
+    assert len(lines) == 3
+    assert b'"type":"set"' in lines[1]
+
+
+def test_jsonl_append_does_not_rewrite_history(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+    first_line = path.read_bytes()
+
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=1)])
+
+    assert path.read_bytes().startswith(first_line)
+
+
+def test_jsonl_round_trip_preserves_data(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    original = [
+        ExerciseStarted(
+            exercise="Squat",
+            week_index=0,
+            workout_index=0,
+            feedback={"pump": 3},
+        ),
+        SetLogged(
+            exercise="Squat",
+            reps=10,
+            weight=100.5,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+
+    save_events(path, original)
+
+    assert load_events(path) == original
+
+
+def test_iter_jsonl_events_streams_lines(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    save_events(
+        path,
+        [
+            WorkoutCompleted(week_index=0, workout_index=0),
+            WorkoutCompleted(week_index=0, workout_index=1),
+        ],
+    )
+
+    stream = iter_jsonl_events(path)
+
+    assert next(stream) == WorkoutCompleted(week_index=0, workout_index=0)
+    assert next(stream) == WorkoutCompleted(week_index=0, workout_index=1)
+    assert next(stream, None) is None
+
+
+def test_iter_jsonl_events_skips_line_being_written(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    save_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+    with open(path, "ab") as f:
+        f.write(b'{"type": "workout_completed", "week_in')
+
+    assert list(iter_events(path)) == [
+        WorkoutCompleted(week_index=0, workout_index=0)
+    ]
+
+
+def test_iter_jsonl_events_missing_file(tmp_path: Path):
+    assert list(iter_jsonl_events(tmp_path / "events.jsonl")) == []
+
+
+def test_load_events_serves_unchanged_file_from_cache(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+
+    assert load_events(path) is load_events(path)
+
+
+def test_load_events_parses_only_appended_lines(tmp_path: Path, monkeypatch):
+    path = tmp_path / "events.jsonl"
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+    load_events(path)
+
+    offsets = []
+    original = storage.read_jsonl_tail
+
+    def spy(path, byte_offset=0):
+        offsets.append(byte_offset)
+        return original(path, byte_offset)
+
+    monkeypatch.setattr(storage, "read_jsonl_tail", spy)
+    size_before = path.stat().st_size
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=1)])
+
+    events = load_events(path)
+
+    assert offsets == [size_before]
+    assert [e.workout_index for e in events] == [0, 1]
+
+
+def test_load_events_reloads_rewritten_jsonl(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    save_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+    load_events(path)
+
+    save_events(
+        path,
+        [
+            WorkoutCompleted(week_index=1, workout_index=0),
+            WorkoutCompleted(week_index=1, workout_index=1),
+        ],
+    )
+
+    assert [e.week_index for e in load_events(path)] == [1, 1]
+
+
+def test_load_events_reloads_changed_json(tmp_path: Path):
+    path = tmp_path / "events.json"
+    save_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+    assert len(load_events(path)) == 1
+
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=1)])
+
+    assert len(load_events(path)) == 2
+
+
+def test_load_events_forgets_deleted_file(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=0)])
+    load_events(path)
+
+    path.unlink()
+
+    assert load_events(path) == []
+
+
+def test_trusted_load_matches_validated_load(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    events = [
+        ExerciseStarted(
+            exercise="Squat",
+            week_index=0,
+            workout_index=0,
+            feedback={"pump": 3},
+        ),
+        SetLogged(
+            exercise="Squat",
+            reps=10,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        ),
+        ExerciseCompleted(
+            exercise="Squat", week_index=0, workout_index=0, feedback={}
+        ),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+    append_events(path, events)
+
+    trusted = list(iter_jsonl_events(path))
+
+    assert trusted == verify_events(path) == events
+    assert [type(e) for e in trusted] == [type(e) for e in events]
+    assert isinstance(trusted[1].timestamp, datetime)
+
+
+def test_trusted_load_skips_validation(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(
+        LOG_HEADER
+        + b'{"type": "set", "exercise": "Squat", "reps": -5, "weight": 100,'
+        b' "timestamp": "2024-01-01T12:00:00", "week_index": 0,'
+        b' "workout_index": 0}\n'
+    )
+
+    assert load_events(path)[0].reps == -5
+
+    with pytest.raises(Exception):  # Pydantic ValidationError
+        verify_events(path)
+
+
+def test_headerless_jsonl_is_validated(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    path.write_text(
+        '{"type": "set", "exercise": "Squat", "reps": -5, "weight": 100,'
+        ' "timestamp": "2024-01-01T12:00:00", "week_index": 0,'
+        ' "workout_index": 0}\n'
+    )
+
+    with pytest.raises(Exception):  # Pydantic ValidationError
+        load_events(path)
+
+
+def test_append_to_headerless_jsonl_keeps_it_untrusted(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    path.write_text(
+        '{"type": "workout_completed", "week_index": 0, "workout_index": 0}\n'
+    )
+
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=1)])
+
+    assert not path.read_bytes().startswith(LOG_HEADER)
+    assert len(load_events(path)) == 2
+
+
+TEMPLATE_YAML = """
+name: test
+workouts:
+- exercises:
+  - name: Squat
+    sets:
+    - prescribed_reps: 5
+      prescribed_weight: 100
+"""
+
+
+def test_load_template_is_cached(tmp_path: Path):
+    path = tmp_path / "template.yaml"
+    path.write_text(TEMPLATE_YAML)
+
+    template = load_template(path)
+
+    assert load_template(path) is template
+    assert template.to_mesocycle_plan() is template.to_mesocycle_plan()
+
+
+def test_load_template_reuses_template_with_same_content(tmp_path: Path):
+    first = tmp_path / "first.yaml"
+    second = tmp_path / "second.yaml"
+    first.write_text(TEMPLATE_YAML)
+    second.write_text(TEMPLATE_YAML)
+
+    assert load_template(first) is load_template(second)
+
+
+def test_load_template_reloads_changed_file(tmp_path: Path):
+    path = tmp_path / "template.yaml"
+    path.write_text(TEMPLATE_YAML)
+    before = load_template(path)
+
+    path.write_text(TEMPLATE_YAML.replace("Squat", "Front squat"))
+
+    after = load_template(path)
+    assert after is not before
+    assert after.get_exercise_names() == ["Front squat"]
+
+
+def _history(n: int) -> list:
+    return [
+        SetLogged(
+            exercise="Squat",
+            reps=i + 1,
+            weight=100,
+            week_index=0,
+            workout_index=0,
+            timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_iter_events_streams_json_array(tmp_path: Path, chunk_size):
+    path = tmp_path / "events.json"
+    save_events(path, _history(20))
+
+    assert list(iter_events(path, chunk_size=chunk_size)) == _history(20)
+
+
+def test_iter_events_streams_jsonl(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    save_events(path, _history(20))
+
+    assert list(iter_events(path)) == _history(20)
+
+
+def test_iter_events_empty_and_missing(tmp_path: Path):
+    path = tmp_path / "events.json"
+    assert list(iter_events(path)) == []
+
+    path.write_text("[]")
+    assert list(iter_events(path)) == []
+
+
+def test_iter_events_truncated_json_array(tmp_path: Path):
+    path = tmp_path / "events.json"
+    save_events(path, _history(3))
+    path.write_text(path.read_text()[:-20])
+
+    with pytest.raises(ValueError):
+        list(iter_events(path, chunk_size=16))
+
+
+def test_migrate_legacy_log_converts_json_array_once(tmp_path: Path):
+    legacy = tmp_path / "events.json"
+    events = [
+        ExerciseStarted(exercise="Squat", week_index=0, workout_index=0),
+        WorkoutCompleted(week_index=0, workout_index=0),
+    ]
+    save_events(legacy, events)
+    path = tmp_path / "users" / "default" / "events.jsonl"
+
+    assert migrate_legacy_log(path, [tmp_path / "missing.jsonl", legacy])
+
+    assert path.read_bytes().startswith(LOG_HEADER)
+    assert load_events(path) == events
+    assert legacy.exists()
+    append_events(path, [WorkoutCompleted(week_index=0, workout_index=1)])
+    assert not migrate_legacy_log(path, [legacy])
+    assert len(load_events(path)) == 3
+
+
+def test_migrate_legacy_log_without_legacy_file(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+
+    assert not migrate_legacy_log(path, [tmp_path / "events.json"])
+    assert not path.exists()
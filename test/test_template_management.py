@@ -14,6 +14,7 @@ from src.models import (
     Workout,
 )
 
+import pytest
 import yaml
 
 
@@ -280,3 +281,63 @@ def test_template_to_mesocycle_plan(sample_template: Template):
         for workout in week.workouts
         for exercise in workout.exercises
     )
+
+
+def test_template_weeks_sets_mesocycle_length(sample_template: Template):
+    data = yaml.safe_load(sample_template.to_yaml())
+    assert "weeks" not in data
+
+    data["weeks"] = 12
+    template = Template.from_dict(data)
+
+    assert len(template.to_mesocycle_plan().weeks) == 12
+    assert Template.from_dict(yaml.safe_load(template.to_yaml())) == template
+
+
+def test_mesocycle_plan_lookup_tables(sample_template: Template):
+    plan = sample_template.to_mesocycle_plan()
+
+    assert plan.get_exercise(3, 1, "Pushup").name == "Pushup"
+    assert plan.get_exercise(3, 1, "Deadlift") is None
+    assert plan.required_sets(0, 0, "Squat") == 1
+    assert plan.required_sets(4, 0, "Squat") is None
+    assert plan.exercise_names(2, 0) == ("Squat", "Bench press", "Deadlift")
+    assert plan.workouts_with_exercise("Squat") == tuple(
+        (week, workout) for week in range(4) for workout in range(2)
+    )
+    assert plan.workouts_with_exercise("Lunge") == ()
+
+
+def test_week_variation_replaces_workouts_of_its_week(
+    sample_template: Template,
+):
+    data = yaml.safe_load(sample_template.to_yaml())
+    assert "week_variations" not in data
+    deload = {
+        "exercises": [{"name": "Walk", "sets": [{"prescribed_reps": 1}]}]
+    }
+    data["week_variations"] = [{"week": 3, "workouts": [deload]}]
+
+    template = Template.from_dict(data)
+    plan = template.to_mesocycle_plan()
+
+    assert len(plan.weeks[3].workouts) == 1
+    assert plan.weeks[2].workouts == sample_template.workouts
+    assert plan.exercise_names(3, 0) == ("Walk",)
+    assert plan.get_exercise(3, 1, "Pushup") is None
+    assert plan.workouts_with_exercise("Walk") == ((3, 0),)
+    assert "Walk" in template.get_exercise_names()
+    assert Template.from_dict(yaml.safe_load(template.to_yaml())) == template
+
+
+@pytest.mark.parametrize("varied", [[4], [-1], [1, 1]])
+def test_invalid_week_variations_are_rejected(
+    sample_template: Template, varied
+):
+    data = yaml.safe_load(sample_template.to_yaml())
+    data["week_variations"] = [
+        {"week": week, "workouts": data["workouts"]} for week in varied
+    ]
+
+    with pytest.raises(ValueError):
+        Template.from_dict(data)
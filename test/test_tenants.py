@@ -0,0 +1,254 @@
+import threading
+import time
+from concurrent.futures import wait
+from pathlib import Path
+
+import pytest
+from returns.result import Success
+
+from src import storage, tenants
+from src.domain.projection import verify_projection
+from src.events import WorkoutCompleted
+from src.snapshots import load_snapshot
+from src.writer import submit
+
+
+@pytest.fixture(autouse=True)
+def close_stores():
+    yield
+    tenants.close_all_stores()
+
+
+@pytest.fixture
+def default_template(tmp_path: Path) -> Path:
+    path = tmp_path / "template.yaml"
+    path.write_text("name: test\nworkouts: []\n")
+    return path
+
+
+def _log(store: tenants.UserStore, workout: int) -> None:
+    event = WorkoutCompleted(week_index=0, workout_index=workout)
+    submit(store.writer, lambda _: Success([event])).result(timeout=5)
+
+
+def _closed() -> None:
+    """Wait for the background closes of evicted stores."""
+    with tenants._lock:
+        closing = list(tenants._closing.values())
+    wait(closing)
+
+
+def test_user_paths(tmp_path: Path, default_template):
+    paths = tenants.user_paths(tmp_path / "users", "alice", default_template)
+
+    assert paths.events == tmp_path / "users" / "alice" / "events.jsonl"
+    assert paths.template == default_template
+
+
+def test_user_paths_prefers_own_template(tmp_path: Path, default_template):
+    own = tmp_path / "users" / "alice" / "template.yaml"
+    own.parent.mkdir(parents=True)
+    own.write_text("name: own\nworkouts: []\n")
+
+    paths = tenants.user_paths(tmp_path / "users", "alice", default_template)
+
+    assert paths.template == own
+
+
+@pytest.mark.parametrize("user_id", ["", "../bob", "a/b", "x" * 65])
+def test_user_paths_rejects_unsafe_ids(
+    tmp_path: Path, user_id, default_template
+):
+    with pytest.raises(ValueError):
+        tenants.user_paths(tmp_path, user_id, default_template)
+
+
+def test_users_are_partitioned(tmp_path: Path, default_template):
+    alice = tenants.open_store(tmp_path, "alice", default_template)
+    bob = tenants.open_store(tmp_path, "bob", default_template)
+
+    _log(alice, 0)
+    _log(alice, 1)
+    _log(bob, 0)
+
+    assert len(storage.load_events(alice.paths.events)) == 2
+    assert len(storage.load_events(bob.paths.events)) == 1
+
+
+def test_open_store_is_kept_and_refreshed(tmp_path: Path, default_template):
+    store = tenants.open_store(tmp_path, "alice", default_template)
+    _log(store, 0)
+
+    reopened = tenants.open_store(tmp_path, "alice", default_template)
+
+    assert reopened.writer is store.writer
+    assert reopened.projection["cursor"]["completed"] == {0: 1}
+
+
+def test_committed_events_update_open_store(tmp_path: Path, default_template):
+    store = tenants.open_store(tmp_path, "alice", default_template)
+
+    _log(store, 0)
+    _log(store, 1)
+
+    live = tenants._open_stores[(tmp_path, "alice")]
+    events = storage.load_events(store.paths.events)
+    assert live.projection["cursor"]["last_workout"] == {0: 1}
+    assert live.index["size"] == 2
+    assert live.timeline["size"] == 2
+    assert live.completions["size"] == 2
+    assert verify_projection(live.projection, events)
+
+
+def test_least_recently_used_store_is_evicted(
+    tmp_path: Path, default_template
+):
+    alice = tenants.open_store(tmp_path, "alice", default_template, capacity=2)
+    _log(alice, 0)
+    tenants.open_store(tmp_path, "bob", default_template, capacity=2)
+    tenants.open_store(tmp_path, "alice", default_template, capacity=2)
+
+    tenants.open_store(tmp_path, "carol", default_template, capacity=2)
+    _closed()
+
+    assert [user for _, user in tenants._open_stores] == ["alice", "carol"]
+    bob_events = tmp_path / "bob" / "events.jsonl"
+    assert bob_events not in storage._event_cache
+
+
+def test_evicted_store_is_snapshotted(tmp_path: Path, default_template):
+    alice = tenants.open_store(tmp_path, "alice", default_template, capacity=1)
+    _log(alice, 0)
+    _log(alice, 1)
+
+    tenants.open_store(tmp_path, "bob", default_template, capacity=1)
+    _closed()
+
+    assert not alice.writer.thread.is_alive()
+    assert alice.paths.events not in storage._event_cache
+    snapshot = load_snapshot(alice.paths.snapshot)
+    assert snapshot["offset"] == 2
+    assert snapshot["byte_offset"] == alice.paths.events.stat().st_size
+
+    reopened = tenants.open_store(
+        tmp_path, "alice", default_template, capacity=1
+    )
+    assert reopened.projection["cursor"]["completed"] == {0: 2}
+
+
+def test_pinned_store_is_not_evicted(tmp_path: Path, default_template):
+    alice = tenants.open_store(
+        tmp_path, "alice", default_template, capacity=1, pin=True
+    )
+
+    tenants.open_store(tmp_path, "bob", default_template, capacity=1)
+    _log(alice, 0)
+    tenants.release_store(tmp_path, "alice")
+    tenants.open_store(tmp_path, "carol", default_template, capacity=1)
+    _closed()
+
+    assert [user for _, user in tenants._open_stores] == ["carol"]
+    assert not alice.writer.thread.is_alive()
+    assert len(storage.load_events(alice.paths.events)) == 1
+
+
+def test_reopen_waits_for_close(tmp_path: Path, default_template, monkeypatch):
+    alice = tenants.open_store(tmp_path, "alice", default_template, capacity=1)
+    _log(alice, 0)
+    closing = threading.Event()
+    close_store = tenants.close_store
+
+    def slow_close(store):
+        closing.set()
+        time.sleep(0.2)
+        close_store(store)
+
+    monkeypatch.setattr(tenants, "close_store", slow_close)
+    tenants.open_store(tmp_path, "bob", default_template, capacity=1)
+    closing.wait(timeout=5)
+
+    reopened = tenants.open_store(
+        tmp_path, "alice", default_template, capacity=1
+    )
+
+    assert not alice.writer.thread.is_alive()
+    assert reopened.projection["cursor"]["completed"] == {0: 1}
+    with pytest.raises(RuntimeError):
+        _log(alice, 1)
+
+
+def test_open_reads_only_the_log_after_the_snapshot(
+    tmp_path: Path, default_template
+):
+    alice = tenants.open_store(tmp_path, "alice", default_template)
+    _log(alice, 0)
+    _log(alice, 1)
+    tenants.close_all_stores()
+
+    reopened = tenants.open_store(tmp_path, "alice", default_template)
+
+    assert reopened.paths.events not in storage._event_cache
+    assert reopened.projection["cursor"]["completed"] == {0: 2}
+    assert reopened.index["size"] == 0
+
+
+def test_load_history_catches_up(tmp_path: Path, default_template):
+    alice = tenants.open_store(tmp_path, "alice", default_template)
+    _log(alice, 0)
+    tenants.close_all_stores()
+    alice = tenants.open_store(tmp_path, "alice", default_template)
+    _log(alice, 1)
+
+    loaded = tenants.load_history(alice)
+    _log(loaded, 2)
+
+    live = tenants._open_stores[(tmp_path, "alice")]
+    events = storage.load_events(alice.paths.events)
+    assert len(events) == 3
+    assert live.index["size"] == 3
+    assert live.timeline["size"] == 3
+    assert live.completions["size"] == 3
+    assert verify_projection(live.projection, events)
+
+
+def test_failed_open_leaves_no_writer(tmp_path: Path, default_template):
+    log = tmp_path / "alice" / "events.jsonl"
+    log.parent.mkdir()
+    log.write_text("not an event\n")
+    threads = threading.active_count()
+
+    for _ in range(3):
+        with pytest.raises(Exception):
+            tenants.open_store(tmp_path, "alice", default_template)
+
+    assert threading.active_count() == threads
+    assert (tmp_path, "alice") not in tenants._opening
+
+
+def test_open_does_not_block_other_users(
+    tmp_path: Path, default_template, monkeypatch
+):
+    restore = tenants.restore_projection
+    started, release = threading.Event(), threading.Event()
+
+    def slow_restore(events_path, *args):
+        if events_path.parent.name == "alice":
+            started.set()
+            release.wait(timeout=5)
+        return restore(events_path, *args)
+
+    monkeypatch.setattr(tenants, "restore_projection", slow_restore)
+    opening = threading.Thread(
+        target=tenants.open_store, args=(tmp_path, "alice", default_template)
+    )
+    opening.start()
+    started.wait(timeout=5)
+
+    bob = tenants.open_store(tmp_path, "bob", default_template)
+    _log(bob, 0)
+    blocked = opening.is_alive()
+    release.set()
+    opening.join(timeout=5)
+
+    assert blocked
+    assert [user for _, user in tenants._open_stores] == ["bob", "alice"]
@@ -0,0 +1,188 @@
+import threading
+from pathlib import Path
+
+import pytest
+from returns.pipeline import is_successful
+from returns.result import Failure, Success
+
+from src import storage
+from src.events import WorkoutCompleted
+from src.storage import load_events
+from src.writer import start_writer, stop_writer, submit, submit_events
+
+
+def _completed(workout: int) -> WorkoutCompleted:
+    return WorkoutCompleted(week_index=0, workout_index=workout)
+
+
+def test_submitted_events_are_committed(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    writer = start_writer(path)
+
+    result = submit_events(writer, [_completed(0)]).result(timeout=5)
+
+    stop_writer(writer)
+    assert result == Success([_completed(0)])
+    assert load_events(path) == [_completed(0)]
+
+
+def test_commands_see_earlier_events_of_their_batch(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    gate = threading.Event()
+    writer = start_writer(path)
+
+    # Hold the writer so that the following commands form one batch
+    submit(writer, lambda _: gate.wait() and Success([]))
+    futures = [
+        submit(writer, lambda events: Success([_completed(len(events))]))
+        for _ in range(5)
+    ]
+    gate.set()
+
+    results = [f.result(timeout=5) for f in futures]
+    stop_writer(writer)
+    assert [r.unwrap()[0].workout_index for r in results] == [0, 1, 2, 3, 4]
+    assert [e.workout_index for e in load_events(path)] == [0, 1, 2, 3, 4]
+
+
+def test_batch_is_one_append(tmp_path: Path, monkeypatch):
+    path = tmp_path / "events.jsonl"
+    gate = threading.Event()
+    appends = []
+    original = storage.append_events
+
+    def spy(path, events, fsync=False):
+        appends.append((len(events), fsync))
+        original(path, events, fsync)
+
+    monkeypatch.setattr("src.writer.append_events", spy)
+    writer = start_writer(path, durability="batch")
+    submit(writer, lambda _: gate.wait() and Success([]))
+    futures = [submit_events(writer, [_completed(i)]) for i in range(3)]
+    gate.set()
+
+    for future in futures:
+        future.result(timeout=5)
+    stop_writer(writer)
+    assert appends == [(3, True)]
+
+
+@pytest.mark.parametrize(
+    "durability,expected_syncs", [("event", 3), ("batch", 1), ("none", 0)]
+)
+def test_durability(tmp_path: Path, monkeypatch, durability, expected_syncs):
+    path = tmp_path / "events.jsonl"
+    syncs = []
+    monkeypatch.setattr("src.storage.os.fsync", syncs.append)
+    writer = start_writer(path, durability=durability)
+
+    submit_events(writer, [_completed(i) for i in range(3)]).result(timeout=5)
+
+    stop_writer(writer)
+    assert len(syncs) == expected_syncs
+    assert len(load_events(path)) == 3
+
+
+def test_unknown_durability_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        start_writer(tmp_path / "events.jsonl", durability="fsync")
+
+
+def test_commands_read_earlier_events_of_their_batch(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    first = start_writer(path)
+    submit_events(first, [_completed(0)]).result(timeout=5)
+    stop_writer(first)
+    gate = threading.Event()
+    writer = start_writer(path)
+
+    submit(writer, lambda _: gate.wait() and Success([]))
+    submit_events(writer, [_completed(1), _completed(2)])
+    seen = submit(
+        writer,
+        lambda events: Success(
+            [_completed(events[-1].workout_index + len(events[1:]))]
+        ),
+    )
+    gate.set()
+
+    assert seen.result(timeout=5).unwrap() == [_completed(4)]
+    stop_writer(writer)
+
+
+def test_failed_command_writes_nothing(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    writer = start_writer(path)
+
+    result = submit(writer, lambda _: Failure("nope")).result(timeout=5)
+    accepted = submit_events(writer, [_completed(0)]).result(timeout=5)
+
+    stop_writer(writer)
+    assert not is_successful(result)
+    assert is_successful(accepted)
+    assert load_events(path) == [_completed(0)]
+
+
+def test_command_exception_is_raised_to_caller(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    writer = start_writer(path)
+
+    def broken(events):
+        raise ValueError("broken command")
+
+    future = submit(writer, broken)
+    other = submit_events(writer, [_completed(0)])
+
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    assert is_successful(other.result(timeout=5))
+    stop_writer(writer)
+
+
+def test_stop_commits_pending_commands(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    writer = start_writer(path)
+    futures = [submit_events(writer, [_completed(i)]) for i in range(10)]
+
+    stop_writer(writer)
+
+    assert all(f.done() for f in futures)
+    assert len(load_events(path)) == 10
+
+
+def test_stopped_writer_rejects_commands(tmp_path: Path):
+    writer = start_writer(tmp_path / "events.jsonl")
+    stop_writer(writer)
+
+    with pytest.raises(RuntimeError):
+        submit_events(writer, [_completed(0)])
+    stop_writer(writer)
+
+
+def test_commit_listener_sees_committed_batches(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    commits = []
+    writer = start_writer(
+        path, on_commit=lambda offset, events: commits.append((offset, events))
+    )
+
+    submit_events(writer, [_completed(0)]).result(timeout=5)
+    submit(writer, lambda _: Failure("rejected")).result(timeout=5)
+    submit_events(writer, [_completed(1)]).result(timeout=5)
+
+    stop_writer(writer)
+    assert commits == [(0, [_completed(0)]), (1, [_completed(1)])]
+
+
+def test_failing_commit_listener_does_not_fail_callers(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+
+    def listener(offset, events):
+        raise RuntimeError("boom")
+
+    writer = start_writer(path, on_commit=listener)
+
+    result = submit_events(writer, [_completed(0)]).result(timeout=5)
+
+    stop_writer(writer)
+    assert result == Success([_completed(0)])
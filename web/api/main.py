@@ -4,39 +4,135 @@ Thin API layer over existing domain services.
 Exposes REST endpoints for SvelteKit frontend.
 """
 
-from types import MappingProxyType
+import asyncio
+import os
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime
 from returns.pipeline import is_successful
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, get_args
 from pathlib import Path
 import rich
 import sys
 
 
+from src.domain.progress import plan_progress
+from src.domain.projection import (
+    current_position,
+    exercise_state_at,
+    workout_state_at,
+)
 from src.domain.state import exercise_state
+from src.domain.types import ExerciseState
 from src.models import MesocyclePlan, Set, Workout
 from src.events import (
     ExerciseStarted,
-    ExerciseCompleted,
-    SetLogged,
     WorkoutCompleted,
 )
 
-from src.service.logging import current_position, log_set
+from src.service.logging import complete_exercise as decide_completion
+from src.service.logging import complete_workout as decide_workout
+from src.service.logging import log_set
+from src.service.history import state_as_of
 from src.service.prescription import (
-    get_prescriptions_for_workout,
-    feedback_based_progression,
     Prescription,
+    baseline_prescriptions,
+)
+from src.service.prescription_cache import cached_prescriptions
+from src.storage import (
+    EventLineAdapter,
+    iter_events,
+    load_events,
+    load_template,
+    migrate_legacy_log,
+)
+from src.tenants import (
+    UserStore,
+    close_all_stores,
+    load_history,
+    open_store,
+    release_store,
+    user_paths,
+)
+from src.writer import Command, Durability, submit
+
+# Initialize repositories and services
+# Paths are relative to where the server is run from (project root)
+PROJECT_ROOT = Path.cwd()  # Assumes run from project root
+# One partition (event log, snapshot, optional template) per user
+USERS_ROOT = PROJECT_ROOT / "users"
+# Template for users without one of their own
+TEMPLATE_PATH = PROJECT_ROOT / "template.yaml"
+# User of requests without an ``X-User-Id`` header
+DEFAULT_USER = "default"
+# Single-user event logs of earlier versions, newest first. The first one
+# found becomes the default user's log if that user has none yet.
+LEGACY_EVENTS_PATHS = (
+    PROJECT_ROOT / "events.jsonl",
+    PROJECT_ROOT / "events.json",
+)
+SNAPSHOT_INTERVAL = int(os.environ.get("MUSCLEAPI_SNAPSHOT_INTERVAL", 500))
+# "event", "batch" or "none", see src.writer
+DURABILITY = os.environ.get("MUSCLEAPI_DURABILITY", "batch")
+if DURABILITY not in get_args(Durability):
+    raise ValueError(f"Unknown MUSCLEAPI_DURABILITY: {DURABILITY!r}")
+# Number of user stores kept in memory
+OPEN_STORES = int(os.environ.get("MUSCLEAPI_OPEN_STORES", 128))
+# Events between persisted checkpoints for "as of" queries
+CHECKPOINT_INTERVAL = int(
+    os.environ.get("MUSCLEAPI_CHECKPOINT_INTERVAL", 1000)
 )
-from src.storage import append_events, load_events, load_template
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Adopt a legacy event log on startup and close all open user
+    stores on shutdown."""
+    migrate_legacy_log(
+        user_paths(USERS_ROOT, DEFAULT_USER, TEMPLATE_PATH).events,
+        LEGACY_EVENTS_PATHS,
+    )
+    yield
+    close_all_stores()
+
+
+def get_store(x_user_id: str = Header(DEFAULT_USER)) -> Iterator[UserStore]:
+    """Open store of the requesting user (``X-User-Id`` header), pinned
+    while the request is handled."""
+    try:
+        store = open_store(
+            USERS_ROOT,
+            x_user_id,
+            TEMPLATE_PATH,
+            capacity=OPEN_STORES,
+            durability=DURABILITY,
+            snapshot_interval=SNAPSHOT_INTERVAL,
+            checkpoint_interval=CHECKPOINT_INTERVAL,
+            pin=True,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        yield store
+    finally:
+        release_store(USERS_ROOT, x_user_id)
+
+
+def get_loaded_store(store: UserStore = Depends(get_store)) -> UserStore:
+    """Store of the requesting user, with its history loaded (see
+    ``src.tenants.load_history``)."""
+    return load_history(store)
 
 
 app = FastAPI(
     title="MuscleAPI",
     description="Progressive overload tracking API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS for local development with SvelteKit
@@ -55,12 +151,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize repositories and services
-# Paths are relative to where the server is run from (project root)
-PROJECT_ROOT = Path.cwd()  # Assumes run from project root
-EVENTS_PATH = PROJECT_ROOT / "events.json"
-TEMPLATE_PATH = PROJECT_ROOT / "template.yaml"
-
 
 # Request/Response Models
 class LogSetRequest(BaseModel):
@@ -117,6 +207,37 @@ class CurrentWorkoutResponse(BaseModel):
     exercises: list[ExerciseInfo]
 
 
+class ExerciseProgressInfo(BaseModel):
+    """Sets done against sets required for one planned exercise."""
+
+    name: str
+    sets_done: int
+    sets_required: int
+    is_completed: bool
+
+
+class WorkoutProgressInfo(BaseModel):
+    """Progress of one planned workout."""
+
+    workout_index: int
+    is_completed: bool
+    exercises: list[ExerciseProgressInfo]
+
+
+class WeekProgressInfo(BaseModel):
+    """Progress of one week of the plan."""
+
+    week_index: int
+    workouts: list[WorkoutProgressInfo]
+
+
+class PlanProgressResponse(BaseModel):
+    """Progress through the whole mesocycle."""
+
+    template_name: str
+    weeks: list[WeekProgressInfo]
+
+
 # Health check
 @app.get("/")
 async def root():
@@ -139,13 +260,13 @@ async def health_check():
 
 # Workout endpoints
 @app.get("/api/current-workout", response_model=CurrentWorkoutResponse)
-async def get_current_workout():
+async def get_current_workout(store: UserStore = Depends(get_loaded_store)):
     """Get the current workout with prescriptions and logged sets."""
-    events = load_events(EVENTS_PATH)
-    template = load_template(TEMPLATE_PATH)
+    template = load_template(store.paths.template)
     plan = template.to_mesocycle_plan()
+    projection = store.projection
 
-    week_index, workout_index = current_position(events, template)
+    week_index, workout_index = current_position(projection, plan)
 
     current_workout: Optional[Workout] = plan.get_workout(
         week_index, workout_index
@@ -153,30 +274,50 @@ async def get_current_workout():
     if not current_workout:
         raise HTTPException(status_code=404, detail="No current workout found")
 
-    baseline_prescriptions = {}
-    for exercise in current_workout.exercises:
-        baseline_prescriptions[exercise.name] = [
-            Prescription(
-                prescribed_reps=s.prescribed_reps,
-                prescribed_weight=s.prescribed_weight,
-            )
-            for s in exercise.sets
-        ]
-    all_sets = [e for e in events if isinstance(e, SetLogged)]
-    all_feedback = [e for e in events if isinstance(e, ExerciseCompleted)]
-
-    exercises_planned = get_prescriptions_for_workout(
-        baseline_prescriptions,
-        all_sets,
-        all_feedback,
+    # States and history come from the store, without reading the events
+    baseline = baseline_prescriptions(current_workout)
+    exercises_planned = cached_prescriptions(
+        store.prescriptions,
+        baseline,
+        store.completions,
         current_week_idx=week_index,
         current_workout_idx=workout_index,
     )
+    states = _exercise_states(store, list(baseline), week_index, workout_index)
+    return _workout_response(
+        week_index, workout_index, exercises_planned, states
+    )
+
+
+def _exercise_states(
+    store: UserStore, names: list[str], week: int, workout: int
+) -> dict[str, ExerciseState]:
+    """Exercise states of one context. Restored projections lack those of
+    completed workouts (see ``src.snapshots``); they are read through the
+    store's index instead."""
+    projection = store.projection
+    if not workout_state_at(projection, names, week, workout)["completed"]:
+        return {
+            name: exercise_state_at(projection, name, week, workout)
+            for name in names
+        }
+    events = load_events(store.paths.events)
+    return {
+        name: exercise_state(events, name, week, workout, store.index)
+        for name in names
+    }
+
+
+def _workout_response(
+    week_index: int,
+    workout_index: int,
+    exercises_planned: dict[str, list[Prescription]],
+    states: dict[str, ExerciseState],
+) -> CurrentWorkoutResponse:
+    """Combine prescriptions and exercise states into the response."""
     exercise_infos = []
     for exercise_name, prescriptions in exercises_planned.items():
-        state = exercise_state(
-            events, exercise_name, week_index, workout_index
-        )
+        state = states[exercise_name]
         logged_sets_info = [
             LoggedSetInfo(reps=s.reps, weight=s.weight) for s in state["sets"]
         ]
@@ -204,67 +345,165 @@ async def get_current_workout():
     )
 
 
+@app.get("/api/as-of", response_model=CurrentWorkoutResponse)
+async def get_state_as_of(
+    when: datetime, store: UserStore = Depends(get_loaded_store)
+):
+    """Get the workout the athlete was at, as of a past moment, with the
+    prescriptions and logged sets of that moment."""
+    state = state_as_of(
+        load_events(store.paths.events),
+        load_template(store.paths.template),
+        when,
+        store.paths.checkpoints,
+        store.timeline,
+        store.index,
+        store.completions,
+    )
+    return _workout_response(
+        state["week_index"],
+        state["workout_index"],
+        state["prescriptions"],
+        state["exercises"],
+    )
+
+
+@app.get("/api/plan-progress", response_model=PlanProgressResponse)
+async def get_plan_progress(store: UserStore = Depends(get_store)):
+    """Get the completion of every workout and exercise of the plan."""
+    plan = load_template(store.paths.template).to_mesocycle_plan()
+    matrix = plan_progress(load_events(store.paths.events), plan)
+    return PlanProgressResponse(
+        template_name=plan.template_name,
+        weeks=[
+            WeekProgressInfo(
+                week_index=week_index,
+                workouts=[
+                    WorkoutProgressInfo(
+                        workout_index=workout["workout_index"],
+                        is_completed=workout["completed"],
+                        exercises=[
+                            ExerciseProgressInfo(
+                                name=exercise["exercise"],
+                                sets_done=exercise["sets_done"],
+                                sets_required=exercise["sets_required"],
+                                is_completed=exercise["completed"],
+                            )
+                            for exercise in workout["exercises"]
+                        ],
+                    )
+                    for workout in week
+                ],
+            )
+            for week_index, week in enumerate(matrix)
+        ],
+    )
+
+
+async def _commit(store: UserStore, command: Command):
+    """Run a command through the user's writer and wait for its batch."""
+    return await asyncio.wrap_future(submit(store.writer, command))
+
+
 @app.post("/api/log-set", response_model=ApiResponse)
-async def log_set_endpoint(request: LogSetRequest):
+async def log_set_endpoint(
+    request: LogSetRequest, store: UserStore = Depends(get_loaded_store)
+):
     """Log a set for an exercise."""
-    events = load_events(EVENTS_PATH)
-    template = load_template(TEMPLATE_PATH)
-
-    result = log_set(
-        events, template, request.exercise, request.reps, request.weight
+    template = load_template(store.paths.template)
+
+    result = await _commit(
+        store,
+        lambda events: log_set(
+            events,
+            template,
+            request.exercise,
+            request.reps,
+            request.weight,
+            store.index,
+            store.projection["cursor"],
+        ),
     )
 
     if is_successful(result):
-        append_events(EVENTS_PATH, result.unwrap())
-
-        return ApiResponse(success=True, message=result.unwrap())
+        return ApiResponse(
+            success=True,
+            message=f"Logged {request.exercise}: "
+            f"{request.reps} reps at {request.weight} kg",
+        )
     else:
         return ApiResponse(success=False, error=str(result.failure()))
 
 
 @app.post("/api/complete-exercise", response_model=ApiResponse)
-async def complete_exercise(request: ExerciseFeedbackRequest):
+async def complete_exercise(
+    request: ExerciseFeedbackRequest,
+    store: UserStore = Depends(get_loaded_store),
+):
     """Mark an exercise as completed with feedback."""
+    template = load_template(store.paths.template)
+    feedback = {
+        "joint_pain": request.joint_pain,
+        "pump": request.pump,
+        "workload": request.workload,
+    }
 
-    feedback = MappingProxyType(
-        {
-            "joint_pain": request.joint_pain,
-            "pump": request.pump,
-            "workload": request.workload,
-        }
+    result = await _commit(
+        store,
+        lambda events: decide_completion(
+            events,
+            template,
+            request.exercise,
+            feedback,
+            store.index,
+            store.projection["cursor"],
+        ),
     )
 
-    result = logging_service.complete_exercise(request.exercise, feedback)
-
     if is_successful(result):
-        return ApiResponse(success=True, message=result.unwrap())
+        return ApiResponse(
+            success=True, message=f"Completed {request.exercise}"
+        )
     else:
         return ApiResponse(success=False, error=str(result.failure()))
 
 
 @app.post("/api/complete-workout", response_model=ApiResponse)
-async def complete_workout():
+async def complete_workout(store: UserStore = Depends(get_loaded_store)):
     """Mark the current workout as completed."""
-    result = logging_service.complete_workout()
+    template = load_template(store.paths.template)
+
+    result = await _commit(
+        store,
+        lambda events: decide_workout(
+            events, template, store.index, store.projection["cursor"]
+        ),
+    )
 
     if is_successful(result):
-        return ApiResponse(success=True, message=result.unwrap())
+        return ApiResponse(success=True, message="Workout completed")
     else:
         return ApiResponse(success=False, error=str(result.failure()))
 
 
 @app.get("/api/history")
-async def get_history():
-    """Get workout history (all logged events)."""
-    events = load_events(EVENTS_PATH)
-    return {"events": [e.model_dump() for e in events]}
+async def get_history(store: UserStore = Depends(get_store)):
+    """Get workout history (all logged events), streamed from disk."""
+
+    def encode():
+        yield b'{"events": ['
+        for i, event in enumerate(iter_events(store.paths.events)):
+            yield (b"," if i else b"") + EventLineAdapter.dump_json(event)
+        yield b"]}"
+
+    return StreamingResponse(encode(), media_type="application/json")
 
 
 @app.get("/api/template")
-async def get_template():
+async def get_template(store: UserStore = Depends(get_store)):
     """Get the current workout template."""
     try:
-        template = logging_service.template
+        template = load_template(store.paths.template)
 
         # Convert to serializable format
         workouts = []